@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -16,6 +18,44 @@ class Settings(BaseSettings):
     default_pet_name: str
     default_pet_breed: str
     default_pet_color: str
+    database_pool_size: int = 10
+    database_max_overflow: int = 20
+    database_pool_timeout: float = 30
+    database_pool_pre_ping: bool = True
+    database_pool_recycle: int = 1800
+    database_statement_timeout_ms: int = 0
+    database_query_cache_size: int = 500
+    database_prepared_statement_cache_size: int = 500
+    database_replica_urls: list[str] = []
+    database_replica_max_staleness_seconds: float = 0
+    database_replica_read_after_write_seconds: float = 5
+    database_replica_health_check_interval: float = 5
+    database_repeated_query_threshold: int = 5
+    page_size_default: int = 50
+    page_size_max: int = 200
+    bulk_max_items: int = 1000
+    import_chunk_size: int = 1000
+    cache_max_entries: int = 10000
+    cache_ttl_seconds: float = 30
+    log_queue_size: int = 10000
+    log_format: Literal["text", "json"] = "text"
+    log_levels: dict[str, str] = {}
+    log_sample_rates: dict[str, float] = {}
+    seed_default_data: bool = True
+    notification_transport: Literal["fcm", "stub"] = "fcm"
+    profiling_sample_rate: float = 0
+    profiling_token: str = ""
+    profiling_keep: int = 50
+    profiling_directory: str = ""
+    tracing_export_path: str = ""
+    tracing_endpoint: str = ""
+    tracing_sample_rate: float = 1
+    tracing_queue_size: int = 10000
+    loop_monitor_interval_seconds: float = 0.1
+    loop_block_threshold_seconds: float = 0.25
+    health_cache_seconds: float = 5
+    health_check_timeout_seconds: float = 1
+    health_scheduler_max_age_seconds: float = 0
 
     model_config = SettingsConfigDict(env_file=".env")
 
@@ -1,31 +1,62 @@
 from contextlib import asynccontextmanager
 from typing import Any, AsyncIterator
-from fastapi import Depends, FastAPI, HTTPException, status
-from fastapi.responses import RedirectResponse
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse, RedirectResponse
 from fastapi.openapi.utils import get_openapi
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-
-from config import settings
-from src.database import DatabaseConnection
-from src.database.model import Pet
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import AsyncDatabaseConnection
+from src.database.engine import EngineRegistry
+from src.middlewares.metrics import MetricsMiddleware
+from src.middlewares.profiling import ProfilingMiddleware
+from src.middlewares.query_count import QueryCountMiddleware
+from src.middlewares.tracing import TracingMiddleware
+from src.modules.cache import cache
+from src.modules.detection import RegisterDetection
 from src.modules.lifespan import LifespanHandler
-from src.modules.notificator import UserNotificator
+from src.modules.log import Log
+from src.modules.loop_monitor import LoopMonitor
+from src.modules.metrics import DETECTIONS, metrics
 
 # from src.modules.scheduler import start_scheduler
 from src.schemas.basic_response import BasicResponse
 from src.schemas.detection import Detection, DetectionRequest
-from src.modules.json_handler import JSONHandler
-from src.routers import router_scheduled_feeding, router_user, router_auth, router_pet
+from src.routers import (
+    router_scheduled_feeding,
+    router_user,
+    router_auth,
+    router_pet,
+    router_profiling,
+    router_health,
+)
+from config import settings
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    LifespanHandler().execute()
+    await LifespanHandler().execute()
+    loop_monitor = LoopMonitor(
+        settings.loop_monitor_interval_seconds, settings.loop_block_threshold_seconds
+    )
+    loop_monitor.start()
     yield None
+    await loop_monitor.stop()
+    Log().info("Cache stats: %s", cache.stats.as_dict())
+    await EngineRegistry.dispose_all_async()
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(
+    ProfilingMiddleware,
+    sample_rate=settings.profiling_sample_rate,
+    token=settings.profiling_token,
+)
+app.add_middleware(
+    QueryCountMiddleware,
+    repeated_query_threshold=settings.database_repeated_query_threshold,
+)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 # start_scheduler()
 
 
@@ -60,23 +91,26 @@ def index() -> RedirectResponse:
     return RedirectResponse(url="/docs")
 
 
+@app.get("/metrics", include_in_schema=False)
+def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.post("/detectar")
 async def detectar(
     request: DetectionRequest,
-    session: Session = Depends(DatabaseConnection().get_db_session),
+    session: AsyncSession = Depends(AsyncDatabaseConnection().get_db_session),
 ) -> BasicResponse[Detection]:
-    detection = Detection(timestamp=request.timestamp)
-    JSONHandler(settings.json_file_path).save_in_json(detection)
-    pet = session.execute(select(Pet).where(Pet.id == 1)).unique().scalar_one_or_none()
-    if pet is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Pet não encontrado"
-        )
-    UserNotificator(session).notificate(pet)
-    return BasicResponse(data=detection)
+    response = await RegisterDetection(session, request).execute()
+    DETECTIONS.inc()
+    return response
 
 
 app.include_router(router_user.router)
 app.include_router(router_auth.router)
 app.include_router(router_scheduled_feeding.router)
 app.include_router(router_pet.router)
+app.include_router(router_profiling.router)
+app.include_router(router_health.router)
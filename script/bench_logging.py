@@ -0,0 +1,82 @@
+"""Time spent by the caller of Log.info with direct, queued and sampled records.
+
+The direct path writes every record to the stream and file handlers in the
+calling thread, as Log used to. The queued path hands the record to the Log
+listener thread and returns, and the sampled path also keeps only a fraction of
+the records, as LOG_SAMPLE_RATES does for a hot function. Records go to
+temporary files and to os.devnull instead of the terminal:
+
+    python -m script.bench_logging --records 50000 --format json --sample-rate 0.1
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import Callable
+
+from src.modules.log import FORMAT, JSONFormatter, Log
+
+
+def build_handlers(path: str, formatter: logging.Formatter) -> list[logging.Handler]:
+    handlers: list[logging.Handler] = [
+        logging.StreamHandler(open(os.devnull, "w")),
+        logging.FileHandler(path, mode="a"),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def log_records(info: Callable[..., None], records: int) -> float:
+    start = time.perf_counter()
+    for index in range(records):
+        info("Trying to get pet %s for user %s", index, "user@foodtracker.com")
+    return time.perf_counter() - start
+
+
+def count_lines(path: str) -> int:
+    with open(path, "rb") as file:
+        return sum(1 for _ in file)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    formatter = JSONFormatter() if args.format == "json" else logging.Formatter(FORMAT)
+    with tempfile.TemporaryDirectory() as directory:
+        direct_path = os.path.join(directory, "direct.log")
+        direct = logging.getLogger("bench.direct")
+        direct.propagate = False
+        direct.setLevel(logging.INFO)
+        for handler in build_handlers(direct_path, formatter):
+            direct.addHandler(handler)
+
+        queued_path = os.path.join(directory, "queued.log")
+        Log.start(build_handlers(queued_path, formatter), queue_size=0)
+        Log.sample("bench.sampled", args.sample_rate)
+
+        timings = [
+            ("direct", log_records(direct.info, args.records)),
+            ("queued", log_records(Log("bench.queued").info, args.records)),
+            ("sampled", log_records(Log("bench.sampled").info, args.records)),
+        ]
+        Log.stop()
+        written = {
+            "direct": count_lines(direct_path),
+            "queued": args.records,
+            "sampled": count_lines(queued_path) - args.records,
+        }
+
+    print(f"{'path':<10}{'µs per call':>14}{'records written':>18}")
+    for name, seconds in timings:
+        print(f"{name:<10}{seconds / args.records * 1e6:>14.2f}{written[name]:>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Per-call overhead of the hot queries with and without the statement caches.
+
+Runs against an in-memory SQLite database so only the Python side (statement
+construction, cache key generation and SQL compilation) is measured:
+
+    python -m script.bench_queries --iterations 20000
+"""
+
+import argparse
+import timeit
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from src.database.model import Base, Pet, User
+from src.database.queries import pet_by_id, pets_by_user, user_by_email
+
+EMAIL = "bench@foodtracker.com"
+
+
+def seed(session: Session) -> None:
+    user = User(
+        name="Bench",
+        cpf_cnpj="65508999078",
+        email=EMAIL,
+        password="x",
+        address="Bench address",
+        phone="11999999999",
+        device_token="bench",
+    )
+    session.add(user)
+    session.flush()
+    session.add(Pet(name="Max", kind=1, user_id=user.id))
+    session.commit()
+
+
+def build_cases(
+    session: Session, uncached: Session
+) -> dict[str, dict[str, Callable[[], Any]]]:
+    return {
+        "user_by_email": {
+            "uncached select": lambda: uncached.execute(
+                select(User).where(User.email == EMAIL, User.enabled)
+            )
+            .unique()
+            .scalar_one_or_none(),
+            "select": lambda: session.execute(
+                select(User).where(User.email == EMAIL, User.enabled)
+            )
+            .unique()
+            .scalar_one_or_none(),
+            "lambda_stmt": lambda: session.execute(user_by_email(EMAIL))
+            .unique()
+            .scalar_one_or_none(),
+        },
+        "pet_by_id": {
+            "uncached select": lambda: uncached.execute(select(Pet).where(Pet.id == 1))
+            .unique()
+            .scalar_one_or_none(),
+            "select": lambda: session.execute(select(Pet).where(Pet.id == 1))
+            .unique()
+            .scalar_one_or_none(),
+            "lambda_stmt": lambda: session.execute(pet_by_id(1))
+            .unique()
+            .scalar_one_or_none(),
+        },
+        "pets_by_user": {
+            "uncached select": lambda: uncached.execute(
+                select(Pet).where(Pet.user_id == 1)
+            )
+            .unique()
+            .scalars()
+            .all(),
+            "select": lambda: session.execute(select(Pet).where(Pet.user_id == 1))
+            .unique()
+            .scalars()
+            .all(),
+            "lambda_stmt": lambda: session.execute(pets_by_user(1))
+            .unique()
+            .scalars()
+            .all(),
+        },
+    }
+
+
+def postgresql_compile_cost(iterations: int) -> float:
+    # The dialect the application compiles for, without connecting.
+    dialect = make_url("postgresql+asyncpg://").get_dialect()()
+    seconds = timeit.timeit(
+        lambda: select(User)
+        .where(User.email == EMAIL, User.enabled)
+        .compile(dialect=dialect),
+        number=iterations,
+    )
+    return seconds / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=10000)
+    args = parser.parse_args()
+
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    uncached_engine = engine.execution_options(compiled_cache=None)
+    with Session(engine) as session, Session(uncached_engine) as uncached:
+        seed(session)
+        print(f"{'query':<16}{'strategy':<18}{'us/call':>10}{'saved':>10}")
+        for query, strategies in build_cases(session, uncached).items():
+            baseline: float | None = None
+            for strategy, call in strategies.items():
+                call()
+                seconds = timeit.timeit(call, number=args.iterations)
+                per_call = seconds / args.iterations * 1_000_000
+                baseline = per_call if baseline is None else baseline
+                print(
+                    f"{query:<16}{strategy:<18}{per_call:>10.1f}"
+                    f"{baseline - per_call:>10.1f}"
+                )
+    print(
+        "postgresql compile of user_by_email: "
+        f"{postgresql_compile_cost(args.iterations):.1f} us/call"
+    )
+
+
+if __name__ == "__main__":
+    main()
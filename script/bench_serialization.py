@@ -0,0 +1,114 @@
+"""Serialization time of a GET /pets page with and without the fast path.
+
+The validated path builds GetPetResponse objects from Pet entities and lets
+FastAPI validate and serialize them again through the response model before
+rendering a JSONResponse. The fast path turns the selected column rows into
+dicts and dumps them with the cached TypeAdapter used by the routers:
+
+    python -m script.bench_serialization --pets 10000
+"""
+
+import argparse
+import asyncio
+import timeit
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.database.model import Pet
+from src.modules.serialization import json_response
+from src.schemas.basic_response import PageResponse
+from src.schemas.pet import GetPetResponse
+
+
+def build_pets(count: int) -> list[Pet]:
+    return [
+        Pet(
+            id=pet_id,
+            name=f"Pet {pet_id}",
+            breed="Shitzu",
+            weight=8.5,
+            color="Branco",
+            kind=pet_id % 5,
+            castred=pet_id % 2 == 0,
+            enabled=True,
+        )
+        for pet_id in range(1, count + 1)
+    ]
+
+
+def validated_path(pets: list[Pet]) -> bytes:
+    page = PageResponse[GetPetResponse](
+        data=[
+            GetPetResponse(
+                pet_id=pet.id,
+                name=pet.name,
+                breed=pet.breed,
+                weight=pet.weight,
+                color=pet.color,
+                kind=pet.kind,
+                castred=pet.castred,
+                enabled=pet.enabled,
+            )
+            for pet in pets
+        ],
+        next_cursor="eyJpZCI6MTAwMDB9",
+    )
+    content = asyncio.run(
+        serialize_response(field=RESPONSE_FIELD, response_content=page)
+    )
+    return bytes(JSONResponse(content).body)
+
+
+def fast_path(rows: list[tuple[Any, ...]]) -> bytes:
+    fields = list(GetPetResponse.model_fields)
+    page = PageResponse[dict[str, Any]].model_construct(
+        data=[dict(zip(fields, row)) for row in rows],
+        next_cursor="eyJpZCI6MTAwMDB9",
+    )
+    return bytes(json_response(page).body)
+
+
+RESPONSE_FIELD = create_model_field(
+    name="Response_get_pets",
+    type_=PageResponse[GetPetResponse],
+    mode="serialization",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pets", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    pets = build_pets(args.pets)
+    rows = [
+        (
+            pet.id,
+            pet.name,
+            pet.breed,
+            pet.weight,
+            pet.color,
+            pet.kind,
+            pet.castred,
+            pet.enabled,
+        )
+        for pet in pets
+    ]
+    if validated_path(pets) != fast_path(rows):
+        raise SystemExit("The fast path output differs from the validated path")
+
+    print(f"{'path':<12}{f'ms per {args.pets} pets':>22}")
+    for name, run in (
+        ("validated", lambda: validated_path(pets)),
+        ("fast", lambda: fast_path(rows)),
+    ):
+        seconds = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        print(f"{name:<12}{seconds * 1000:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Validation time of CPF/CNPJ documents per record and in batch.
+
+The per-record path is the digit loop UserDataValidator used to run for every
+user. The single path calls UserValidation with one document at a time, like
+POST /users does, and the batch path validates every document in one call, like
+a chunk of a CSV import:
+
+    python -m script.bench_validation --documents 1000000
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable
+
+from src.modules.validation import UserValidation
+
+CNPJ_WEIGHTS = (
+    [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2],
+    [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2],
+)
+
+
+def per_record(document: str) -> str | None:
+    digits = re.sub(r"\D", "", document)
+    if len(digits) == 11:
+        if digits == digits[0] * 11:
+            return "CPF inválido"
+        for i in [9, 10]:
+            value = sum(int(digits[num]) * ((i + 1) - num) for num in range(i))
+            if ((value * 10) % 11) % 10 != int(digits[i]):
+                return "CPF inválido"
+        return None
+    if len(digits) == 14:
+        if digits == digits[0] * 14:
+            return "CNPJ inválido"
+        for i, weights in enumerate(CNPJ_WEIGHTS):
+            value = sum(int(digits[num]) * weight for num, weight in enumerate(weights))
+            check = 0 if value % 11 < 2 else 11 - value % 11
+            if check != int(digits[12 + i]):
+                return "CNPJ inválido"
+        return None
+    return "CPF ou CNPJ inválido"
+
+
+def cpf(rng: random.Random) -> str:
+    digits = [rng.randrange(10) for _ in range(9)]
+    for position in (9, 10):
+        value = sum(d * (position + 1 - i) for i, d in enumerate(digits))
+        digits.append(value * 10 % 11 % 10)
+    text = "".join(map(str, digits))
+    return f"{text[:3]}.{text[3:6]}.{text[6:9]}-{text[9:]}"
+
+
+def cnpj(rng: random.Random) -> str:
+    digits = [rng.randrange(10) for _ in range(12)]
+    for weights in CNPJ_WEIGHTS:
+        remainder = sum(d * w for d, w in zip(digits, weights)) % 11
+        digits.append(0 if remainder < 2 else 11 - remainder)
+    text = "".join(map(str, digits))
+    return f"{text[:2]}.{text[2:5]}.{text[5:8]}/{text[8:12]}-{text[12:]}"
+
+
+def build_documents(count: int, seed: int) -> list[str]:
+    """Mixes valid CPFs and CNPJs with wrong check digits and wrong lengths."""
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        document = cpf(rng) if rng.random() < 0.7 else cnpj(rng)
+        roll = rng.random()
+        if roll < 0.1:
+            document = document[:-1] + str((int(document[-1]) + 1) % 10)
+        elif roll < 0.12:
+            document = document[:-2]
+        documents.append(document)
+    return documents
+
+
+def timed(run: Callable[[], list[str | None]]) -> tuple[float, list[str | None]]:
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    documents = build_documents(args.documents, args.seed)
+    runs = [
+        ("per-record", lambda: [per_record(document) for document in documents]),
+        (
+            "single",
+            lambda: [
+                UserValidation.cpf_cnpj_errors([document])[0] for document in documents
+            ],
+        ),
+        ("batch", lambda: UserValidation.cpf_cnpj_errors(documents)),
+    ]
+
+    print(f"{'path':<12}{'seconds':>10}{'µs per document':>18}")
+    expected = None
+    for name, run in runs:
+        seconds, result = timed(run)
+        if expected is None:
+            expected = result
+        elif result != expected:
+            raise SystemExit(f"The {name} path disagrees with the per-record path")
+        print(f"{name:<12}{seconds:>10.2f}{seconds / len(documents) * 1e6:>18.2f}")
+    invalid = sum(error is not None for error in expected or [])
+    print(f"{len(documents)} documents, {invalid} invalid")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Checks that every hot lookup is answered by an index.
+
+Runs EXPLAIN for each query in src/database/queries.py against the database in
+DATABASE_URL (PostgreSQL, migrated with ``alembic upgrade head``) and exits with
+status 1 when the planner does not pick the expected index:
+
+    python -m script.check_query_plans
+
+Sequential scans are disabled for the check so the result does not depend on
+how many rows the tables hold.
+"""
+
+import datetime
+import json
+import sys
+from typing import Any, Iterator
+
+from sqlalchemy import ClauseElement, Connection, create_engine, text
+from sqlalchemy.pool import NullPool
+
+from config import settings
+from src.database.queries import (
+    enabled_scheduled_feeding,
+    pet_by_id,
+    pets_by_user,
+    pets_page,
+    user_by_email,
+    user_by_id,
+    users_by_email_or_cpf_cnpj,
+    users_page,
+)
+from src.schemas.pet import PetFilters
+from src.schemas.user import UserFilters
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+HOT_LOOKUPS: list[tuple[str, ClauseElement, set[str]]] = [
+    (
+        "user_by_email",
+        user_by_email("user@foodtracker.com"),
+        {"user_email_key"},
+    ),
+    ("user_by_id", user_by_id(1), {"user_pkey"}),
+    (
+        "users_by_email_or_cpf_cnpj",
+        users_by_email_or_cpf_cnpj("user@foodtracker.com", "65508999078"),
+        {"user_email_key", "ix_user_cpf_cnpj"},
+    ),
+    ("pet_by_id", pet_by_id(1), {"pet_pkey"}),
+    ("pets_by_user", pets_by_user(1), {"ix_pet_user_id"}),
+    (
+        "enabled_scheduled_feeding",
+        enabled_scheduled_feeding(1, datetime.time(8, 0)),
+        {"ix_scheduled_feeding_pet_id_feeding_time"},
+    ),
+    ("users_page", users_page(UserFilters(), 100, 51), {"user_pkey"}),
+    (
+        "pets_page kind",
+        pets_page(PetFilters(kind=1), 100, 51),
+        {"ix_pet_kind_id"},
+    ),
+    (
+        "pets_page owner",
+        pets_page(PetFilters(user_id=1), 100, 51),
+        {"ix_pet_user_id"},
+    ),
+]
+
+
+def plan_indexes(plan: dict[str, Any]) -> Iterator[str]:
+    if plan.get("Node Type") in INDEX_NODES:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", []):
+        yield from plan_indexes(child)
+
+
+def explain(connection: Connection, statement: ClauseElement) -> dict[str, Any]:
+    compiled = statement.compile(dialect=connection.dialect)
+    result = connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar_one()
+    plans = json.loads(result) if isinstance(result, str) else result
+    plan: dict[str, Any] = plans[0]["Plan"]
+    return plan
+
+
+def main() -> int:
+    engine = create_engine(settings.database_url, poolclass=NullPool)
+    if engine.dialect.name != "postgresql":
+        print(f"EXPLAIN check needs PostgreSQL, got {engine.dialect.name}")
+        return 1
+
+    failures = 0
+    with engine.connect() as connection:
+        connection.execute(text("SET enable_seqscan = off"))
+        for name, statement, expected in HOT_LOOKUPS:
+            used = set(plan_indexes(explain(connection, statement)))
+            missing = expected - used
+            failures += bool(missing)
+            status = "ok" if not missing else f"MISSING {', '.join(sorted(missing))}"
+            print(f"{name:<28}{', '.join(sorted(used)) or 'seq scan':<60}{status}")
+    engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+"""Fills the database in DATABASE_URL with a synthetic dataset for scale tests.
+
+Users get valid CPFs or CNPJs, a few pets each and scheduled feedings clustered
+around breakfast, lunch and dinner. Rows are generated in chunks of users and
+written with COPY on PostgreSQL and with executemany elsewhere, one transaction
+per chunk, using the tables of src/database/model.py. The same seed always
+generates the same rows, and ids continue after the rows already in the tables:
+
+    python -m script.generate_dataset --users 1000000 --seed 42
+
+With --detections-file, --detection-days of detections are also written in the
+format of JSON_FILE_PATH. Tables must already exist (alembic upgrade head).
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from datetime import time as Time
+from typing import Any, Iterator, Sequence
+
+from sqlalchemy import Connection, Table, func, select, text
+
+from config import settings
+from src.database.engine import EngineRegistry
+from src.database.model import Pet, ScheduledFeeding, User
+from src.modules.auth_handler import AuthHandler
+from src.schemas.detection import Detection
+
+Row = tuple[Any, ...]
+
+CPF_WEIGHTS = (tuple(range(10, 1, -1)), tuple(range(11, 1, -1)))
+CNPJ_WEIGHTS = (
+    (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+    (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+)
+FIRST_NAMES = (
+    "Ana",
+    "Bruno",
+    "Carla",
+    "Diego",
+    "Eduarda",
+    "Felipe",
+    "Gabriela",
+    "Heitor",
+    "Isabela",
+    "João",
+    "Larissa",
+    "Marcos",
+    "Natália",
+    "Paula",
+)
+LAST_NAMES = (
+    "Silva",
+    "Santos",
+    "Oliveira",
+    "Souza",
+    "Lima",
+    "Pereira",
+    "Costa",
+    "Ferreira",
+    "Almeida",
+    "Ribeiro",
+    "Carvalho",
+    "Gomes",
+    "Araújo",
+)
+STREETS = ("Rua das Flores", "Avenida Brasil", "Rua São João", "Rua XV de Novembro")
+PET_NAMES = ("Max", "Luna", "Thor", "Mel", "Bob", "Nina", "Fred", "Pipoca", "Toby")
+BREEDS = {1: ("SRD", "Shitzu", "Poodle", "Labrador"), 2: ("SRD", "Siamês", "Persa")}
+COLORS = ("Branco", "Preto", "Caramelo", "Cinza", "Malhado")
+# Breakfast, lunch and dinner, then snacks for pets fed more often.
+MEAL_TIMES = (7 * 60, 12 * 60, 19 * 60, 10 * 60, 16 * 60, 22 * 60)
+MEAL_SPREAD_MINUTES = 20
+
+USER_COLUMNS = (
+    "id",
+    "name",
+    "cpf_cnpj",
+    "email",
+    "password",
+    "address",
+    "phone",
+    "device_token",
+)
+PET_COLUMNS = ("id", "user_id", "name", "breed", "weight", "color", "kind")
+SCHEDULE_COLUMNS = ("id", "pet_id", "feeding_time")
+
+
+class DatasetGenerator:
+    """Generates the rows of one chunk of users at a time from a seeded RNG."""
+
+    def __init__(
+        self,
+        seed: int,
+        pets_per_user: int,
+        schedules_per_pet: int,
+        password: str,
+        ids: dict[str, int],
+    ) -> None:
+        self._rng = random.Random(seed)
+        self._seed = seed
+        self._pets_per_user = pets_per_user
+        self._schedules_per_pet = schedules_per_pet
+        self._password = password
+        self._ids = dict(ids)
+
+    def chunk(self, start: int, size: int) -> tuple[list[Row], list[Row], list[Row]]:
+        users: list[Row] = []
+        pets: list[Row] = []
+        schedules: list[Row] = []
+        for index in range(start, start + size):
+            user_id = self._next_id("user")
+            users.append(self._user(user_id, index))
+            for _ in range(self._count(self._pets_per_user)):
+                pet_id = self._next_id("pet")
+                pets.append(self._pet(pet_id, user_id))
+                schedules.extend(
+                    (self._next_id("scheduled_feeding"), pet_id, feeding_time)
+                    for feeding_time in self._feeding_times()
+                )
+        return users, pets, schedules
+
+    def _next_id(self, table: str) -> int:
+        self._ids[table] += 1
+        return self._ids[table]
+
+    def _count(self, average: int) -> int:
+        """1 to 2 * average - 1, so the mean is `average`."""
+        return self._rng.randint(1, max(1, 2 * average - 1))
+
+    def _user(self, user_id: int, index: int) -> Row:
+        rng = self._rng
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        document = self._cpf() if rng.random() < 0.8 else self._cnpj()
+        return (
+            user_id,
+            f"{first} {last}",
+            document,
+            f"{first.lower()}.{last.lower()}.{self._seed}.{index}@example.com",
+            self._password,
+            f"{rng.choice(STREETS)}, {rng.randint(1, 3000)}",
+            f"{rng.randint(11, 99)}9{rng.randrange(10**8):08d}",
+            # A quarter of the users never allowed notifications.
+            f"synthetic-{self._seed}-{index}" if rng.random() < 0.75 else None,
+        )
+
+    def _pet(self, pet_id: int, user_id: int) -> Row:
+        rng = self._rng
+        kind = 1 if rng.random() < 0.6 else 2
+        weight = rng.uniform(2, 40) if kind == 1 else rng.uniform(2, 7)
+        return (
+            pet_id,
+            user_id,
+            rng.choice(PET_NAMES),
+            rng.choice(BREEDS[kind]),
+            round(weight, 1),
+            rng.choice(COLORS),
+            kind,
+        )
+
+    def _feeding_times(self) -> list[Time]:
+        count = min(self._count(self._schedules_per_pet), len(MEAL_TIMES))
+        minutes = (
+            int(meal + self._rng.gauss(0, MEAL_SPREAD_MINUTES)) % (24 * 60)
+            for meal in MEAL_TIMES[:count]
+        )
+        return [Time(minute // 60, minute % 60) for minute in minutes]
+
+    def _cpf(self) -> str:
+        digits = [self._rng.randrange(10) for _ in range(9)]
+        for weights in CPF_WEIGHTS:
+            value = sum(d * w for d, w in zip(digits, weights))
+            digits.append(value * 10 % 11 % 10)
+        return "".join(map(str, digits))
+
+    def _cnpj(self) -> str:
+        digits = [self._rng.randrange(10) for _ in range(12)]
+        for weights in CNPJ_WEIGHTS:
+            remainder = sum(d * w for d, w in zip(digits, weights)) % 11
+            digits.append(0 if remainder < 2 else 11 - remainder)
+        return "".join(map(str, digits))
+
+
+class BulkWriter:
+    """Writes rows with COPY when the driver is psycopg2 and executemany otherwise."""
+
+    def __init__(self, connection: Connection) -> None:
+        self._connection = connection
+        self._copy = connection.dialect.driver == "psycopg2"
+
+    def write(self, table: Table, columns: tuple[str, ...], rows: list[Row]) -> None:
+        if not rows:
+            return
+        if not self._copy:
+            self._connection.execute(
+                table.insert(), [dict(zip(columns, row)) for row in rows]
+            )
+            return
+        buffer = io.StringIO()
+        # Unquoted empty fields are NULL in the CSV format of COPY.
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        preparer = self._connection.dialect.identifier_preparer
+        names = ", ".join(preparer.quote(column) for column in columns)
+        cursor = self._connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {preparer.format_table(table)} ({names}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+
+def detections(days: int, per_day: int, start: datetime, seed: int) -> Iterator[str]:
+    """Detections around meal times, serialized like RegisterDetection saves them."""
+    rng = random.Random(seed)
+    for day in range(days):
+        midnight = start + timedelta(days=day)
+        minutes = sorted(
+            MEAL_TIMES[index % len(MEAL_TIMES)] + rng.gauss(0, MEAL_SPREAD_MINUTES)
+            for index in range(per_day)
+        )
+        for minute in minutes:
+            timestamp = midnight + timedelta(minutes=minute)
+            yield Detection(
+                timestamp=timestamp,
+                received_at=timestamp + timedelta(seconds=rng.uniform(0.05, 2)),
+            ).model_dump_json()
+
+
+def write_detections(path: str, entries: Iterator[str]) -> int:
+    """Writes the list JSONHandler reads without holding it in memory."""
+    count = 0
+    with open(path, "w") as file:
+        file.write("[")
+        for entry in entries:
+            file.write(("," if count else "") + "\n    " + json.dumps(entry))
+            count += 1
+        file.write("\n]" if count else "]")
+    return count
+
+
+def last_ids(connection: Connection, tables: Sequence[Table]) -> dict[str, int]:
+    return {
+        table.name: connection.execute(
+            select(func.coalesce(func.max(table.c.id), 0))
+        ).scalar_one()
+        for table in tables
+    }
+
+
+def reset_sequences(connection: Connection, tables: Sequence[Table]) -> None:
+    """Moves the id sequences past the ids written explicitly by COPY."""
+    preparer = connection.dialect.identifier_preparer
+    for table in tables:
+        name = preparer.format_table(table)
+        connection.execute(
+            text(
+                "SELECT setval(pg_get_serial_sequence(:table, 'id'), "
+                f"(SELECT max(id) FROM {name}))"
+            ),
+            {"table": name},
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--pets-per-user", type=int, default=2)
+    parser.add_argument("--schedules-per-pet", type=int, default=2)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default="synthetic")
+    parser.add_argument("--detections-file")
+    parser.add_argument("--detection-days", type=int, default=90)
+    parser.add_argument("--detections-per-day", type=int, default=3)
+    parser.add_argument(
+        "--detections-start",
+        type=datetime.fromisoformat,
+        default=datetime(2026, 1, 1),
+    )
+    args = parser.parse_args()
+
+    tables = (User.__table__, Pet.__table__, ScheduledFeeding.__table__)
+    engine = EngineRegistry.get_engine(settings.database_url)
+    with engine.connect() as connection:
+        ids = last_ids(connection, tables)
+    # Every user shares one hash, bcrypt is too slow to run per row.
+    password = AuthHandler()._hash_password(args.password)
+    generator = DatasetGenerator(
+        args.seed, args.pets_per_user, args.schedules_per_pet, password, ids
+    )
+
+    totals = {table.name: 0 for table in tables}
+    start_time = time.perf_counter()
+    try:
+        for start in range(0, args.users, args.chunk_size):
+            chunk = generator.chunk(start, min(args.chunk_size, args.users - start))
+            with engine.begin() as connection:
+                if start == 0 and connection.scalar(
+                    select(User.id).where(User.email == chunk[0][0][3])
+                ):
+                    print(f"The dataset of seed {args.seed} was already generated")
+                    return 1
+                writer = BulkWriter(connection)
+                for table, columns, rows in zip(
+                    tables, (USER_COLUMNS, PET_COLUMNS, SCHEDULE_COLUMNS), chunk
+                ):
+                    writer.write(table, columns, rows)
+                    totals[table.name] += len(rows)
+            elapsed = time.perf_counter() - start_time
+            print(
+                f"{totals['user']} users, {totals['pet']} pets, "
+                f"{totals['scheduled_feeding']} scheduled feedings "
+                f"({sum(totals.values()) / elapsed:.0f} rows/s)",
+                flush=True,
+            )
+        if engine.dialect.name == "postgresql":
+            with engine.begin() as connection:
+                reset_sequences(connection, tables)
+    finally:
+        EngineRegistry.dispose_all()
+
+    if args.detections_file:
+        written = write_detections(
+            args.detections_file,
+            detections(
+                args.detection_days,
+                args.detections_per_day,
+                args.detections_start,
+                args.seed,
+            ),
+        )
+        print(f"{written} detections written to {args.detections_file}")
+    print(f"Done in {time.perf_counter() - start_time:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
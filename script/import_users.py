@@ -0,0 +1,68 @@
+"""Imports users from a CSV file into the database in DATABASE_URL.
+
+The file is read in blocks and every chunk of rows is validated, checked for
+duplicates and upserted by email in its own transaction, printing the progress
+after each one:
+
+    python -m script.import_users users.csv --chunk-size 1000
+
+The header needs the columns name, cpf_cnpj, email, phone, address and password.
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+
+from config import settings
+from src.database import AsyncDatabaseConnection
+from src.database.engine import EngineRegistry
+from src.modules.user import ImportUsers
+from src.schemas.user import ImportUsersResponse
+
+BLOCK_SIZE = 64 * 1024
+
+
+async def read_blocks(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while block := file.read(BLOCK_SIZE):
+            yield block
+
+
+def print_progress(summary: ImportUsersResponse) -> None:
+    print(
+        f"{summary.rows} rows: {summary.created} created, "
+        f"{summary.updated} updated, {summary.failed} failed",
+        flush=True,
+    )
+
+
+async def run(path: str, chunk_size: int) -> int:
+    session = AsyncDatabaseConnection().create_session()
+    try:
+        response = await ImportUsers(
+            session, read_blocks(path), chunk_size, print_progress
+        ).execute()
+    except HTTPException as e:
+        print(f"Import failed: {e.detail}")
+        return 1
+    finally:
+        await session.close()
+        await EngineRegistry.dispose_all_async()
+    for error in response.data.errors if response.data else []:
+        print(f"row {error.row}: {error.detail}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=settings.import_chunk_size)
+    args = parser.parse_args()
+    return asyncio.run(run(args.path, args.chunk_size))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
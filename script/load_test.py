@@ -0,0 +1,385 @@
+"""Load test of the main endpoints against a local server.
+
+Boots the application with uvicorn on a free port, with the stub notification
+transport and a temporary detections file, seeds synthetic users, pets and
+scheduled feedings, and drives each scenario with --concurrency clients.
+Throughput and p50/p95/p99 latencies of every scenario are printed and written
+to a JSON file that can be compared between commits:
+
+    python -m script.load_test --concurrency 20 --requests 2000 --output load_test.json
+
+Without --database-url the server runs on a new SQLite database in a temporary
+directory; with it, the database must already be migrated. The other settings
+come from the environment or .env, like the application. The scheduler runs
+in this process, one tick at a time like its thread in the application.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, time as Time, timezone
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+SCENARIOS = ("login", "detectar", "pets", "pet", "users", "scheduler")
+EMAIL_PREFIX = "load-test-"
+PASSWORD = "load-test"
+
+
+@dataclass
+class Result:
+    latencies: list[float]
+    errors: int
+    seconds: float
+
+    def summary(self) -> dict[str, float]:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "throughput": round(len(latencies) / self.seconds, 1),
+            "p50_ms": percentile(latencies, 0.50),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": percentile(latencies, 1.0),
+        }
+
+
+def percentile(latencies: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted latencies in seconds, in milliseconds."""
+    if not latencies:
+        return 0.0
+    index = max(0, min(len(latencies) - 1, round(fraction * len(latencies)) - 1))
+    return round(latencies[index] * 1000, 2)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+async def drive(
+    concurrency: int, requests: int, call: Callable[[int], Awaitable[bool]]
+) -> Result:
+    """Runs `call` `requests` times from `concurrency` workers."""
+    latencies: list[float] = []
+    errors = 0
+    indexes = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in indexes:
+            start = time.perf_counter()
+            ok = await call(index)
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return Result(latencies, errors, time.perf_counter() - start)
+
+
+def cpf(rng: random.Random) -> str:
+    """A valid CPF with random digits."""
+    digits = [rng.randrange(10) for _ in range(9)]
+    for position in (9, 10):
+        value = sum(d * (position + 1 - i) for i, d in enumerate(digits))
+        digits.append(value * 10 % 11 % 10)
+    text = "".join(map(str, digits))
+    return f"{text[:3]}.{text[3:6]}.{text[6:9]}-{text[9:]}"
+
+
+def seed(
+    users: int, pets_per_user: int, schedules_per_pet: int, rng_seed: int
+) -> list[int]:
+    """Inserts the synthetic users that are missing and returns the pet ids to read."""
+    from sqlalchemy import insert, select
+
+    from src.database import DatabaseConnection
+    from src.database.model import Pet, ScheduledFeeding, User
+    from src.modules.auth_handler import AuthHandler
+
+    rng = random.Random(rng_seed)
+    emails = [f"{EMAIL_PREFIX}{index}@foodtracker.com" for index in range(users)]
+    session = DatabaseConnection().create_session()
+    try:
+        existing = set(
+            session.scalars(select(User.email).where(User.email.in_(emails)))
+        )
+        password = AuthHandler()._hash_password(PASSWORD)
+        new_users = [
+            {
+                "name": f"Load test {index}",
+                "cpf_cnpj": cpf(rng),
+                "email": email,
+                "password": password,
+                "address": "Load test address",
+                "phone": f"7499{rng.randrange(10**7):07d}",
+                "device_token": f"{EMAIL_PREFIX}{index}",
+            }
+            for index, email in enumerate(emails)
+            if email not in existing
+        ]
+        user_ids = (
+            session.scalars(insert(User).returning(User.id), new_users).all()
+            if new_users
+            else []
+        )
+        new_pets = [
+            {
+                "user_id": user_id,
+                "name": f"Pet {user_id}-{number}",
+                "breed": rng.choice(["SRD", "Poodle", "Siamês", "Labrador"]),
+                "weight": round(rng.uniform(1, 40), 1),
+                "color": rng.choice(["Branco", "Preto", "Caramelo"]),
+                "kind": rng.randint(1, 2),
+            }
+            for user_id in user_ids
+            for number in range(pets_per_user)
+        ]
+        pet_ids = (
+            session.scalars(insert(Pet).returning(Pet.id), new_pets).all()
+            if new_pets
+            else []
+        )
+        new_schedules = [
+            {
+                "pet_id": pet_id,
+                "feeding_time": Time(rng.randrange(24), rng.randrange(60)),
+            }
+            for pet_id in pet_ids
+            for _ in range(schedules_per_pet)
+        ]
+        if new_schedules:
+            session.execute(insert(ScheduledFeeding), new_schedules)
+        session.commit()
+        return list(session.scalars(select(Pet.id).where(Pet.enabled)))
+    finally:
+        session.close()
+
+
+def scheduler_tick() -> None:
+    from src.modules.scheduler import job
+
+    job()
+
+
+async def wait_until_ready(
+    client: httpx.AsyncClient, server: subprocess.Popen[bytes]
+) -> None:
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit("The server exited while starting, see its log")
+        try:
+            if (await client.get("/metrics")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("The server did not start in 60 seconds")
+
+
+async def run(
+    args: argparse.Namespace, base_url: str, server: subprocess.Popen[bytes]
+) -> dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        await wait_until_ready(client, server)
+        pet_ids = await asyncio.to_thread(
+            seed, args.users, args.pets_per_user, args.schedules_per_pet, args.seed
+        )
+        login = await client.post(
+            "/auth/login",
+            json={"email": f"{EMAIL_PREFIX}0@foodtracker.com", "password": PASSWORD},
+        )
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        rng = random.Random(args.seed)
+
+        async def ok(request: Awaitable[httpx.Response]) -> bool:
+            try:
+                return (await request).status_code < 400
+            except httpx.HTTPError:
+                return False
+
+        async def tick(_: int) -> bool:
+            try:
+                await asyncio.to_thread(scheduler_tick)
+                return True
+            except Exception:
+                return False
+
+        calls: dict[str, tuple[int, int, Callable[[int], Awaitable[bool]]]] = {
+            "login": (
+                args.concurrency,
+                args.login_requests,
+                lambda index: ok(
+                    client.post(
+                        "/auth/login",
+                        json={
+                            "email": f"{EMAIL_PREFIX}{index % args.users}@foodtracker.com",
+                            "password": PASSWORD,
+                        },
+                    )
+                ),
+            ),
+            "detectar": (
+                args.concurrency,
+                args.requests,
+                lambda _: ok(
+                    client.post(
+                        "/detectar",
+                        json={"timestamp": datetime.now(timezone.utc).isoformat()},
+                    )
+                ),
+            ),
+            "pets": (
+                args.concurrency,
+                args.requests,
+                lambda _: ok(client.get("/pets/", headers=headers)),
+            ),
+            "pet": (
+                args.concurrency,
+                args.requests,
+                lambda _: ok(
+                    client.get(f"/pets/{rng.choice(pet_ids)}", headers=headers)
+                ),
+            ),
+            "users": (
+                args.concurrency,
+                args.requests,
+                lambda _: ok(client.get("/users/", headers=headers)),
+            ),
+            "scheduler": (1, args.scheduler_ticks, tick),
+        }
+
+        results = {}
+        for name in args.scenarios:
+            concurrency, requests, call = calls[name]
+            results[name] = (await drive(concurrency, requests, call)).summary()
+            print_row(name, results[name])
+        return results
+
+
+def print_row(name: str, summary: dict[str, float]) -> None:
+    print(
+        f"{name:<11}{summary['requests']:>9}{summary['errors']:>8}"
+        f"{summary['throughput']:>10.1f}{summary['p50_ms']:>10.1f}"
+        f"{summary['p95_ms']:>10.1f}{summary['p99_ms']:>10.1f}",
+        flush=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--database-url")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--login-requests", type=int, default=200)
+    parser.add_argument("--scheduler-ticks", type=int, default=20)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--pets-per-user", type=int, default=2)
+    parser.add_argument("--schedules-per-pet", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--output", default="load_test.json")
+    args = parser.parse_args()
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.update(
+            {
+                "DATABASE_URL": args.database_url
+                or f"sqlite:///{os.path.join(directory, 'load_test.db')}",
+                "JSON_FILE_PATH": os.path.join(directory, "detections.json"),
+                "NOTIFICATION_TRANSPORT": "stub",
+                "SEED_DEFAULT_DATA": "true",
+            }
+        )
+        # Imported after the environment is set, so settings point to the same
+        # database as the server.
+        from config import settings
+        from src.modules.log import FORMAT, Log
+
+        # The scheduler ticks log here instead of over the results.
+        harness_log = logging.FileHandler(os.path.join(directory, "scheduler.log"))
+        harness_log.setFormatter(logging.Formatter(FORMAT))
+        Log.start([harness_log])
+
+        from src.database.engine import EngineRegistry
+
+        if args.database_url is None:
+            from src.database.model import Base
+
+            Base.metadata.create_all(EngineRegistry.get_engine(settings.database_url))
+
+        port = free_port()
+        server_log_path = os.path.join(directory, "server.log")
+        with open(server_log_path, "wb") as server_log:
+            server = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "uvicorn",
+                    "main:app",
+                    "--port",
+                    str(port),
+                    "--no-access-log",
+                    "--log-level",
+                    "warning",
+                ],
+                stdout=server_log,
+                stderr=subprocess.STDOUT,
+            )
+        print(
+            f"{'scenario':<11}{'requests':>9}{'errors':>8}{'req/s':>10}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+        )
+        try:
+            results = asyncio.run(run(args, f"http://127.0.0.1:{port}", server))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+            EngineRegistry.dispose_all()
+            Log.stop()
+            if server.returncode not in (0, -15):
+                with open(server_log_path) as server_log:
+                    print(server_log.read()[-4000:])
+
+    report = {
+        "started_at": started_at,
+        "database": settings.database_url.split(":", 1)[0],
+        "concurrency": args.concurrency,
+        "users": args.users,
+        "pets_per_user": args.pets_per_user,
+        "schedules_per_pet": args.schedules_per_pet,
+        "scenarios": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+    return 1 if any(result["errors"] for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -32,6 +32,6 @@ echo "Activating virtual environment"
 . .venv/bin/activate
 
 echo "Running alembic commands..."
-alembic stamp head --purge
-alembic revision --autogenerate
+# The database above is always new. For a database created before the schema
+# was versioned, run "alembic stamp --purge 2481db69517c" once before this.
 alembic upgrade head
\ No newline at end of file
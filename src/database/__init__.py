@@ -1,23 +1,60 @@
-from typing import Generator
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from typing import AsyncGenerator, Generator
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from config import Settings
-
-settings = Settings()
+from config import settings
+from src.database.engine import EngineRegistry
+from src.database.replica import replica_router
+from src.schemas.database import PoolStatistics
 
 
 class DatabaseConnection:
-    def __init__(self) -> None:
-        self._engine = create_engine(settings.database_url)
-        self._sessionmaker = sessionmaker(bind=self._engine)
+    def __init__(self, read_only: bool = False) -> None:
+        self._read_only = read_only
+        self._engine = EngineRegistry.get_engine(settings.database_url)
+        self._sessionmaker = EngineRegistry.get_sessionmaker(settings.database_url)
 
     def get_db_session(self) -> Generator[Session, None, None]:
-        session = self._sessionmaker()
+        session = self.create_session()
         try:
             yield session
         finally:
             session.close()
 
     def create_session(self) -> Session:
+        replica_url = replica_router.choose() if self._read_only else None
+        if replica_url is not None:
+            return EngineRegistry.get_sessionmaker(replica_url)()
+        return self._sessionmaker()
+
+    def pool_statistics(self) -> list[PoolStatistics]:
+        return EngineRegistry.statistics()
+
+
+class AsyncDatabaseConnection:
+    def __init__(self, read_only: bool = False) -> None:
+        self._read_only = read_only
+        self._engine = EngineRegistry.get_async_engine(settings.database_url)
+        self._sessionmaker = EngineRegistry.get_async_sessionmaker(
+            settings.database_url
+        )
+
+    async def get_db_session(self) -> AsyncGenerator[AsyncSession, None]:
+        session = self.create_session()
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    def create_session(self) -> AsyncSession:
+        replica_url = replica_router.choose() if self._read_only else None
+        if replica_url is not None:
+            return EngineRegistry.get_async_sessionmaker(replica_url)()
         return self._sessionmaker()
+
+    def is_primary(self, session: AsyncSession) -> bool:
+        """Whether the session reads from DATABASE_URL rather than a replica."""
+        return session.bind is self._engine
+
+    def pool_statistics(self) -> list[PoolStatistics]:
+        return EngineRegistry.statistics()
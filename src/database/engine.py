@@ -0,0 +1,255 @@
+import threading
+import time
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from config import settings
+from src.schemas.database import PoolStatistics
+
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+class PoolCounters:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures how long each checkout waits for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.counters = PoolCounters()
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.counters.increment("timeouts")
+            raise
+        finally:
+            self.counters.record_wait(time.perf_counter() - start)
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    pass
+
+
+def to_async_url(database_url: str) -> str:
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    url = url.set(drivername=f"{backend}+{driver}")
+    if driver == "asyncpg":
+        # asyncpg prepares every statement server side and keeps them per connection
+        url = url.update_query_dict(
+            {
+                "prepared_statement_cache_size": str(
+                    settings.database_prepared_statement_cache_size
+                )
+            }
+        )
+    return url.render_as_string(hide_password=False)
+
+
+class EngineRegistry:
+    """Process-wide registry holding one engine (and one pool) per database URL."""
+
+    _lock = threading.Lock()
+    _engines: dict[str, Engine] = {}
+    _sessionmakers: dict[str, sessionmaker[Session]] = {}
+    _async_engines: dict[str, AsyncEngine] = {}
+    _async_sessionmakers: dict[str, async_sessionmaker[AsyncSession]] = {}
+
+    @classmethod
+    def get_engine(cls, database_url: str) -> Engine:
+        engine = cls._engines.get(database_url)
+        if engine is not None:
+            return engine
+        with cls._lock:
+            if database_url not in cls._engines:
+                cls._engines[database_url] = cls._create_engine(database_url)
+            return cls._engines[database_url]
+
+    @classmethod
+    def get_sessionmaker(cls, database_url: str) -> sessionmaker[Session]:
+        factory = cls._sessionmakers.get(database_url)
+        if factory is not None:
+            return factory
+        engine = cls.get_engine(database_url)
+        with cls._lock:
+            if database_url not in cls._sessionmakers:
+                cls._sessionmakers[database_url] = sessionmaker(bind=engine)
+            return cls._sessionmakers[database_url]
+
+    @classmethod
+    def get_async_engine(cls, database_url: str) -> AsyncEngine:
+        engine = cls._async_engines.get(database_url)
+        if engine is not None:
+            return engine
+        with cls._lock:
+            if database_url not in cls._async_engines:
+                cls._async_engines[database_url] = cls._create_async_engine(
+                    database_url
+                )
+            return cls._async_engines[database_url]
+
+    @classmethod
+    def get_async_sessionmaker(
+        cls, database_url: str
+    ) -> async_sessionmaker[AsyncSession]:
+        factory = cls._async_sessionmakers.get(database_url)
+        if factory is not None:
+            return factory
+        engine = cls.get_async_engine(database_url)
+        with cls._lock:
+            if database_url not in cls._async_sessionmakers:
+                cls._async_sessionmakers[database_url] = async_sessionmaker(
+                    bind=engine, expire_on_commit=False
+                )
+            return cls._async_sessionmakers[database_url]
+
+    @classmethod
+    def statistics(cls) -> list[PoolStatistics]:
+        engines = list(cls._engines.values()) + [
+            engine.sync_engine for engine in list(cls._async_engines.values())
+        ]
+        return [
+            cls._pool_statistics(engine)
+            for engine in engines
+            if isinstance(engine.pool, InstrumentedQueuePool)
+        ]
+
+    @classmethod
+    def dispose_all(cls) -> None:
+        with cls._lock:
+            for engine in cls._engines.values():
+                engine.dispose()
+            cls._engines.clear()
+            cls._sessionmakers.clear()
+
+    @classmethod
+    async def dispose_all_async(cls) -> None:
+        for engine in list(cls._async_engines.values()):
+            await engine.dispose()
+        with cls._lock:
+            cls._async_engines.clear()
+            cls._async_sessionmakers.clear()
+
+    @classmethod
+    def _create_engine(cls, database_url: str) -> Engine:
+        engine = create_engine(
+            database_url,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+            pool_pre_ping=settings.database_pool_pre_ping,
+            pool_recycle=settings.database_pool_recycle,
+            query_cache_size=settings.database_query_cache_size,
+            connect_args=cls._connect_args(database_url),
+        )
+        cls._listen_pool_events(engine)
+        return engine
+
+    @classmethod
+    def _create_async_engine(cls, database_url: str) -> AsyncEngine:
+        engine = create_async_engine(
+            to_async_url(database_url),
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+            pool_pre_ping=settings.database_pool_pre_ping,
+            pool_recycle=settings.database_pool_recycle,
+            query_cache_size=settings.database_query_cache_size,
+            connect_args=cls._async_connect_args(database_url),
+        )
+        cls._listen_pool_events(engine.sync_engine)
+        return engine
+
+    @staticmethod
+    def _connect_args(database_url: str) -> dict[str, Any]:
+        timeout = settings.database_statement_timeout_ms
+        if timeout <= 0 or make_url(database_url).get_backend_name() != "postgresql":
+            return {}
+        return {"options": f"-c statement_timeout={timeout}"}
+
+    @staticmethod
+    def _async_connect_args(database_url: str) -> dict[str, Any]:
+        timeout = settings.database_statement_timeout_ms
+        if timeout <= 0 or make_url(database_url).get_backend_name() != "postgresql":
+            return {}
+        return {"server_settings": {"statement_timeout": str(timeout)}}
+
+    @staticmethod
+    def _listen_pool_events(engine: Engine) -> None:
+        if not isinstance(engine.pool, InstrumentedQueuePool):
+            return
+
+        def count(counter: str) -> Callable[..., None]:
+            def listener(*_: Any) -> None:
+                # dispose() replaces the pool, and its counters, keeping the listeners
+                pool = engine.pool
+                if isinstance(pool, InstrumentedQueuePool):
+                    pool.counters.increment(counter)
+
+            return listener
+
+        for event_name, counter in (
+            ("connect", "connects"),
+            ("checkout", "checkouts"),
+            ("checkin", "checkins"),
+            ("invalidate", "invalidations"),
+        ):
+            event.listen(engine.pool, event_name, count(counter))
+
+    @staticmethod
+    def _pool_statistics(engine: Engine) -> PoolStatistics:
+        pool: InstrumentedQueuePool = engine.pool  # type: ignore[assignment]
+        counters = pool.counters
+        return PoolStatistics(
+            url=engine.url.render_as_string(hide_password=True),
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            connects=counters.connects,
+            checkouts=counters.checkouts,
+            checkins=counters.checkins,
+            invalidations=counters.invalidations,
+            timeouts=counters.timeouts,
+            wait_seconds_total=counters.wait_seconds_total,
+            wait_seconds_max=counters.wait_seconds_max,
+        )
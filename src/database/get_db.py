@@ -1,11 +1,9 @@
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 
-from src.settings import Settings
+from config import settings
+from src.database.engine import EngineRegistry
 
-settings = Settings()
-
-engine = create_engine(settings.DATABASE_URL)
+engine = EngineRegistry.get_engine(settings.database_url)
 SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
@@ -8,12 +8,14 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Time,
     func,
     text,
 )
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import (
     Mapped,
     Session,
@@ -40,6 +42,7 @@ class Example(Base):  # type: ignore[valid-type, misc]
 
 class User(Base):  # type: ignore[valid-type, misc]
     __tablename__ = "user"
+    __table_args__ = (Index("ix_user_cpf_cnpj", "cpf_cnpj"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     cpf_cnpj: Mapped[str] = mapped_column(String)
@@ -49,19 +52,22 @@ class User(Base):  # type: ignore[valid-type, misc]
     address: Mapped[str] = mapped_column(String)
     phone: Mapped[str] = mapped_column(String)
     email_verified: Mapped[bool] = mapped_column(Boolean, server_default=text("FALSE"))
-    device_token: Mapped[str] = mapped_column(String, unique=True)
+    device_token: Mapped[str | None] = mapped_column(String, unique=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), onupdate=func.now()
     )
     enabled: Mapped[bool] = mapped_column(Boolean, server_default=text("TRUE"))
+    version: Mapped[int] = mapped_column(Integer, server_default=text("1"))
 
     pets: Mapped[List["Pet"]] = relationship(
-        "Pet", back_populates="owner", cascade="all, delete", lazy="joined"
+        "Pet", back_populates="owner", cascade="all, delete", lazy="noload"
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
     @staticmethod
-    def add_user(session: Session, new_user: SchemaCreateUser) -> None:
+    async def add_user(session: AsyncSession, new_user: SchemaCreateUser) -> None:
         user = User(
             name=new_user.name,
             cpf_cnpj=new_user.cpf_cnpj,
@@ -71,11 +77,15 @@ class User(Base):  # type: ignore[valid-type, misc]
             phone=new_user.phone,
         )
         session.add(user)
-        session.commit()
+        await session.commit()
 
 
 class Pet(Base):  # type: ignore[valid-type, misc]
     __tablename__ = "pet"
+    __table_args__ = (
+        Index("ix_pet_user_id", "user_id"),
+        Index("ix_pet_kind_id", "kind", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String)
@@ -86,7 +96,10 @@ class Pet(Base):  # type: ignore[valid-type, misc]
     castred: Mapped[bool] = mapped_column(Boolean, server_default=text("FALSE"))
     enabled: Mapped[bool] = mapped_column(Boolean, server_default=text("TRUE"))
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=False)
-    owner: Mapped["User"] = relationship("User", back_populates="pets", lazy="joined")
+    version: Mapped[int] = mapped_column(Integer, server_default=text("1"))
+    owner: Mapped["User"] = relationship("User", back_populates="pets", lazy="noload")
+
+    __mapper_args__ = {"version_id_col": version}
 
     @staticmethod
     def add_pet(
@@ -134,9 +147,19 @@ class Pet(Base):  # type: ignore[valid-type, misc]
 
 class ScheduledFeeding(Base):  # type: ignore[valid-type, misc]
     __tablename__ = "scheduled_feeding"
+    __table_args__ = (
+        Index("ix_scheduled_feeding_pet_id", "pet_id"),
+        Index(
+            "ix_scheduled_feeding_pet_id_feeding_time",
+            "pet_id",
+            "feeding_time",
+            postgresql_where=text("enabled"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     feeding_time: Mapped[time] = mapped_column(Time)
     enabled: Mapped[bool] = mapped_column(Boolean, server_default=text("TRUE"))
     notified: Mapped[bool] = mapped_column(Boolean, server_default=text("FALSE"))
     pet_id: Mapped[int] = mapped_column(ForeignKey("pet.id"))
+    pet: Mapped["Pet"] = relationship("Pet", lazy="noload")
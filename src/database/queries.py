@@ -0,0 +1,103 @@
+from datetime import time
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    StatementLambdaElement,
+    exists,
+    lambda_stmt,
+    or_,
+    select,
+)
+from sqlalchemy.orm import QueryableAttribute
+
+from src.database.model import Pet, ScheduledFeeding, User
+from src.schemas.pet import PetFilters
+from src.schemas.user import UserFilters
+
+
+def user_by_email(email: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.email == email, User.enabled))
+
+
+def user_by_id(user_id: int) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.id == user_id))
+
+
+def users_by_email_or_cpf_cnpj(email: str, cpf_cnpj: str) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(User).where(or_(User.email == email, User.cpf_cnpj == cpf_cnpj))
+    )
+
+
+def users_by_emails_or_cpf_cnpjs(
+    emails: list[str], cpf_cnpjs: list[str]
+) -> Select[tuple[str, str]]:
+    return select(User.email, User.cpf_cnpj).where(
+        or_(User.email.in_(emails), User.cpf_cnpj.in_(cpf_cnpjs))
+    )
+
+
+def default_user_with_pet(email: str) -> Select[tuple[int, bool]]:
+    return select(User.id, exists().where(Pet.user_id == User.id)).where(
+        User.email == email
+    )
+
+
+def pet_by_id(pet_id: int) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Pet).where(Pet.id == pet_id))
+
+
+def pets_by_user(user_id: int) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(Pet).where(Pet.user_id == user_id))
+
+
+def enabled_scheduled_feeding(
+    pet_id: int, feeding_time: time
+) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(ScheduledFeeding).where(
+            ScheduledFeeding.pet_id == pet_id,
+            ScheduledFeeding.feeding_time == feeding_time,
+            ScheduledFeeding.enabled,
+        )
+    )
+
+
+def users_page(
+    filters: UserFilters,
+    after_id: int | None,
+    limit: int,
+    *columns: ColumnElement[Any] | QueryableAttribute[Any],
+) -> Select[Any]:
+    statement = (select(*columns) if columns else select(User)).where(
+        User.enabled == filters.enabled
+    )
+    if filters.pet_kind is not None:
+        statement = statement.where(User.pets.any(Pet.kind == filters.pet_kind))
+    if after_id is not None:
+        statement = statement.where(User.id > after_id)
+    return statement.order_by(User.id).limit(limit)
+
+
+def pets_page(
+    filters: PetFilters,
+    after_id: int | None,
+    limit: int,
+    *columns: ColumnElement[Any] | QueryableAttribute[Any],
+) -> Select[Any]:
+    statement = select(*columns) if columns else select(Pet)
+    if filters.kind is not None:
+        statement = statement.where(Pet.kind == filters.kind)
+    if filters.enabled is not None:
+        statement = statement.where(Pet.enabled == filters.enabled)
+    if filters.user_id is not None:
+        statement = statement.where(Pet.user_id == filters.user_id)
+    if after_id is not None:
+        statement = statement.where(Pet.id > after_id)
+    return statement.order_by(Pet.id).limit(limit)
+
+
+def pet_versions_by_users(user_ids: list[int]) -> Select[tuple[int, int, int]]:
+    return select(Pet.user_id, Pet.id, Pet.version).where(Pet.user_id.in_(user_ids))
@@ -0,0 +1,192 @@
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from config import settings
+from src.database.engine import EngineRegistry
+from src.modules.log import Log
+
+
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+read_consistency_key: ContextVar[int | None] = ContextVar(
+    "read_consistency_key", default=None
+)
+
+
+class ReplicaState:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.healthy = True
+        self.lag_seconds = 0.0
+        self.checked_at = 0.0
+
+
+class ReplicaRouter:
+    """Round-robin selection over healthy replicas, falling back to the primary.
+
+    Reads issued shortly after a write by the same user stay on the primary so
+    they can see their own changes; replicas lagging beyond the staleness bound
+    are skipped.
+    """
+
+    def __init__(
+        self,
+        replica_urls: list[str],
+        max_staleness_seconds: float,
+        read_after_write_seconds: float,
+        health_check_interval: float,
+    ) -> None:
+        self._log = Log()
+        self._replicas = [ReplicaState(url) for url in replica_urls]
+        self._max_staleness_seconds = max_staleness_seconds
+        self._read_after_write_seconds = read_after_write_seconds
+        self._health_check_interval = health_check_interval
+        self._cycle = itertools.cycle(self._replicas)
+        self._lock = threading.Lock()
+        self._last_writes: dict[int | None, float] = {}
+        self._monitor: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._replicas)
+
+    def choose(self) -> str | None:
+        if not self._replicas or self._wrote_recently():
+            return None
+        self._ensure_monitor()
+        with self._lock:
+            for _ in range(len(self._replicas)):
+                replica = next(self._cycle)
+                if replica.healthy:
+                    return replica.url
+        return None
+
+    def record_write(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_writes[read_consistency_key.get()] = now
+            expired = [
+                key
+                for key, written_at in self._last_writes.items()
+                if now - written_at > self._read_after_write_seconds
+            ]
+            for key in expired:
+                del self._last_writes[key]
+
+    def mark_unhealthy(self, url: str) -> None:
+        for replica in self._replicas:
+            if replica.url == url and replica.healthy:
+                self._log.warning("Replica %s marked as unhealthy", self._safe(url))
+                replica.healthy = False
+
+    def states(self) -> list[ReplicaState]:
+        return list(self._replicas)
+
+    def _wrote_recently(self) -> bool:
+        written_at = self._last_writes.get(read_consistency_key.get())
+        return (
+            written_at is not None
+            and time.monotonic() - written_at < self._read_after_write_seconds
+        )
+
+    def _ensure_monitor(self) -> None:
+        if self._monitor is not None:
+            return
+        with self._lock:
+            if self._monitor is None:
+                for replica in self._replicas:
+                    self._listen_errors(replica.url)
+                self._monitor = threading.Thread(
+                    target=self._run_monitor, name="replica-monitor", daemon=True
+                )
+                self._monitor.start()
+
+    def _run_monitor(self) -> None:
+        while True:
+            for replica in self._replicas:
+                self._check(replica)
+            time.sleep(self._health_check_interval)
+
+    def _check(self, replica: ReplicaState) -> None:
+        try:
+            with EngineRegistry.get_engine(replica.url).connect() as connection:
+                if make_url(replica.url).get_backend_name() == "postgresql":
+                    replica.lag_seconds = float(
+                        connection.execute(POSTGRES_LAG_QUERY).scalar_one()
+                    )
+                else:
+                    connection.execute(text("SELECT 1"))
+            stale = (
+                self._max_staleness_seconds > 0
+                and replica.lag_seconds > self._max_staleness_seconds
+            )
+            if stale:
+                self._log.warning(
+                    "Replica %s is %.1fs behind the primary",
+                    self._safe(replica.url),
+                    replica.lag_seconds,
+                )
+            replica.healthy = not stale
+        except Exception as e:
+            self._log.error(
+                "Error checking replica %s: %s", self._safe(replica.url), str(e)
+            )
+            replica.healthy = False
+        finally:
+            replica.checked_at = time.monotonic()
+
+    def _listen_errors(self, url: str) -> None:
+        def handle_error(context: Any) -> None:
+            if context.is_disconnect:
+                self.mark_unhealthy(url)
+
+        event.listen(EngineRegistry.get_engine(url), "handle_error", handle_error)
+        event.listen(
+            EngineRegistry.get_async_engine(url).sync_engine,
+            "handle_error",
+            handle_error,
+        )
+
+    @staticmethod
+    def _safe(url: str) -> str:
+        return make_url(url).render_as_string(hide_password=True)
+
+
+replica_router = ReplicaRouter(
+    settings.database_replica_urls,
+    settings.database_replica_max_staleness_seconds,
+    settings.database_replica_read_after_write_seconds,
+    settings.database_replica_health_check_interval,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _flag_session_write(session: Session, flush_context: Any) -> None:
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_statement_write(orm_execute_state: ORMExecuteState) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_session_write(session: Session) -> None:
+    if session.info.pop("has_writes", False):
+        replica_router.record_write()
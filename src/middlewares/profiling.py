@@ -0,0 +1,90 @@
+import cProfile
+import hmac
+import random
+import threading
+import time
+from contextlib import nullcontext
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.query_stats import current_query_stats, track_queries
+from src.modules.profiling import RequestProfile, current_profile, profile_store
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILES_PATH = "/debug/profiles"
+
+# cProfile can only run once per thread, and every request shares the loop thread.
+_profiler_lock = threading.Lock()
+
+
+class ProfilingMiddleware:
+    """Profiles requests sent with the X-Profile token or picked by `sample_rate`.
+
+    Other requests only pay for the checks that decide it. Add it before
+    QueryCountMiddleware so the database time comes from the same timers.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 0, token: str = "") -> None:
+        self._app = app
+        self._sample_rate = sample_rate
+        self._token = token.encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self._app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], trigger)
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile.id
+            await send(message)
+
+        stats = current_query_stats.get()
+        tracking = track_queries() if stats is None else nullcontext(stats)
+        with tracking as stats:
+            queries_seconds = stats.seconds
+            token = current_profile.set(profile)
+            profiler = self._start_profiler()
+            start = time.perf_counter()
+            try:
+                await self._app(scope, receive, send_with_profile)
+            finally:
+                profile.seconds = time.perf_counter() - start
+                if profiler is not None:
+                    profiler.disable()
+                    _profiler_lock.release()
+                    profile.profiler = profiler
+                current_profile.reset(token)
+                profile.add("db", stats.seconds - queries_seconds)
+        await run_in_threadpool(profile_store.add, profile)
+
+    def _trigger(self, scope: Scope) -> str | None:
+        if scope["path"].startswith(PROFILES_PATH):
+            return None
+        if self._token:
+            for name, value in scope["headers"]:
+                if name == b"x-profile" and hmac.compare_digest(value, self._token):
+                    return "header"
+        if self._sample_rate and random.random() < self._sample_rate:
+            return "sample"
+        return None
+
+    @staticmethod
+    def _start_profiler() -> cProfile.Profile | None:
+        if not _profiler_lock.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler, like a debugger or coverage, owns the thread.
+            _profiler_lock.release()
+            return None
+        return profiler
@@ -0,0 +1,52 @@
+from typing import Any
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.query_stats import track_queries
+from src.modules.log import Log
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+
+
+class QueryCountMiddleware:
+    def __init__(self, app: ASGIApp, repeated_query_threshold: int = 0) -> None:
+        self._app = app
+        self._log = Log()
+        self._repeated_query_threshold = repeated_query_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers[QUERY_COUNT_HEADER] = str(stats.count)
+                    headers[QUERY_TIME_HEADER] = f"{stats.seconds * 1000:.2f}"
+                await send(message)
+
+            await self._app(scope, receive, send_with_stats)
+
+        if self._repeated_query_threshold > 0:
+            for statement, count in stats.repeated(self._repeated_query_threshold):
+                self._log.warning(
+                    "Possible N+1 on %s %s: statement executed %d times: %s",
+                    scope["method"],
+                    scope["path"],
+                    count,
+                    statement,
+                )
+
+
+def assert_max_queries(response: Any, max_queries: int) -> None:
+    count = int(response.headers[QUERY_COUNT_HEADER])
+    if count > max_queries:
+        raise AssertionError(
+            f"{response.request.method} {response.request.url.path} executed "
+            f"{count} queries, budget is {max_queries}"
+        )
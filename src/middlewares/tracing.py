@@ -0,0 +1,58 @@
+import re
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.modules.tracing import SERVER, start_trace
+
+# W3C trace context: version-trace_id-parent_id-flags.
+TRACEPARENT = re.compile(rb"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class TracingMiddleware:
+    """Opens the root span of every sampled request.
+
+    Requests carrying a sampled traceparent header join the caller's trace.
+    The span is named after the route template once routing has run.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self._app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        with start_trace(
+            f"{scope['method']} {scope['path']}",
+            SERVER,
+            self._parent(scope),
+            {"http.request.method": scope["method"], "url.path": scope["path"]},
+        ) as root:
+            if root is None:
+                await self._app(scope, receive, send)
+                return
+
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    root.set("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        root.error = f"HTTP {message['status']}"
+                await send(message)
+
+            try:
+                await self._app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    root.name = f"{scope['method']} {route}"
+                    root.set("http.route", route)
+
+    @staticmethod
+    def _parent(scope: Scope) -> tuple[str, str] | None:
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                match = TRACEPARENT.match(value)
+                if match and int(match[3], 16) & 1:
+                    return match[1].decode(), match[2].decode()
+        return None
@@ -1,35 +1,50 @@
 import jwt
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Annotated, Any
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import ValidationError
-from sqlalchemy import select
-from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from config import Settings
-from src.database import DatabaseConnection
+from config import settings
+from src.database import AsyncDatabaseConnection
+from src.database.queries import user_by_email
+from src.database.replica import read_consistency_key
 from src.database.model import User
+from src.modules.cache import cache, user_key
 from src.modules.log import Log
+from src.modules.profiling import profiled
 from src.schemas.auth import Token, UserDataToken
 
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
 security = HTTPBearer()
 
-settings = Settings()
+
+@lru_cache(maxsize=None)
+def password_context() -> "CryptContext":
+    """Loads passlib and bcrypt on the first password hashed or verified."""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 class AuthHandler:
     def __init__(self) -> None:
         self._log = Log()
-        self._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-    def login(self, email: str, password: str) -> Token:
+    async def login(self, email: str, password: str) -> Token:
         try:
-            session_generator = DatabaseConnection().get_db_session()
-            self._session = next(session_generator)
+            session_generator = AsyncDatabaseConnection().get_db_session()
+            session = await anext(session_generator)
             self._log.info("Trying to login")
-            user = self._get_user_by_email(email)
-            if not self._verify_password(password, user.password):
+            user = await self._get_user_by_email(session, email)
+            if not await run_in_threadpool(
+                self._verify_password, password, user.password
+            ):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Senha incorreta",
@@ -46,15 +61,13 @@ class AuthHandler:
             )
         finally:
             try:
-                session_generator.close()
+                await session_generator.aclose()
             except Exception as close_error:
                 self._log.error("Error closing DB session: %s", str(close_error))
 
-    def _get_user_by_email(self, email: str) -> User:
-        result = (
-            self._session.execute(select(User).where(User.email == email, User.enabled))
-            .unique()
-            .scalar_one_or_none()
+    async def _get_user_by_email(self, session: AsyncSession, email: str) -> User:
+        result: User | None = (
+            (await session.execute(user_by_email(email))).unique().scalar_one_or_none()
         )
         if result is None:
             raise HTTPException(
@@ -64,11 +77,13 @@ class AuthHandler:
         return result
 
     def _hash_password(self, password: str) -> str:
-        hashed_password: str = self._pwd_context.hash(password)
+        with profiled("bcrypt"):
+            hashed_password: str = password_context().hash(password)
         return hashed_password
 
     def _verify_password(self, password: str, hashed_password: str) -> bool:
-        verification: bool = self._pwd_context.verify(password, hashed_password)
+        with profiled("bcrypt"):
+            verification: bool = password_context().verify(password, hashed_password)
         return verification
 
     def _create_access_token(self, user: User) -> str:
@@ -86,13 +101,13 @@ class AuthHandler:
         token_json = token.model_dump()
         return jwt.encode(token_json, settings.secret_key, algorithm=settings.algorithm)
 
-    def get_current_user(
+    async def get_current_user(
         self, credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
     ) -> UserDataToken:
         try:
-            self._log.info("Trying to get token data")
-            session_generator = DatabaseConnection().get_db_session()
-            self._session = next(session_generator)
+            self._log.debug("Trying to get token data")
+            session_generator = AsyncDatabaseConnection().get_db_session()
+            session = await anext(session_generator)
             credentials_exception = HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
@@ -102,8 +117,11 @@ class AuthHandler:
             encoded_token = credentials.credentials
             decoded_token = self._decode_token(encoded_token)
             token = self._build_token_from_decoded_token(decoded_token)
-            _ = self._get_user_by_email(token.email)
-            self._log.info("Get token data successfully")
+            if await cache.get(user_key(token.email)) is None:
+                user = await self._get_user_by_email(session, token.email)
+                await cache.set(user_key(token.email), user.id)
+            read_consistency_key.set(token.user_id)
+            self._log.debug("Get token data successfully")
             return token
         except ValidationError:
             raise credentials_exception
@@ -118,7 +136,7 @@ class AuthHandler:
             )
         finally:
             try:
-                session_generator.close()
+                await session_generator.aclose()
             except Exception as close_error:
                 self._log.error("Error closing DB session: %s", str(close_error))
 
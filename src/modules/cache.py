@@ -0,0 +1,91 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from config import settings
+
+
+class CacheStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(vars(self))
+
+
+class Cache(ABC):
+    """Read-through cache used by the GET modules.
+
+    Writers delete the keys they touched after committing, so an
+    implementation only has to keep entries for at most its TTL. A shared
+    cache can replace the in-process one by implementing these methods.
+    """
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None: ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+
+class LRUCache(Cache):
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        super().__init__()
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            entry = None
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry[1]
+
+    async def set(self, key: str, value: Any) -> None:
+        if self._ttl_seconds <= 0 or self._max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            if self._entries.pop(key, None) is not None:
+                self.stats.invalidations += 1
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+def pet_key(pet_id: int) -> str:
+    return f"pet:{pet_id}"
+
+
+def user_key(email: str) -> str:
+    return f"user:{email}"
+
+
+cache: Cache = LRUCache(settings.cache_max_entries, settings.cache_ttl_seconds)
@@ -0,0 +1,49 @@
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from src.database.model import Pet, User
+from src.database.queries import pet_by_id, user_by_id
+from src.modules.json_handler import JSONHandler
+from src.modules.log import Log
+from src.modules.notificator import UserNotificator
+from src.schemas.basic_response import BasicResponse
+from src.schemas.detection import Detection, DetectionRequest
+
+
+class RegisterDetection:
+    def __init__(self, session: AsyncSession, request: DetectionRequest) -> None:
+        self._log = Log()
+        self._session = session
+        self._request = request
+
+    async def execute(self) -> BasicResponse[Detection]:
+        detection = Detection(timestamp=self._request.timestamp)
+        await run_in_threadpool(self._save_detection, detection)
+        pet = await self._get_pet()
+        user = await self._get_pet_user(pet)
+        if user is None:
+            self._log.error("Pet user not found")
+        else:
+            await run_in_threadpool(self._notificate, pet, user)
+        return BasicResponse(data=detection)
+
+    def _save_detection(self, detection: Detection) -> None:
+        JSONHandler(settings.json_file_path).save_in_json(detection)
+
+    async def _get_pet(self) -> Pet:
+        result = await self._session.execute(pet_by_id(1))
+        pet: Pet | None = result.unique().scalar_one_or_none()
+        if pet is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Pet não encontrado"
+            )
+        return pet
+
+    async def _get_pet_user(self, pet: Pet) -> User | None:
+        result = await self._session.execute(user_by_id(pet.user_id))
+        return result.unique().scalar_one_or_none()
+
+    def _notificate(self, pet: Pet, user: User) -> None:
+        UserNotificator().notificate(pet, user)
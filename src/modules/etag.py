@@ -0,0 +1,25 @@
+import hashlib
+from typing import Any
+
+from fastapi import HTTPException, status
+
+
+class ETag:
+    @staticmethod
+    def compute(*parts: Any) -> str:
+        digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+        return f'"{digest}"'
+
+    @staticmethod
+    def matches(if_none_match: str | None, etag: str) -> bool:
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+
+    @staticmethod
+    def check(if_none_match: str | None, etag: str) -> None:
+        if ETag.matches(if_none_match, etag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
@@ -0,0 +1,24 @@
+from typing import Iterable
+
+from fastapi import HTTPException, status
+
+
+class FieldSet:
+    @staticmethod
+    def parse(fields: str | None, allowed: Iterable[str]) -> list[str] | None:
+        if fields is None:
+            return None
+        stripped = (field.strip() for field in fields.split(","))
+        requested = list(dict.fromkeys(field for field in stripped if field))
+        if not requested:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Nenhum campo informado",
+            )
+        invalid = [field for field in requested if field not in allowed]
+        if invalid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Campos inválidos: {','.join(invalid)}",
+            )
+        return requested
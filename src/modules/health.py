@@ -0,0 +1,196 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from config import settings
+from src.database import AsyncDatabaseConnection
+from src.database.engine import EngineRegistry
+from src.modules.log import Log
+from src.modules.metrics import SCHEDULER_LAST_TICK
+from src.schemas.database import PoolStatistics
+from src.schemas.health import CheckResult, Readiness
+
+
+class HealthCheckError(Exception):
+    pass
+
+
+class CachedCheck:
+    """Runs a readiness check at most once per `ttl` seconds, with a timeout.
+
+    Concurrent probes wait for the check already running instead of starting
+    their own, so the load balancer never multiplies the work.
+    """
+
+    def __init__(
+        self,
+        check: Callable[[], Awaitable[None]],
+        ttl: float,
+        timeout: float,
+        critical: bool = True,
+        enabled: bool = True,
+    ) -> None:
+        self._check = check
+        self._ttl = ttl
+        self._timeout = timeout
+        self._critical = critical
+        self._enabled = enabled
+        self._result: CheckResult | None = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def result(self) -> CheckResult:
+        if not self._enabled:
+            return self._build("disabled", 0)
+        if self._result is not None and time.monotonic() < self._expires_at:
+            return self._result
+        async with self._lock:
+            if self._result is None or time.monotonic() >= self._expires_at:
+                self._result = await self._run()
+                self._expires_at = time.monotonic() + self._ttl
+        return self._result
+
+    async def _run(self) -> CheckResult:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._check(), self._timeout)
+            status, detail = "ok", None
+        except HealthCheckError as e:
+            status, detail = "fail", str(e)
+        except TimeoutError:
+            status, detail = "fail", f"Sem resposta em {self._timeout:g} s"
+        except Exception as e:
+            status, detail = "fail", type(e).__name__
+        return self._build(status, time.perf_counter() - start, detail)
+
+    def _build(
+        self, status: str, seconds: float, detail: str | None = None
+    ) -> CheckResult:
+        return CheckResult(
+            status=status,
+            critical=self._critical,
+            latency_ms=round(seconds * 1000, 3),
+            detail=detail,
+            checked_at=datetime.now(timezone.utc),
+        )
+
+
+class ReadinessCheck:
+    """Decides whether this instance should receive traffic.
+
+    The pool saturation is read from the pool counters on every probe, so a
+    saturated instance drains at once. The other checks are cached for
+    HEALTH_CACHE_SECONDS: the database check runs one SELECT 1 through the
+    shared pool per period, whatever the probe rate. Notification failures are
+    reported but do not take the instance out, since detections are still
+    saved without them.
+    """
+
+    def __init__(self) -> None:
+        self._log = Log()
+        # Starts ready so an instance that is not ready on its first probe is logged.
+        self._ready = True
+        self._started_at = time.time()
+        ttl = settings.health_cache_seconds
+        timeout = settings.health_check_timeout_seconds
+        self._checks = {
+            "database_pool": CachedCheck(self._database_pool, 0, timeout),
+            "database": CachedCheck(self._database, ttl, timeout),
+            "storage": CachedCheck(self._storage, ttl, timeout),
+            "scheduler": CachedCheck(
+                self._scheduler,
+                ttl,
+                timeout,
+                enabled=settings.health_scheduler_max_age_seconds > 0,
+            ),
+            "notifications": CachedCheck(
+                self._notifications, ttl, timeout, critical=False
+            ),
+        }
+
+    async def execute(self) -> Readiness:
+        results = await asyncio.gather(
+            *(check.result() for check in self._checks.values())
+        )
+        checks = dict(zip(self._checks, results))
+        ready = all(
+            result.status != "fail" or not result.critical for result in checks.values()
+        )
+        # Logged on changes only, the load balancer probes every few seconds.
+        if not ready and self._ready:
+            self._log.warning(
+                "Instance not ready: %s",
+                {
+                    name: result.detail
+                    for name, result in checks.items()
+                    if result.detail
+                },
+            )
+        elif ready and not self._ready:
+            self._log.info("Instance ready")
+        self._ready = ready
+        return Readiness(status="ready" if ready else "not_ready", checks=checks)
+
+    async def _database_pool(self) -> None:
+        saturated = self._saturated_pools()
+        if saturated:
+            raise HealthCheckError(
+                "; ".join(
+                    f"Pool {statistics.url} saturado: "
+                    f"{statistics.checked_out} conexões em uso"
+                    for statistics in saturated
+                )
+            )
+
+    async def _database(self) -> None:
+        if self._saturated_pools():
+            # Every connection is in use, which already proves the database
+            # answers; waiting for one would only add to the queue.
+            return
+        engine = EngineRegistry.get_async_engine(settings.database_url)
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    @staticmethod
+    def _saturated_pools() -> list[PoolStatistics]:
+        return [
+            statistics
+            for statistics in AsyncDatabaseConnection().pool_statistics()
+            if statistics.max_overflow >= 0
+            and statistics.checked_out >= statistics.size + statistics.max_overflow
+        ]
+
+    async def _storage(self) -> None:
+        path = os.path.abspath(settings.json_file_path)
+        writable = await run_in_threadpool(
+            lambda: os.access(path, os.W_OK)
+            if os.path.exists(path)
+            else os.access(os.path.dirname(path), os.W_OK)
+        )
+        if not writable:
+            raise HealthCheckError(f"Sem permissão de escrita em {path}")
+
+    async def _scheduler(self) -> None:
+        # Before the first tick the age counts from startup.
+        last_tick = SCHEDULER_LAST_TICK.value() or self._started_at
+        age = time.time() - last_tick
+        if age > settings.health_scheduler_max_age_seconds:
+            raise HealthCheckError(f"Agendador sem execução há {age:.0f} s")
+
+    async def _notifications(self) -> None:
+        if settings.notification_transport == "stub":
+            return
+        # Firebase is only loaded by the first notification; the credentials
+        # file is all that can be checked without it.
+        if not await run_in_threadpool(
+            os.path.exists, settings.firebase_credentials_path
+        ):
+            raise HealthCheckError("Credenciais do Firebase não encontradas")
+
+
+readiness_check = ReadinessCheck()
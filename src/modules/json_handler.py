@@ -1,26 +1,36 @@
 import json
 import os
+import threading
 from typing import Any
 from src.schemas.detection import Detection
-from src.modules.log import Log
+from src.modules.log import Lazy, Log
+from src.modules.profiling import profiled
+from src.modules.tracing import span
+
+# Saves rewrite the whole file, so one at a time reads, appends and writes it.
+_file_lock = threading.Lock()
 
 
 class JSONHandler:
     def __init__(self, file_path: str):
         self._log: Log = Log()
         self._file_path = file_path
-        self._content = self._load_file_content()
+        self._content: list[Any] = []
 
     def _load_file_content(self) -> list[Any]:
-        self._log.info("Trying to load %s file content", self._file_path)
+        self._log.debug("Trying to load %s file content", self._file_path)
         if not self._file_exists():
-            self._log.info("%s file does not exist", self._file_path)
+            self._log.debug("%s file does not exist", self._file_path)
             return []
 
         try:
-            with open(self._file_path, "r") as f:
+            with (
+                profiled("file_io"),
+                span("json_handler.load", attributes={"file.path": self._file_path}),
+                open(self._file_path, "r") as f,
+            ):
                 content: list[Any] = json.load(f)
-                self._log.info("File %s read successfully", self._file_path)
+                self._log.debug("File %s read successfully", self._file_path)
                 return content
         except json.JSONDecodeError:
             self._log.error("Error while decoding %s file", self._file_path)
@@ -34,15 +44,34 @@ class JSONHandler:
 
     def save_in_json(self, data: Detection) -> None:
         try:
-            json_data = data.model_dump_json()
-            self._log.info(
-                "Trying to save data %s in the %s file", json_data, self._file_path
+            self._log.debug(
+                "Trying to save data %s in the %s file",
+                Lazy(data.model_dump_json),
+                self._file_path,
             )
-            self._content.append(json_data)
-            with open(self._file_path, "w") as f:
-                json.dump(self._content, f, indent=4)
+            with _file_lock:
+                self._content = self._load_file_content()
+                self._content.append(data.model_dump_json())
+                self._write_file_content()
             self._log.info("Data saved successfully in the %s file", self._file_path)
         except Exception as e:
             self._log.error(
-                "Error saving data %s in the file %s: %s", json_data, self._file_path, e
+                "Error saving data %s in the file %s: %s",
+                Lazy(data.model_dump_json),
+                self._file_path,
+                e,
             )
+
+    def _write_file_content(self) -> None:
+        with (
+            profiled("file_io"),
+            span(
+                "json_handler.save",
+                attributes={
+                    "file.path": self._file_path,
+                    "entries": len(self._content),
+                },
+            ),
+            open(self._file_path, "w") as f,
+        ):
+            json.dump(self._content, f, indent=4)
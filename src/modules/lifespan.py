@@ -1,70 +1,89 @@
-from config import Settings
-from src.database import DatabaseConnection
+from typing import Any
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import exists, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from config import settings
+from src.database import AsyncDatabaseConnection
 from src.database.model import Pet, User
+from src.database.queries import default_user_with_pet
 from src.modules.auth_handler import AuthHandler
 from src.modules.log import Log
 
-settings = Settings()
+# Any constant works, as long as every worker takes the same one.
+SEED_LOCK_ID = 4_015_901
 
 
 class LifespanHandler:
-    def execute(self) -> None:
+    async def execute(self) -> None:
         self._log = Log()
+        if not settings.seed_default_data:
+            self._log.info("Default user seed disabled")
+            return
         try:
             self._log.info("Executing lifespan events")
-            session_generator = DatabaseConnection().get_db_session()
-            self._session = next(session_generator)
-            default_user = self._get_default_user()
-            if not default_user:
-                default_user = self._create_default_user()
-            default_pet = self._get_user_pet(default_user)
-            if not default_pet:
-                self._create_user_pet(default_user)
+            session_generator = AsyncDatabaseConnection().get_db_session()
+            self._session = await anext(session_generator)
+            if self._session.get_bind().dialect.name == "postgresql":
+                # Workers starting together seed one after another, so the pet
+                # check below sees a pet another worker just inserted. The lock
+                # is released when the transaction ends.
+                await self._session.execute(
+                    select(func.pg_advisory_xact_lock(SEED_LOCK_ID))
+                )
+            result = await self._session.execute(
+                default_user_with_pet(settings.default_user_email)
+            )
+            default_user = result.one_or_none()
+            if default_user is None:
+                await self._session.execute(await self._insert_default_user())
+            if default_user is None or not default_user[1]:
+                await self._session.execute(self._insert_default_pet())
+                await self._session.commit()
             self._log.info("Lifespan events executed")
         except Exception as e:
             self._log.error("Error executing lifespan events: %s", str(e))
             raise e
         finally:
             try:
-                session_generator.close()
+                await session_generator.aclose()
             except Exception as close_error:
                 self._log.error("Error closing DB session: %s", str(close_error))
 
-    def _get_default_user(self) -> User | None:
-        return (
-            self._session.query(User)
-            .filter(User.email == settings.default_user_email)
-            .first()
-        )
-
-    def _create_default_user(self) -> User:
-        new_default_user = User(
-            name="User",
-            cpf_cnpj="65508999078",
-            email=settings.default_user_email,
-            password=AuthHandler()._hash_password(settings.default_user_password),
-            address="Default user address",
-            phone=74994939050,
-            device_token=settings.default_user_device_token,
+    async def _insert_default_user(self) -> Any:
+        """Inserts the default user unless another worker already did."""
+        password = await run_in_threadpool(
+            AuthHandler()._hash_password, settings.default_user_password
         )
-        self._log.debug(
-            "Default user device token: %s", settings.default_user_device_token
+        dialect = self._session.get_bind().dialect.name
+        insert_user = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        return (
+            insert_user(User)
+            .values(
+                name="User",
+                cpf_cnpj="65508999078",
+                email=settings.default_user_email,
+                password=password,
+                address="Default user address",
+                phone="74994939050",
+                device_token=settings.default_user_device_token,
+            )
+            .on_conflict_do_nothing(index_elements=[User.email])
         )
-        self._session.add(new_default_user)
-        self._session.commit()
-        return new_default_user
-
-    def _get_user_pet(self, user: User) -> Pet | None:
-        return self._session.query(Pet).filter(Pet.user_id == user.id).first()
 
-    def _create_user_pet(self, user: User) -> None:
-        new_default_pet = Pet(
-            user_id=user.id,
-            name=settings.default_pet_name,
-            breed=settings.default_pet_breed,
-            weight=8,
-            color=settings.default_pet_color,
-            kind=1,
+    def _insert_default_pet(self) -> Any:
+        """Gives the default user its pet when it has none."""
+        return insert(Pet).from_select(
+            [Pet.user_id, Pet.name, Pet.breed, Pet.weight, Pet.color, Pet.kind],
+            select(
+                User.id,
+                literal(settings.default_pet_name),
+                literal(settings.default_pet_breed),
+                literal(8.0),
+                literal(settings.default_pet_color),
+                literal(1),
+            ).where(
+                User.email == settings.default_user_email,
+                ~exists().where(Pet.user_id == User.id),
+            ),
         )
-        self._session.add(new_default_pet)
-        self._session.commit()
@@ -1,42 +1,264 @@
+import atexit
+import json
 import logging
-from typing import Any
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable
+
+from config import settings
+
+FORMAT = (
+    "%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - %(message)s"
+)
+ROOT_LOGGER = "food_tracker"
+
+# None is the sentinel that stops the listener.
+LogRecordQueue = queue.Queue[logging.LogRecord | None]
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name.removeprefix(f"{ROOT_LOGGER}."),
+            "location": f"{record.filename}:{record.lineno}",
+            "function": record.funcName,
+            "message": record.getMessage(),
+        }
+        if hasattr(record, "sample_rate"):
+            entry["sample_rate"] = record.sample_rate
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class Lazy:
+    """Log argument computed only when the record is emitted.
+
+    self._log.debug("Payload: %s", Lazy(data.model_dump_json))
+    """
+
+    __slots__ = ("_function",)
+
+    def __init__(self, function: Callable[[], Any]) -> None:
+        self._function = function
+
+    def __str__(self) -> str:
+        return str(self._function())
+
+    def __repr__(self) -> str:
+        return repr(self._function())
+
+
+class Sampler:
+    """Keeps an exact fraction of the records it sees, spread evenly."""
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        # Starts full so the first record is kept.
+        self._credit = 1.0
+
+    def keep(self) -> bool:
+        self._credit += self.rate
+        if self._credit < 1 - 1e-9:
+            return False
+        self._credit -= 1
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Enqueues records without blocking, dropping new ones while the queue is full."""
+
+    def __init__(self, log_queue: LogRecordQueue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener runs in this process, so only the arguments are merged
+        # here and the formatting is left to its thread.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    _sentinel = None
+
+    def __init__(
+        self,
+        log_queue: LogRecordQueue,
+        *handlers: logging.Handler,
+        respect_handler_level: bool = False,
+    ) -> None:
+        super().__init__(
+            log_queue, *handlers, respect_handler_level=respect_handler_level
+        )
+        self._log_queue = log_queue
+
+    def enqueue_sentinel(self) -> None:
+        # Waits for room instead of failing when stopped with the queue full.
+        self._log_queue.put(self._sentinel)
+
+
+class LogQueue:
+    """Writes log records to the real handlers from a single background thread.
+
+    Callers only format the message and put it on a bounded queue, so a slow
+    disk or terminal never blocks a request.
+    """
+
+    def __init__(self, handlers: list[logging.Handler], max_size: int) -> None:
+        log_queue: LogRecordQueue = queue.Queue(max_size)
+        self.handler = DroppingQueueHandler(log_queue)
+        self._handlers = handlers
+        self._running = False
+        self._listener = DrainingQueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+
+    def start(self) -> None:
+        self._listener.start()
+        self._running = True
+
+    def stop(self) -> None:
+        """Writes the records still queued and reports how many were dropped."""
+        if not self._running:
+            return
+        self._listener.stop()
+        self._running = False
+        if self.handler.dropped:
+            record = logging.makeLogRecord(
+                {
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": "%d log records dropped with the queue full",
+                    "args": (self.handler.dropped,),
+                }
+            )
+            for handler in self._handlers:
+                handler.handle(record)
 
 
 class Log:
+    _queue: LogQueue | None = None
+    _samplers: dict[str, dict[str, Sampler]] = {}
+    _start_lock = threading.Lock()
+
     def __init__(
         self,
-        name: str = __name__,
-        level: int = logging.INFO,
+        name: str | None = None,
+        level: int | None = None,
         log_file: str | None = "service_food_tracker.log",
     ):
-        self._logger = logging.getLogger(name)
-        self._logger.setLevel(level)
+        if name is None:
+            name = sys._getframe(1).f_globals.get("__name__", __name__)
+        self._logger = logging.getLogger(f"{ROOT_LOGGER}.{name}")
+        if level is not None:
+            self._logger.setLevel(level)
         self._log_file = log_file
+        # Filled by start(), which runs on the first record logged, so loggers
+        # built at import time open no file and start no thread.
+        self._samplers_by_function = self._samplers.setdefault(name, {})
 
-        if not self._logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                "%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(funcName)s - %(message)s"
+    @classmethod
+    def start(
+        cls,
+        handlers: list[logging.Handler] | None = None,
+        log_file: str | None = "service_food_tracker.log",
+        queue_size: int | None = None,
+    ) -> None:
+        """Sets up the handlers, levels, samplers and listener thread once per process."""
+        with cls._start_lock:
+            if cls._queue is not None:
+                return
+            if handlers is None:
+                formatter = (
+                    JSONFormatter()
+                    if settings.log_format == "json"
+                    else logging.Formatter(FORMAT)
+                )
+                handlers = [logging.StreamHandler(sys.stderr)]
+                if log_file:
+                    handlers.append(logging.FileHandler(log_file, mode="a"))
+                for handler in handlers:
+                    handler.setFormatter(formatter)
+            log_queue = LogQueue(
+                handlers, settings.log_queue_size if queue_size is None else queue_size
             )
-            handler.setFormatter(formatter)
-            self._logger.addHandler(handler)
+            root = logging.getLogger(ROOT_LOGGER)
+            root.setLevel(logging.INFO)
+            root.addHandler(log_queue.handler)
+            for name, level in settings.log_levels.items():
+                logging.getLogger(f"{ROOT_LOGGER}.{name}").setLevel(level.upper())
+            for path, rate in settings.log_sample_rates.items():
+                cls.sample(path, rate)
+            log_queue.start()
+            # Published last, so loggers never see a half configured queue.
+            cls._queue = log_queue
+            atexit.register(cls.stop)
+
+    @classmethod
+    def stop(cls) -> None:
+        if cls._queue is not None:
+            cls._queue.stop()
 
-            if self._log_file:
-                file_handler = logging.FileHandler(self._log_file, mode="a")
-                file_handler.setFormatter(formatter)
-                self._logger.addHandler(file_handler)
+    @classmethod
+    def sample(cls, path: str, rate: float) -> None:
+        """Keeps only `rate` of the records below WARNING logged from `path`.
+
+        The path is a module, like src.modules.auth_handler, or a function in
+        it, like src.modules.auth_handler:get_current_user. Kept records carry
+        the rate so counts can be scaled back.
+        """
+        module, _, function = path.partition(":")
+        cls._samplers.setdefault(module, {})[function] = Sampler(rate)
 
     def debug(self, message: Any, *args, **kwargs) -> None:  # type: ignore[no-untyped-def]
-        self._logger.debug(message, *args, **kwargs, stacklevel=2)
+        self._log(logging.DEBUG, message, args, kwargs)
 
     def info(self, message: Any, *args, **kwargs) -> None:  # type: ignore[no-untyped-def]
-        self._logger.info(message, *args, **kwargs, stacklevel=2)
+        self._log(logging.INFO, message, args, kwargs)
 
     def warning(self, message: Any, *args, **kwargs) -> None:  # type: ignore[no-untyped-def]
-        self._logger.warning(message, *args, **kwargs, stacklevel=2)
+        self._log(logging.WARNING, message, args, kwargs)
 
     def error(self, message: Any, *args, **kwargs) -> None:  # type: ignore[no-untyped-def]
-        self._logger.error(message, *args, **kwargs, stacklevel=2)
+        self._log(logging.ERROR, message, args, kwargs)
 
     def critical(self, message: Any, *args, **kwargs) -> None:  # type: ignore[no-untyped-def]
-        self._logger.critical(message, *args, **kwargs, stacklevel=2)
+        self._log(logging.CRITICAL, message, args, kwargs)
+
+    def _log(
+        self, level: int, message: Any, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> None:
+        if Log._queue is None:
+            Log.start(log_file=self._log_file)
+        # Filtered records are dropped before a LogRecord is built or the
+        # caller's frame is looked up.
+        if not self._logger.isEnabledFor(level):
+            return
+        if self._samplers_by_function and level < logging.WARNING:
+            samplers = self._samplers_by_function
+            sampler = samplers.get(sys._getframe(2).f_code.co_name, samplers.get(""))
+            if sampler is not None:
+                if not sampler.keep():
+                    return
+                kwargs["extra"] = {
+                    **kwargs.get("extra", {}),
+                    "sample_rate": sampler.rate,
+                }
+        self._logger.log(level, message, *args, **kwargs, stacklevel=3)
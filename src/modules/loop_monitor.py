@@ -0,0 +1,84 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+
+from src.modules.log import Log
+from src.modules.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG_SECONDS
+
+STACK_LIMIT = 25
+
+
+class LoopMonitor:
+    """Measures the event loop lag and reports the callbacks that block it.
+
+    A task sleeps `interval` seconds at a time and records how late it woke up.
+    A watchdog thread checks that the task keeps waking up; when the loop has
+    been held for more than `threshold` seconds it logs the stack of the loop
+    thread, which points at the blocking callback, once per stall.
+    """
+
+    def __init__(self, interval: float, threshold: float) -> None:
+        self._log = Log()
+        self._interval = interval
+        self._threshold = threshold
+        self._beat = time.monotonic()
+        self._task: asyncio.Task[None] | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._loop_thread_id = 0
+
+    def start(self) -> None:
+        if self._interval <= 0:
+            self._log.info("Event loop monitor disabled")
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._measure())
+        if self._threshold > 0:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._watch, name="loop-watchdog", daemon=True
+            )
+            self._thread.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def _measure(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._interval)
+            EVENT_LOOP_LAG_SECONDS.observe(
+                max(0.0, loop.time() - start - self._interval)
+            )
+            self._beat = time.monotonic()
+
+    def _watch(self) -> None:
+        reported = 0.0
+        while not self._stopped.wait(self._threshold / 2):
+            beat = self._beat
+            blocked = time.monotonic() - beat - self._interval
+            if blocked < self._threshold or beat == reported:
+                continue
+            reported = beat
+            EVENT_LOOP_BLOCKS.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame, STACK_LIMIT)) if frame else ""
+            self._log.warning(
+                "Event loop blocked for more than %.0f ms in:\n%s",
+                blocked * 1000,
+                stack,
+            )
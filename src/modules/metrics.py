@@ -0,0 +1,330 @@
+import math
+import threading
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Iterator, TypeVar
+
+from src.database import AsyncDatabaseConnection
+from src.modules.cache import cache
+
+LabelValues = tuple[str, ...]
+Sample = tuple[str, dict[str, str], float]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Metric:
+    """Base of the in-process metrics rendered by GET /metrics.
+
+    Values are kept per combination of label values. A metric built with
+    `function` has no state of its own and reads its values when scraped,
+    which is how pool and cache statistics are exported.
+    """
+
+    type = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        function: Callable[[], dict[LabelValues, float]] | None = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._function = function
+        # Metrics without labels are exported as 0 before their first update.
+        self._values: dict[LabelValues, float] = {} if labels else {(): 0.0}
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterator[Sample]:
+        values = self._function() if self._function else dict(self._values)
+        for label_values, value in values.items():
+            yield self.name, dict(zip(self.labels, label_values)), value
+
+    def _add(self, amount: float, labels: dict[str, str]) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels[label]) for label in self.labels)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        self._add(amount, labels)
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        self._add(amount, labels)
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self._add(-amount, labels)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+        # Per label values: observations per bucket (the last one is +Inf) and sum.
+        self._observations: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._observations.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            observations = {
+                key: (list(counts), total[0])
+                for key, (counts, total) in self._observations.items()
+            }
+        for label_values, (counts, total) in observations.items():
+            labels = dict(zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                yield f"{self.name}_bucket", {**labels, "le": le}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class Summary(Metric):
+    """Quantiles of the last `max_samples` observations, plus their total sum and count."""
+
+    type = "summary"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        quantiles: tuple[float, ...] = (0.5, 0.95, 0.99),
+        max_samples: int = 1000,
+    ) -> None:
+        super().__init__(name, documentation)
+        self.quantiles = quantiles
+        self._window: deque[float] = deque(maxlen=max_samples)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._window.append(value)
+            self._sum += value
+            self._count += 1
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            window = sorted(self._window)
+            total, count = self._sum, self._count
+        for quantile in self.quantiles:
+            value = (
+                window[min(len(window) - 1, int(quantile * len(window)))]
+                if window
+                else math.nan
+            )
+            yield self.name, {"quantile": f"{quantile:g}"}, value
+        yield f"{self.name}_sum", {}, total
+        yield f"{self.name}_count", {}, count
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, *labels: str) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, *labels: str) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def summary(self, name: str, documentation: str) -> Summary:
+        return self.register(Summary(name, documentation))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        *labels: str,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{self._labels(labels)} {self._value(value)}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(labels: dict[str, str]) -> str:
+        if not labels:
+            return ""
+        pairs = ",".join(
+            '{}="{}"'.format(
+                name,
+                value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+            )
+            for name, value in labels.items()
+        )
+        return f"{{{pairs}}}"
+
+    @staticmethod
+    def _value(value: float) -> str:
+        if math.isnan(value):
+            return "NaN"
+        return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+metrics = MetricsRegistry()
+
+REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, by route template.",
+    "method",
+    "route",
+    "status",
+)
+REQUESTS_IN_FLIGHT = metrics.gauge(
+    "http_requests_in_flight", "Requests being served right now."
+)
+DETECTIONS = metrics.counter(
+    "detections_ingested_total", "Detections received by POST /detectar."
+)
+NOTIFICATIONS = metrics.counter(
+    "notifications_total",
+    "Feeding notifications by result (sent, failed or skipped without token).",
+    "result",
+)
+FCM_SECONDS = metrics.histogram(
+    "fcm_send_duration_seconds", "Time spent in Firebase Cloud Messaging send calls."
+)
+SCHEDULER_TICK_SECONDS = metrics.histogram(
+    "scheduler_tick_duration_seconds", "Time to run ScheduledFeedingManager once."
+)
+SCHEDULER_LAG_SECONDS = metrics.histogram(
+    "scheduler_notification_lag_seconds",
+    "Delay between a scheduled feeding time and its notification.",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800),
+)
+SCHEDULER_LAST_TICK = metrics.gauge(
+    "scheduler_last_tick_timestamp_seconds",
+    "Unix time when ScheduledFeedingManager last finished.",
+)
+EVENT_LOOP_LAG_SECONDS = metrics.summary(
+    "event_loop_lag_seconds",
+    "How late the event loop woke a sleeping task, over the last samples.",
+)
+EVENT_LOOP_BLOCKS = metrics.counter(
+    "event_loop_blocked_total",
+    "Times a callback held the event loop longer than LOOP_BLOCK_THRESHOLD_SECONDS.",
+)
+
+
+def _pool_values(field: str) -> Callable[[], dict[LabelValues, float]]:
+    return lambda: {
+        (statistics.url,): getattr(statistics, field)
+        for statistics in AsyncDatabaseConnection().pool_statistics()
+    }
+
+
+def _pool_events() -> dict[LabelValues, float]:
+    return {
+        (statistics.url, event): getattr(statistics, event)
+        for statistics in AsyncDatabaseConnection().pool_statistics()
+        for event in ("connects", "checkouts", "checkins", "invalidations", "timeouts")
+    }
+
+
+def _cache_hit_ratio() -> dict[LabelValues, float]:
+    lookups = cache.stats.hits + cache.stats.misses
+    return {(): cache.stats.hits / lookups if lookups else 0.0}
+
+
+for field, documentation in (
+    ("size", "Connections kept open by the pool."),
+    ("checked_out", "Connections in use."),
+    ("checked_in", "Idle connections."),
+    ("overflow", "Connections open beyond the pool size."),
+):
+    metrics.register(
+        Gauge(f"db_pool_{field}", documentation, ("url",), _pool_values(field))
+    )
+metrics.register(
+    Counter(
+        "db_pool_events_total",
+        "Pool connects, checkouts, checkins, invalidations and checkout timeouts.",
+        ("url", "event"),
+        _pool_events,
+    )
+)
+metrics.register(
+    Counter(
+        "db_pool_wait_seconds_total",
+        "Time spent waiting for a connection.",
+        ("url",),
+        _pool_values("wait_seconds_total"),
+    )
+)
+metrics.register(
+    Gauge(
+        "db_pool_wait_seconds_max",
+        "Longest wait for a connection.",
+        ("url",),
+        _pool_values("wait_seconds_max"),
+    )
+)
+metrics.register(
+    Counter(
+        "cache_events_total",
+        "Cache hits, misses, evictions, expirations and invalidations.",
+        ("event",),
+        lambda: {(event,): count for event, count in cache.stats.as_dict().items()},
+    )
+)
+metrics.register(
+    Gauge("cache_hit_ratio", "Cache hits over lookups.", (), _cache_hit_ratio)
+)
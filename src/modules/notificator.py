@@ -1,43 +1,94 @@
-from firebase_admin import credentials, messaging
-import firebase_admin
-from sqlalchemy import select
+import time
+from functools import lru_cache
+from types import ModuleType
+from typing import TYPE_CHECKING
 from sqlalchemy.orm import Session
 
 from src.database.model import Pet, User
+from src.database.queries import user_by_id
 from src.modules.log import Log
+from src.modules.metrics import FCM_SECONDS, NOTIFICATIONS
+from src.modules.profiling import profiled
+from src.modules.tracing import CLIENT, Span, span
 from config import settings
 
+if TYPE_CHECKING:
+    from firebase_admin import messaging
+
+
+@lru_cache(maxsize=None)
+def firebase_messaging() -> ModuleType:
+    """Imports firebase_admin and initializes its app on the first notification."""
+    import firebase_admin
+    from firebase_admin import credentials, messaging
+
+    if not firebase_admin._apps:
+        firebase_admin.initialize_app(
+            credentials.Certificate(settings.firebase_credentials_path)
+        )
+    module: ModuleType = messaging
+    return module
+
 
 class UserNotificator:
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session | None = None) -> None:
         self._log = Log()
         self._session = session
-        self._credentials = credentials.Certificate(settings.firebase_credentials_path)
-        if not firebase_admin._apps:
-            firebase_admin.initialize_app(self._credentials)
 
-    def notificate(self, pet: Pet) -> None:
-        try:
-            self._log.info("Trying to notificate user to feed your pet")
-            user = self._get_pet_user(pet)
-            message = self._initialize_message(pet, user)
-            self._log.info("User device token: %s", user.device_token)
-            response = messaging.send(message)
-            self._log.info("Notification sent successfuly: %s", response)
-        except Exception as e:
-            self._log.error(
-                "Error trying to notificate user to feed your pet: %s", str(e)
-            )
+    def notificate(self, pet: Pet, user: User | None = None) -> None:
+        with span(
+            "notificator.notificate", attributes={"pet.id": pet.id}
+        ) as notification:
+            try:
+                self._log.debug("Trying to notificate user to feed your pet")
+                if user is None:
+                    user = self._get_pet_user(pet)
+                if not user.device_token:
+                    self._log.info("User has no device token to notificate")
+                    self._count(notification, "skipped")
+                    return
+                self._log.debug("Sending notification to user %s", user.id)
+                response = self._send(pet, user)
+                self._log.info("Notification sent successfuly: %s", response)
+                self._count(notification, "sent")
+            except Exception as e:
+                self._count(notification, "failed")
+                self._log.error(
+                    "Error trying to notificate user to feed your pet: %s", str(e)
+                )
+
+    @staticmethod
+    def _count(notification: Span | None, result: str) -> None:
+        NOTIFICATIONS.inc(result=result)
+        if notification is not None:
+            notification.set("notification.result", result)
 
     def _get_pet_user(self, pet: Pet) -> User:
-        result = (
-            self._session.execute(select(User).where(User.id == pet.user_id))
-        ).scalar_one_or_none()
+        if self._session is None:
+            raise RuntimeError("A session is required to load the pet user")
+        result: User | None = (
+            self._session.execute(user_by_id(pet.user_id)).unique().scalar_one_or_none()
+        )
         if result is None:
             raise RuntimeError("Pet user not found")
         return result
 
-    def _initialize_message(self, pet: Pet, user: User) -> messaging.Message:
+    def _send(self, pet: Pet, user: User) -> str:
+        if settings.notification_transport == "stub":
+            # Load tests and local runs notify without Firebase credentials.
+            return f"stub/{user.id}/{pet.id}"
+        messaging = firebase_messaging()
+        message = self._initialize_message(pet, user)
+        start = time.perf_counter()
+        try:
+            with profiled("fcm"), span("fcm.send", CLIENT):
+                response: str = messaging.send(message)
+            return response
+        finally:
+            FCM_SECONDS.observe(time.perf_counter() - start)
+
+    def _initialize_message(self, pet: Pet, user: User) -> "messaging.Message":
+        messaging = firebase_messaging()
         return messaging.Message(
             notification=messaging.Notification(
                 title="Hora de alimentar seu Pet",
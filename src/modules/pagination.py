@@ -0,0 +1,27 @@
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, status
+
+
+class Cursor:
+    @staticmethod
+    def encode(last_id: int) -> str:
+        payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str | None) -> int | None:
+        if cursor is None:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+            if not isinstance(last_id, int) or isinstance(last_id, bool):
+                raise ValueError(last_id)
+            return last_id
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+            )
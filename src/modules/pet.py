@@ -1,12 +1,33 @@
 from enum import Enum
+from typing import Any, Sequence
 from fastapi import HTTPException, status
-from sqlalchemy import select
 from src.modules.log import Log
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    Boolean,
+    Float,
+    Integer,
+    Row,
+    String,
+    bindparam,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.orm.exc import StaleDataError
 
-from src.database.model import Pet
-from src.schemas.basic_response import BasicResponse
-from src.schemas.pet import GetPetResponse, PostPet, PutPet
+from config import settings
+from src.database import AsyncDatabaseConnection
+from src.database.model import Pet, User
+from src.database.queries import pet_by_id, pets_page
+from src.modules.cache import cache, pet_key
+from src.modules.etag import ETag
+from src.modules.fieldset import FieldSet
+from src.modules.pagination import Cursor
+from src.schemas.basic_response import BasicResponse, PageResponse
+from src.schemas.pet import GetPetResponse, PetFilters, PostPet, PutPet, PutPetItem
 
 
 class Operation(Enum):
@@ -15,25 +36,54 @@ class Operation(Enum):
 
 
 class GetPet:
-    def __init__(self, session: Session, pet_id: int | None = None):
+    COLUMNS: dict[str, InstrumentedAttribute[Any]] = {
+        "pet_id": Pet.id,
+        "name": Pet.name,
+        "breed": Pet.breed,
+        "weight": Pet.weight,
+        "color": Pet.color,
+        "kind": Pet.kind,
+        "castred": Pet.castred,
+        "enabled": Pet.enabled,
+    }
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        pet_id: int | None = None,
+        filters: PetFilters | None = None,
+        cursor: str | None = None,
+        limit: int = settings.page_size_default,
+        fields: str | None = None,
+        if_none_match: str | None = None,
+    ):
         self._log = Log()
         self._session = session
         self._pet_id = pet_id
+        self._filters = filters or PetFilters()
+        self._cursor = cursor
+        self._limit = limit
+        self._fields = FieldSet.parse(fields, self.COLUMNS)
+        self._if_none_match = if_none_match
+        self._next_cursor: str | None = None
         self._operation = Operation | None
+        self.etag = ""
 
-    def execute(
+    async def execute(
         self,
-    ) -> BasicResponse[list[GetPetResponse]] | BasicResponse[GetPetResponse]:
-        data: list[GetPetResponse] | GetPetResponse
+    ) -> PageResponse[dict[str, Any]] | BasicResponse[GetPetResponse]:
         try:
             self._log.info("Trying to get pets")
             self._define_operation()
             if self.operation == Operation.ALL_PETS:
-                data = self._get_pets()
-            else:
-                data = self._get_pet()
+                pets = await self._get_pets()
+                self._log.info("Pets getted successfully")
+                return PageResponse[dict[str, Any]].model_construct(
+                    data=pets, next_cursor=self._next_cursor
+                )
+            pet = await self._get_pet()
             self._log.info("Pets getted successfully")
-            return BasicResponse(data=data)
+            return BasicResponse(data=pet)
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -45,25 +95,71 @@ class GetPet:
     def _define_operation(self) -> None:
         self.operation = Operation.ONE_PET if self._pet_id else Operation.ALL_PETS
 
-    def _get_pets(self) -> list[GetPetResponse]:
-        with self._session as db:
-            pets = db.query(Pet).all()
-            serialized_pets = [self._build_pet_response(pet) for pet in pets]
-            return serialized_pets
+    async def _get_pets(self) -> list[dict[str, Any]]:
+        fields = self._fields or list(self.COLUMNS)
+        after_id = Cursor.decode(self._cursor)
+        if self._if_none_match:
+            await self._check_page_version(fields, after_id)
+        columns = [self.COLUMNS[field].label(field) for field in fields]
+        if "pet_id" not in fields:
+            columns.append(Pet.id.label("pet_id"))
+        columns.append(Pet.version.label("version"))
+        result = await self._session.execute(
+            pets_page(self._filters, after_id, self._limit + 1, *columns)
+        )
+        rows = result.all()
+        self.etag = self._page_etag(fields, rows)
+        if len(rows) > self._limit:
+            rows = rows[: self._limit]
+            self._next_cursor = Cursor.encode(rows[-1].pet_id)
+        return [dict(zip(fields, row)) for row in rows]
+
+    async def _check_page_version(
+        self, fields: list[str], after_id: int | None
+    ) -> None:
+        result = await self._session.execute(
+            pets_page(
+                self._filters,
+                after_id,
+                self._limit + 1,
+                Pet.id.label("pet_id"),
+                Pet.version.label("version"),
+            )
+        )
+        ETag.check(self._if_none_match, self._page_etag(fields, result.all()))
+
+    def _page_etag(self, fields: list[str], rows: Sequence[Row[Any]]) -> str:
+        versions = [(row.pet_id, row.version) for row in rows[: self._limit]]
+        return ETag.compute("pets", fields, versions, len(rows) > self._limit)
 
-    def _get_pet(self) -> GetPetResponse:
-        with self._session as db:
-            pet: Pet = (
-                db.query(Pet).get(self._pet_id)  # type: ignore[assignment]
+    async def _get_pet(self) -> GetPetResponse:
+        if self._pet_id is None:
+            raise HTTPException(
+                detail="Pet não existe", status_code=status.HTTP_404_NOT_FOUND
             )
+        cached = await cache.get(pet_key(self._pet_id))
+        if cached is None:
+            pet = await self._session.get(Pet, self._pet_id)
             if not pet:
                 raise HTTPException(
                     detail="Pet não existe", status_code=status.HTTP_404_NOT_FOUND
                 )
-            serialized_pet = self._build_pet_response(pet)
-            return serialized_pet
+            cached = self.cache_entry(pet)
+            # A lagging replica could bring back the row a write just replaced,
+            # so only rows read from the primary are cached.
+            if AsyncDatabaseConnection().is_primary(self._session):
+                await cache.set(pet_key(pet.id), cached)
+        version, serialized_pet = cached
+        self.etag = ETag.compute("pet", serialized_pet.pet_id, version)
+        ETag.check(self._if_none_match, self.etag)
+        return serialized_pet
 
-    def _build_pet_response(self, pet: Pet) -> GetPetResponse:
+    @classmethod
+    def cache_entry(cls, pet: Pet) -> tuple[int, GetPetResponse]:
+        return pet.version, cls._build_pet_response(pet)
+
+    @staticmethod
+    def _build_pet_response(pet: Pet) -> GetPetResponse:
         return GetPetResponse(
             pet_id=pet.id,
             name=pet.name,
@@ -77,16 +173,15 @@ class GetPet:
 
 
 class CreatePet:
-    def __init__(self, session: Session, request: PostPet):
+    def __init__(self, session: AsyncSession, request: PostPet):
         self.session = session
         self.request = request
 
-    def execute(self) -> BasicResponse[None]:
+    async def execute(self) -> BasicResponse[None]:
         try:
-            with self.session as session:
-                self._create_pet(session)
-                session.commit()
-                return BasicResponse(message="OK")
+            await self._create_pet(self.session)
+            await self.session.commit()
+            return BasicResponse(message="OK")
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -95,7 +190,7 @@ class CreatePet:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def _create_pet(self, session: Session) -> Pet | None:
+    async def _create_pet(self, session: AsyncSession) -> Pet | None:
         pet = Pet(
             name=self.request.name,
             breed=self.request.breed,
@@ -106,13 +201,13 @@ class CreatePet:
             user_id=self.request.user_id,
         )
         session.add(pet)
-        session.flush()
-        session.refresh(pet)
+        await session.flush()
+        await session.refresh(pet)
         return pet
 
 
 class UpdatePet:
-    def __init__(self, session: Session, request: PutPet, id: int | None = None):
+    def __init__(self, session: AsyncSession, request: PutPet, id: int | None = None):
         try:
             self._log = Log()
             self._session = session
@@ -128,16 +223,31 @@ class UpdatePet:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def execute(self) -> BasicResponse[None]:
-        self._get_pet()
-        self._update_pet()
-        self._session.commit()
+    async def execute(self) -> BasicResponse[None]:
+        await self._get_pet()
+        try:
+            await self._update_pet()
+            await self._session.commit()
+        except StaleDataError:
+            # Another request updated the pet after it was read here.
+            await self._session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="O pet foi alterado por outra requisição, tente novamente",
+            )
+        # Refilled from the primary, so the next read sees the new row on any
+        # session, replica or not.
+        await cache.set(pet_key(self._pet.id), GetPet.cache_entry(self._pet))
         self._log.info("Pet updated successfully")
         return BasicResponse()
 
-    def _get_pet(self) -> None:
-        result = (
-            (self._session.execute(select(Pet).where(Pet.id == self._pet_id)))
+    async def _get_pet(self) -> None:
+        if self._pet_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Pet não encontrado"
+            )
+        result: Pet | None = (
+            (await self._session.execute(pet_by_id(self._pet_id)))
             .unique()
             .scalar_one_or_none()
         )
@@ -147,7 +257,7 @@ class UpdatePet:
             )
         self._pet: Pet = result
 
-    def _update_pet(self) -> None:
+    async def _update_pet(self) -> None:
         if self._request.name:
             self._pet.name = self._request.name
         if self._request.breed:
@@ -161,4 +271,150 @@ class UpdatePet:
         if self._request.weight:
             self._pet.weight = self._request.weight
         self._session.add(self._pet)
-        self._session.flush()
+        await self._session.flush()
+
+
+class CreatePets:
+    def __init__(self, session: AsyncSession, request: list[PostPet]):
+        self._log = Log()
+        self._session = session
+        self._request = request
+
+    async def execute(self) -> BasicResponse[list[int]]:
+        try:
+            self._log.info("Trying to create %s pets", len(self._request))
+            await self._validate_owners()
+            pet_ids = await self._create_pets()
+            await self._session.commit()
+            self._log.info("Pets created successfully")
+            return BasicResponse(data=pet_ids)
+        except HTTPException as e:
+            await self._session.rollback()
+            raise e
+        except Exception as e:
+            await self._session.rollback()
+            self._log.error("Error creating pets: %s", str(e))
+            raise HTTPException(
+                detail="Erro interno",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    async def _validate_owners(self) -> None:
+        user_ids = {pet.user_id for pet in self._request}
+        result = await self._session.scalars(
+            select(User.id).where(User.id.in_(user_ids))
+        )
+        existing_ids = set(result.all())
+        errors = [
+            {"loc": ["body", index, "user_id"], "msg": "Usuário não encontrado"}
+            for index, pet in enumerate(self._request)
+            if pet.user_id not in existing_ids
+        ]
+        if errors:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors)
+
+    async def _create_pets(self) -> list[int]:
+        result = await self._session.scalars(
+            insert(Pet)
+            .returning(Pet.id, sort_by_parameter_order=True)
+            .execution_options(render_nulls=True),
+            [
+                {
+                    "name": pet.name,
+                    "breed": pet.breed,
+                    "weight": pet.weight,
+                    "color": pet.color,
+                    "kind": pet.kind,
+                    "castred": bool(pet.castred),
+                    "user_id": pet.user_id,
+                }
+                for pet in self._request
+            ],
+        )
+        return list(result.all())
+
+
+class UpdatePets:
+    def __init__(self, session: AsyncSession, request: list[PutPetItem]):
+        self._log = Log()
+        self._session = session
+        self._request = request
+
+    async def execute(self) -> BasicResponse[None]:
+        try:
+            self._log.info("Trying to update %s pets", len(self._request))
+            self._validate_unique()
+            await self._validate_pets()
+            await self._update_pets()
+            await self._session.commit()
+            await cache.delete(*[pet_key(pet.id) for pet in self._request])
+            self._log.info("Pets updated successfully")
+            return BasicResponse()
+        except HTTPException as e:
+            await self._session.rollback()
+            raise e
+        except Exception as e:
+            await self._session.rollback()
+            self._log.error("Error updating pets: %s", str(e))
+            raise HTTPException(
+                detail="Erro interno",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def _validate_unique(self) -> None:
+        seen: set[int] = set()
+        errors = []
+        for index, pet in enumerate(self._request):
+            if pet.id in seen:
+                errors.append({"loc": ["body", index, "id"], "msg": "Pet repetido"})
+            seen.add(pet.id)
+        if errors:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=errors
+            )
+
+    async def _validate_pets(self) -> None:
+        result = await self._session.scalars(
+            select(Pet.id).where(Pet.id.in_([pet.id for pet in self._request]))
+        )
+        existing_ids = set(result.all())
+        errors = [
+            {"loc": ["body", index, "id"], "msg": "Pet não encontrado"}
+            for index, pet in enumerate(self._request)
+            if pet.id not in existing_ids
+        ]
+        if errors:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors)
+
+    async def _update_pets(self) -> None:
+        pet = Pet.__table__.c
+        statement = (
+            update(Pet.__table__)
+            .where(pet.id == bindparam("pet_id"))
+            .values(
+                name=func.coalesce(bindparam("new_name", type_=String), pet.name),
+                breed=func.coalesce(bindparam("new_breed", type_=String), pet.breed),
+                weight=func.coalesce(bindparam("new_weight", type_=Float), pet.weight),
+                color=func.coalesce(bindparam("new_color", type_=String), pet.color),
+                kind=func.coalesce(bindparam("new_kind", type_=Integer), pet.kind),
+                castred=func.coalesce(
+                    bindparam("new_castred", type_=Boolean), pet.castred
+                ),
+                version=pet.version + 1,
+            )
+        )
+        await self._session.execute(
+            statement,
+            [
+                {
+                    "pet_id": request.id,
+                    "new_name": request.name or None,
+                    "new_breed": request.breed or None,
+                    "new_weight": request.weight or None,
+                    "new_color": request.color or None,
+                    "new_kind": request.kind or None,
+                    "new_castred": request.castred,
+                }
+                for request in self._request
+            ],
+        )
@@ -0,0 +1,137 @@
+import cProfile
+import io
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Iterator
+
+from config import settings
+from src.schemas.profiling import ProfileDetail, ProfileSummary
+
+CATEGORIES = ("db", "serialization", "bcrypt", "fcm", "file_io")
+FUNCTIONS_LIMIT = 40
+
+
+class RequestProfile:
+    """Time of one profiled request, split by where it was spent.
+
+    The categories are filled by `profiled` blocks, which also run in the
+    threadpool, and by the query timers. When the cProfile of the event loop
+    thread was free it is kept too; it also holds the other requests served by
+    the loop at the same time.
+    """
+
+    def __init__(self, method: str, path: str, trigger: str) -> None:
+        self.id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.started_at = datetime.now(timezone.utc)
+        self.status = 500
+        self.seconds = 0.0
+        self.categories = dict.fromkeys(CATEGORIES, 0.0)
+        self.profiler: cProfile.Profile | None = None
+        self.functions: str | None = None
+        self._lock = threading.Lock()
+
+    def add(self, category: str, seconds: float) -> None:
+        with self._lock:
+            self.categories[category] += seconds
+
+    def summary(self) -> ProfileSummary:
+        return ProfileSummary(
+            id=self.id,
+            method=self.method,
+            path=self.path,
+            status=self.status,
+            trigger=self.trigger,
+            started_at=self.started_at,
+            total_ms=round(self.seconds * 1000, 3),
+            categories_ms={
+                category: round(seconds * 1000, 3)
+                for category, seconds in self.categories.items()
+            },
+            other_ms=round(
+                max(0.0, self.seconds - sum(self.categories.values())) * 1000, 3
+            ),
+        )
+
+    def detail(self) -> ProfileDetail:
+        return ProfileDetail(**self.summary().model_dump(), functions=self.functions)
+
+    def finish(self) -> None:
+        """Renders the functions that took the most time and drops the profiler."""
+        if self.profiler is None:
+            return
+        import pstats
+
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=stream)
+        # Responses FastAPI validates and encodes itself never reach json_response.
+        for (filename, _, function), row in stats.stats.items():  # type: ignore[attr-defined]
+            if function == "serialize_response" and filename.endswith(
+                os.path.join("fastapi", "routing.py")
+            ):
+                self.add("serialization", row[3])
+        stats.sort_stats("cumulative").print_stats(FUNCTIONS_LIMIT)
+        self.functions = stream.getvalue()
+
+
+current_profile: ContextVar[RequestProfile | None] = ContextVar(
+    "current_profile", default=None
+)
+
+
+@contextmanager
+def profiled(category: str) -> Iterator[None]:
+    """Adds the time spent in the block to the request being profiled, if any."""
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(category, time.perf_counter() - start)
+
+
+class ProfileStore:
+    """Keeps the last profiles for GET /debug/profiles and dumps them to a directory."""
+
+    def __init__(self, keep: int, directory: str = "") -> None:
+        self._profiles: deque[RequestProfile] = deque(maxlen=keep)
+        self._directory = directory
+        self._lock = threading.Lock()
+
+    def add(self, profile: RequestProfile) -> None:
+        profiler = profile.profiler
+        profile.finish()
+        profile.profiler = None
+        if self._directory:
+            os.makedirs(self._directory, exist_ok=True)
+            path = os.path.join(self._directory, profile.id)
+            if profiler is not None:
+                profiler.dump_stats(f"{path}.prof")
+            with open(f"{path}.json", "w") as file:
+                file.write(profile.detail().model_dump_json(indent=2))
+        with self._lock:
+            self._profiles.append(profile)
+
+    def get(self, id: str) -> RequestProfile | None:
+        with self._lock:
+            return next(
+                (profile for profile in self._profiles if profile.id == id), None
+            )
+
+    def list(self) -> list[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._profiles))
+
+
+profile_store = ProfileStore(settings.profiling_keep, settings.profiling_directory)
@@ -1,62 +1,71 @@
 import datetime
+import time
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
 
 from src.database.model import Pet, ScheduledFeeding
+from src.database.queries import enabled_scheduled_feeding, pet_by_id
 from src.modules.notificator import UserNotificator
 from src.schemas.scheduled_feeding import RequestCreateScheduledFeeding
 from src.schemas.basic_response import BasicResponse
 from src.modules.log import Log
+from src.modules.tracing import Span, span, start_trace
+from src.modules.metrics import (
+    SCHEDULER_LAG_SECONDS,
+    SCHEDULER_LAST_TICK,
+    SCHEDULER_TICK_SECONDS,
+)
 
 
 class CreateScheduledFeeding:
     def __init__(
-        self, session: Session, request: RequestCreateScheduledFeeding
+        self, session: AsyncSession, request: RequestCreateScheduledFeeding
     ) -> None:
         self._log = Log()
         self._session = session
         self._request = request
 
-    def execute(self) -> BasicResponse[None]:
+    async def execute(self) -> BasicResponse[None]:
         try:
             self._log.info("Trying to create scheduled feeding")
-            pet = self._get_pet(self._request.pet_id)
-            self._verify_if_pet_scheduled_feeding_already_exists(
+            pet = await self._get_pet(self._request.pet_id)
+            await self._verify_if_pet_scheduled_feeding_already_exists(
                 pet, self._request.feeding_time
             )
-            self._session.commit()
+            await self._create_scheduled_feeding(pet, self._request.feeding_time)
+            await self._session.commit()
             self._log.info("Scheduled feeding created succesfully")
             return BasicResponse(message="Alimentação agendada criada com sucesso")
+        except HTTPException as e:
+            await self._session.rollback()
+            raise e
         except Exception as e:
-            self._session.rollback()
+            await self._session.rollback()
             self._log.error("Error creating scheduled feeding: %s", str(e))
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno"
             )
 
-    def _get_pet(self, pet_id: int) -> Pet:
+    async def _get_pet(self, pet_id: int) -> Pet:
         result: Pet | None = (
-            self._session.execute(select(Pet).where(Pet.id == pet_id))
-        ).scalar_one_or_none()
+            (await self._session.execute(pet_by_id(pet_id)))
+            .unique()
+            .scalar_one_or_none()
+        )
         if result is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Pet não encontrado"
             )
         return result
 
-    def _verify_if_pet_scheduled_feeding_already_exists(
+    async def _verify_if_pet_scheduled_feeding_already_exists(
         self, pet: Pet, feeding_time: datetime.time
     ) -> None:
         result: ScheduledFeeding | None = (
-            self._session.execute(
-                select(ScheduledFeeding).where(
-                    ScheduledFeeding.pet_id == pet.id,
-                    ScheduledFeeding.feeding_time == feeding_time,
-                    ScheduledFeeding.enabled,
-                )
-            )
+            await self._session.execute(enabled_scheduled_feeding(pet.id, feeding_time))
         ).scalar_one_or_none()
         if result is not None:
             raise HTTPException(
@@ -64,25 +73,38 @@ class CreateScheduledFeeding:
                 detail="A alimentação agendada já existe",
             )
 
-    def _create_scheduled_feeding(self, pet: Pet, feeding_time: datetime.time) -> None:
+    async def _create_scheduled_feeding(
+        self, pet: Pet, feeding_time: datetime.time
+    ) -> None:
         scheduled_feeding = ScheduledFeeding(pet_id=pet.id, feeding_time=feeding_time)
         self._session.add(scheduled_feeding)
-        self._session.flush()
+        await self._session.flush()
 
 
 class ScheduledFeedingManager:
+    LOADS: tuple[LoaderOption, ...] = (
+        selectinload(ScheduledFeeding.pet).selectinload(Pet.owner),
+    )
+
     def __init__(self, session: Session) -> None:
         self._log = Log()
         self._session = session
         self._notificator = UserNotificator(session)
 
     def execute(self) -> None:
+        with start_trace("scheduler.tick") as tick:
+            self._execute(tick)
+
+    def _execute(self, tick: Span | None) -> None:
+        start = time.perf_counter()
         try:
             self._log.info(
                 "Trying to notificate all users based on their pets scheduled feedings"
             )
             now = datetime.datetime.now()
-            scheduled_feedings = self._get_all_scheduled_feedings()
+            with span("scheduler.load_feedings"):
+                scheduled_feedings = self._get_all_scheduled_feedings()
+            notified = 0
             for scheduled in scheduled_feedings:
                 feeding_datetime = now.replace(
                     hour=scheduled.feeding_time.hour,
@@ -96,8 +118,12 @@ class ScheduledFeedingManager:
                     and now >= feeding_datetime
                 ):
                     try:
-                        self._notificator.notificate(scheduled.pet)
+                        SCHEDULER_LAG_SECONDS.observe(
+                            (now - feeding_datetime).total_seconds()
+                        )
+                        self._notificator.notificate(scheduled.pet, scheduled.pet.owner)
                         scheduled.notified = True
+                        notified += 1
                     except Exception as e:
                         self._log.error(
                             f"Erro ao notificar pet {scheduled.pet_id}: {str(e)}"
@@ -106,11 +132,23 @@ class ScheduledFeedingManager:
                     feeding_datetime + datetime.timedelta(minutes=30)
                 ):
                     scheduled.notified = False
-            self._session.commit()
+            with span("scheduler.commit"):
+                self._session.commit()
+            if tick is not None:
+                tick.set("scheduler.feedings", len(scheduled_feedings))
+                tick.set("scheduler.notified", notified)
+            SCHEDULER_LAST_TICK.set(time.time())
             self._log.info("Users notificate successfully")
         except Exception as e:
             self._log.error("Error notificating users: %s", str(e))
             raise e
+        finally:
+            SCHEDULER_TICK_SECONDS.observe(time.perf_counter() - start)
 
     def _get_all_scheduled_feedings(self) -> list[ScheduledFeeding]:
-        return self._session.query(ScheduledFeeding).join(ScheduledFeeding.pet).all()
+        return (
+            self._session.query(ScheduledFeeding)
+            .options(*self.LOADS)
+            .join(ScheduledFeeding.pet)
+            .all()
+        )
@@ -0,0 +1,26 @@
+from functools import lru_cache
+from typing import Any, Mapping
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from src.modules.profiling import profiled
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(response_type: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(response_type)
+
+
+def json_response(
+    content: BaseModel, headers: Mapping[str, str] | None = None
+) -> Response:
+    """Serializes a response built by the modules straight to JSON bytes.
+
+    Skips the response model validation FastAPI would run again on data that
+    came from the database; the output matches the JSONResponse FastAPI renders
+    for the same response model.
+    """
+    with profiled("serialization"):
+        body = get_type_adapter(type(content)).dump_json(content)
+    return Response(content=body, media_type="application/json", headers=headers)
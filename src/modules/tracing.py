@@ -0,0 +1,307 @@
+import atexit
+import json
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Mapping
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext
+
+from config import settings
+from src.modules.log import Log
+
+SERVICE_NAME = "food-tracker"
+# OTLP span kinds.
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+STATEMENT_MAX_LENGTH = 2000
+
+
+class Span:
+    """One timed operation of a trace, exported in the OTLP JSON encoding."""
+
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "attributes",
+        "error",
+        "_start_ns",
+        "_start_counter_ns",
+        "_end_ns",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: int,
+        trace_id: str,
+        parent_span_id: str = "",
+        attributes: Mapping[str, Any] | None = None,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_span_id = parent_span_id
+        self.attributes = dict(attributes or {})
+        self.error: str | None = None
+        self._start_ns = time.time_ns()
+        self._start_counter_ns = time.perf_counter_ns()
+        self._end_ns = 0
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        self._end_ns = self._start_ns + time.perf_counter_ns() - self._start_counter_ns
+
+    def to_otlp(self) -> dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self._start_ns),
+            "endTimeUnixNano": str(self._end_ns),
+            "attributes": [
+                {"key": key, "value": otlp_value(value)}
+                for key, value in self.attributes.items()
+                if value is not None
+            ],
+            "status": {"code": 2, "message": self.error}
+            if self.error is not None
+            else {"code": 1},
+        }
+
+
+def otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class SpanExporter:
+    """Writes finished spans in batches from a background thread.
+
+    Each batch is one OTLP/JSON ExportTraceServiceRequest, appended as a line
+    to `path` and POSTed to `endpoint` (a collector's /v1/traces). Spans are
+    dropped while the queue is full, like log records.
+    """
+
+    def __init__(
+        self, path: str, endpoint: str, max_size: int, batch_size: int = 512
+    ) -> None:
+        self.path = path
+        self.endpoint = endpoint
+        self.enabled = bool(path or endpoint)
+        self.dropped = 0
+        self._queue: queue.Queue[Span | None] = queue.Queue(max_size)
+        self._batch_size = batch_size
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._log = Log()
+
+    def export(self, span: Span) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self) -> None:
+        """Writes the spans still queued."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if self.dropped:
+            self._log.warning("%d spans dropped with the queue full", self.dropped)
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="span-exporter", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def _run(self) -> None:
+        while True:
+            # Takes every span queued meanwhile, up to a batch, into one request.
+            item = self._queue.get()
+            spans: list[Span] = []
+            while item is not None:
+                spans.append(item)
+                if len(spans) >= self._batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if spans:
+                self._write(spans)
+            if item is None:
+                return
+
+    def _write(self, spans: list[Span]) -> None:
+        body = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": [
+                                {
+                                    "key": "service.name",
+                                    "value": {"stringValue": SERVICE_NAME},
+                                }
+                            ]
+                        },
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": "food_tracker"},
+                                "spans": [span.to_otlp() for span in spans],
+                            }
+                        ],
+                    }
+                ]
+            },
+            ensure_ascii=False,
+        )
+        try:
+            if self.path:
+                with open(self.path, "a") as file:
+                    file.write(body + "\n")
+            if self.endpoint:
+                request = urllib.request.Request(
+                    self.endpoint,
+                    data=body.encode(),
+                    headers={"Content-Type": "application/json"},
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+        except Exception as e:
+            self._log.error("Error exporting %d spans: %s", len(spans), str(e))
+
+
+span_exporter = SpanExporter(
+    settings.tracing_export_path,
+    settings.tracing_endpoint,
+    settings.tracing_queue_size,
+)
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def start_trace(
+    name: str,
+    kind: int = INTERNAL,
+    parent: tuple[str, str] | None = None,
+    attributes: Mapping[str, Any] | None = None,
+) -> Iterator[Span | None]:
+    """Starts the root span of a request or a background job.
+
+    `parent` is the trace and span id of a remote caller, from traceparent,
+    which already decided to sample it. Otherwise TRACING_SAMPLE_RATE decides.
+    """
+    if not span_exporter.enabled or (
+        parent is None and random.random() >= settings.tracing_sample_rate
+    ):
+        yield None
+        return
+    trace_id, parent_span_id = parent or (f"{random.getrandbits(128):032x}", "")
+    with _activate(Span(name, kind, trace_id, parent_span_id, attributes)) as root:
+        yield root
+
+
+@contextmanager
+def span(
+    name: str, kind: int = INTERNAL, attributes: Mapping[str, Any] | None = None
+) -> Iterator[Span | None]:
+    """Child span of the current one; does nothing outside a sampled trace."""
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, kind, parent.trace_id, parent.span_id, attributes)
+    with _activate(child):
+        yield child
+
+
+@contextmanager
+def _activate(span: Span) -> Iterator[Span]:
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current_span.reset(token)
+        span.end()
+        span_exporter.export(span)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_span(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    parent = current_span.get()
+    if parent is not None:
+        conn.info.setdefault("query_spans", []).append(
+            Span(
+                statement.split(None, 1)[0].upper() if statement else "QUERY",
+                CLIENT,
+                parent.trace_id,
+                parent.span_id,
+                {
+                    "db.system": conn.dialect.name,
+                    "db.statement": statement[:STATEMENT_MAX_LENGTH],
+                },
+            )
+        )
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_query_span(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    spans = conn.info.get("query_spans")
+    if spans and current_span.get() is not None:
+        query_span = spans.pop()
+        query_span.end()
+        span_exporter.export(query_span)
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_query_span(context: ExceptionContext) -> None:
+    spans = context.connection.info.get("query_spans") if context.connection else None
+    if spans and current_span.get() is not None:
+        query_span = spans.pop()
+        query_span.error = f"{type(context.original_exception).__name__}"
+        query_span.end()
+        span_exporter.export(query_span)
@@ -1,33 +1,56 @@
-import re
+import codecs
+import csv
+from collections import defaultdict
+from typing import Any, AsyncIterable, AsyncIterator, Callable
 from fastapi import HTTPException, status
-from src.schemas.pet import GetPetResponse, PostPet
-from sqlalchemy import or_, select, update
-from sqlalchemy.orm import Session, joinedload
-
+from src.schemas.pet import PostPet
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, load_only, selectinload
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from config import settings
 from src.database.model import Pet, User
+from src.database.queries import (
+    pet_versions_by_users,
+    pets_by_user,
+    users_by_email_or_cpf_cnpj,
+    users_by_emails_or_cpf_cnpjs,
+    users_page,
+)
+from src.modules.cache import cache, pet_key, user_key
+from src.modules.etag import ETag
+from src.modules.fieldset import FieldSet
+from src.modules.pagination import Cursor
 from src.modules.log import Log
-from src.schemas.basic_response import BasicResponse
+from src.modules.validation import UserValidation
+from src.schemas.basic_response import BasicResponse, PageResponse
 from src.schemas.user import (
+    ImportUserError,
+    ImportUsersResponse,
     RequestCreateUser,
     RequestUpdateUser,
     ResponseGetUser,
     SchemaCreateUser,
     SchemaUserDataValidator,
+    UserFilters,
 )
 
 
 class CreateUser:
-    def __init__(self, session: Session, request: RequestCreateUser):
+    def __init__(self, session: AsyncSession, request: RequestCreateUser):
         self._log = Log()
         self._session = session
         self._request = request
 
-    def execute(self) -> BasicResponse[None]:
+    async def execute(self) -> BasicResponse[None]:
         try:
             self._log.info("Trying to create new user")
             self._validate()
-            self._get_users()
-            self._create_user()
+            await self._get_users()
+            await self._create_user()
             self._log.info("User created")
             return BasicResponse()
         except HTTPException as e:
@@ -53,14 +76,9 @@ class CreateUser:
         for field in normalized_fields:
             setattr(self._request, field, getattr(normalized_data, field))
 
-    def _get_users(self) -> None:
-        result = self._session.execute(
-            select(User).where(
-                or_(
-                    User.email == self._request.email,
-                    User.cpf_cnpj == self._request.cpf_cnpj,
-                )
-            )
+    async def _get_users(self) -> None:
+        result = await self._session.execute(
+            users_by_email_or_cpf_cnpj(self._request.email, self._request.cpf_cnpj)
         )
         users = result.unique().scalars().all()
         if users:
@@ -69,37 +87,242 @@ class CreateUser:
                 status_code=status.HTTP_302_FOUND,
             )
 
-    def _create_user(self) -> None:
-        User.add_user(self._session, SchemaCreateUser(**self._request.model_dump()))
+    async def _create_user(self) -> None:
+        await User.add_user(
+            self._session, SchemaCreateUser(**self._request.model_dump())
+        )
+
+
+class ImportUsers:
+    COLUMNS = ("name", "cpf_cnpj", "email", "phone", "address", "password")
+    MAX_REPORTED_ERRORS = 1000
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        content: AsyncIterable[bytes],
+        chunk_size: int = settings.import_chunk_size,
+        on_progress: Callable[[ImportUsersResponse], None] | None = None,
+    ):
+        self._log = Log()
+        self._session = session
+        self._content = content
+        self._chunk_size = chunk_size
+        self._on_progress = on_progress
+        self._header: list[str] | None = None
+        self._spreadsheet_rows = 0
+        self._summary = ImportUsersResponse()
+
+    async def execute(self) -> BasicResponse[ImportUsersResponse]:
+        try:
+            self._log.info("Trying to import users")
+            async for records in self._chunks():
+                await self._import_chunk(records)
+                self._log.info("Imported %s user rows", self._summary.rows)
+                if self._on_progress is not None:
+                    self._on_progress(self._summary)
+            if self._header is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Arquivo vazio"
+                )
+            self._log.info(
+                "Users imported: %s created, %s updated, %s failed",
+                self._summary.created,
+                self._summary.updated,
+                self._summary.failed,
+            )
+            return BasicResponse(data=self._summary)
+        except HTTPException as e:
+            await self._session.rollback()
+            raise e
+        except (UnicodeDecodeError, csv.Error) as e:
+            await self._session.rollback()
+            self._log.info("Invalid users file: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Arquivo CSV inválido"
+            )
+        except Exception as e:
+            await self._session.rollback()
+            self._log.error("Error importing users: %s", str(e))
+            raise HTTPException(
+                detail="Erro interno",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    async def _lines(self) -> AsyncIterator[str]:
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        pending = ""
+        async for block in self._content:
+            pending += decoder.decode(block)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            yield pending
+
+    async def _chunks(self) -> AsyncIterator[list[tuple[int, list[str]]]]:
+        lines: list[str] = []
+        quotes = 0
+        async for line in self._lines():
+            lines.append(line)
+            quotes += line.count('"')
+            # An odd number of quotes means a quoted field continues on the next line
+            if len(lines) >= self._chunk_size and quotes % 2 == 0:
+                yield self._parse(lines)
+                lines, quotes = [], 0
+        if lines:
+            yield self._parse(lines)
+
+    def _parse(self, lines: list[str]) -> list[tuple[int, list[str]]]:
+        """Non-blank records with their spreadsheet row, blank rows counted."""
+        records = []
+        for record in csv.reader(lines):
+            self._spreadsheet_rows += 1
+            if record:
+                records.append((self._spreadsheet_rows, record))
+        if self._header is None and records:
+            self._header = [column.strip() for column in records.pop(0)[1]]
+            missing = [column for column in self.COLUMNS if column not in self._header]
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Colunas ausentes: {','.join(missing)}",
+                )
+        return records
+
+    async def _import_chunk(self, records: list[tuple[int, list[str]]]) -> None:
+        users: dict[str, tuple[int, SchemaCreateUser]] = {}
+        cpf_cnpj_emails: dict[str, str] = {}
+        for row, user in self._validate(records):
+            if isinstance(user, str):
+                self._fail(row, user)
+                continue
+            if user.email in users:
+                self._fail(row, "Email repetido no arquivo")
+            elif cpf_cnpj_emails.setdefault(user.cpf_cnpj, user.email) != user.email:
+                self._fail(row, "CPF/CNPJ repetido no arquivo")
+            else:
+                users[user.email] = (row, user)
+        if not users:
+            return
+        existing_emails = await self._reject_taken_cpf_cnpj(users)
+        if not users:
+            return
+        await self._session.execute(
+            self._upsert_statement(),
+            [user.model_dump() for _, user in users.values()],
+        )
+        await self._session.commit()
+        updated = existing_emails & users.keys()
+        await cache.delete(*[user_key(email) for email in updated])
+        self._summary.updated += len(updated)
+        self._summary.created += len(users) - len(updated)
+
+    def _validate(
+        self, records: list[tuple[int, list[str]]]
+    ) -> list[tuple[int, SchemaCreateUser | str]]:
+        """Validates the chunk in one batch, returning each row's user or error."""
+        rows: list[tuple[int, SchemaCreateUser | str]] = []
+        batch: list[tuple[int, SchemaUserDataValidator]] = []
+        for row, record in records:
+            self._summary.rows += 1
+            if len(record) != len(self._header):  # type: ignore[arg-type]
+                rows.append((row, "Quantidade de colunas inválida"))
+                continue
+            values = dict(zip(self._header, record))  # type: ignore[arg-type]
+            batch.append(
+                (
+                    row,
+                    SchemaUserDataValidator(
+                        **{column: values[column].strip() for column in self.COLUMNS}
+                    ),
+                )
+            )
+        errors = UserValidation.errors([user_data for _, user_data in batch])
+        for (row, user_data), error in zip(batch, errors):
+            rows.append((row, error or SchemaCreateUser(**user_data.model_dump())))
+        rows.sort(key=lambda item: item[0])
+        return rows
+
+    async def _reject_taken_cpf_cnpj(
+        self, users: dict[str, tuple[int, SchemaCreateUser]]
+    ) -> set[str]:
+        result = await self._session.execute(
+            users_by_emails_or_cpf_cnpjs(
+                list(users), [user.cpf_cnpj for _, user in users.values()]
+            )
+        )
+        existing = result.all()
+        cpf_cnpj_owners: defaultdict[str, set[str]] = defaultdict(set)
+        for email, cpf_cnpj in existing:
+            cpf_cnpj_owners[cpf_cnpj].add(email)
+        for email, (row, user) in list(users.items()):
+            if cpf_cnpj_owners[user.cpf_cnpj] - {email}:
+                del users[email]
+                self._fail(row, "CPF/CNPJ já cadastrado para outro email")
+        return {email for email, _ in existing}
+
+    def _upsert_statement(self) -> Any:
+        dialect = self._session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = insert(User)
+        return statement.on_conflict_do_update(
+            index_elements=[User.email],
+            set_={
+                "name": statement.excluded.name,
+                "cpf_cnpj": statement.excluded.cpf_cnpj,
+                "phone": statement.excluded.phone,
+                "address": statement.excluded.address,
+                "updated_at": func.now(),
+                "version": User.version + 1,
+            },
+        )
+
+    def _fail(self, row: int, detail: str) -> None:
+        self._summary.failed += 1
+        if len(self._summary.errors) < self.MAX_REPORTED_ERRORS:
+            self._summary.errors.append(ImportUserError(row=row, detail=detail))
 
 
 class UpdateUser:
-    def __init__(self, session: Session, request: RequestUpdateUser):
+    def __init__(self, session: AsyncSession, request: RequestUpdateUser):
         self._log = Log()
         self._session = session
         self._request = request
+        self._pets_handler: UserPetsHandler | None = None
 
-    def execute(self) -> BasicResponse[None]:
+    async def execute(self) -> BasicResponse[None]:
         try:
             self._log.info("Trying to update user")
-            self._validate()
-            self._get_user()
-            self._update_user()
-            self._session.commit()
+            await self._validate()
+            await self._get_user()
+            email = self._user.email
+            await self._update_user()
+            await self._session.commit()
+            await cache.delete(user_key(email))
+            if self._pets_handler is not None:
+                await self._pets_handler.invalidate_cache()
             self._log.info("User updated successfully")
             return BasicResponse()
         except HTTPException as e:
-            self._session.rollback()
+            await self._session.rollback()
             raise e
+        except StaleDataError:
+            await self._session.rollback()
+            raise HTTPException(
+                detail="O usuário foi alterado por outra requisição, tente novamente",
+                status_code=status.HTTP_409_CONFLICT,
+            )
         except Exception as e:
-            self._session.rollback()
+            await self._session.rollback()
             self._log.error("Error updating user: %s", str(e))
             raise HTTPException(
                 detail="Erro interno",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def _validate(self) -> None:
+    async def _validate(self) -> None:
         normalized_data, normalized_fields = UserDataValidator(
             SchemaUserDataValidator(
                 name=self._request.name,
@@ -112,11 +335,11 @@ class UpdateUser:
         ).execute()
         for field in normalized_fields:
             setattr(self._request, field, getattr(normalized_data, field))
-        self.__validate_pets()
+        await self.__validate_pets()
 
-    def __validate_pets(self) -> None:
+    async def __validate_pets(self) -> None:
         if self._request.pets is not None:
-            database_pets_ids = set([pet.id for pet in self.__get_pets()])
+            database_pets_ids = set([pet.id for pet in await self.__get_pets()])
             request_pets_set = set(self._request.pets)
             missing_pets = [
                 str(pet_id) for pet_id in (request_pets_set - database_pets_ids)
@@ -127,15 +350,19 @@ class UpdateUser:
                     detail=f"Os pets com os ids: {','.join(missing_pets)} não existem",
                 )
 
-    def __get_pets(self) -> list[Pet]:
-        result = self._session.execute(
+    async def __get_pets(self) -> list[Pet]:
+        result = await self._session.execute(
             select(Pet).where(Pet.id.in_(self._request.pets))  # type: ignore[arg-type]
         )
-        return list(result.scalars().all())
+        return list(result.unique().scalars().all())
 
-    def _get_user(self) -> None:
+    async def _get_user(self) -> None:
         result = (
-            (self._session.execute(select(User).where(User.id == self._request.id)))
+            (
+                await self._session.execute(
+                    select(User).where(User.id == self._request.id)
+                )
+            )
             .unique()
             .scalar_one_or_none()
         )
@@ -145,7 +372,7 @@ class UpdateUser:
             )
         self._user: User = result
 
-    def _update_user(self) -> None:
+    async def _update_user(self) -> None:
         if self._request.name:
             self._user.name = self._request.name
         if self._request.cpf_cnpj:
@@ -159,11 +386,12 @@ class UpdateUser:
         if self._request.password:
             self._user.password = self._request.password
         if self._request.pets is not None:
-            UserPetsHandler(
+            self._pets_handler = UserPetsHandler(
                 self._session, self._request.id, self._request.pets
-            ).execute()
+            )
+            await self._pets_handler.execute()
         self._session.add(self._user)
-        self._session.flush()
+        await self._session.flush()
 
 
 class UserDataValidator:
@@ -176,18 +404,9 @@ class UserDataValidator:
         try:
             self._log.info("Validating user data")
             self._normalize_data()
-            if self._user_data.name is not None and not self._user_data.name:
-                raise ValueError("Nome inválido")
-            if self._user_data.cpf_cnpj is not None:
-                self._validate_cpf_cnpj()
-            if self._user_data.email is not None:
-                self._validate_email()
-            if self._user_data.phone is not None:
-                self._validate_phone()
-            if self._user_data.address is not None and not self._user_data.address:
-                raise ValueError("Endereço inválido")
-            if self._user_data.password is not None and not self._user_data.password:
-                raise ValueError("Senha inválida")
+            error = UserValidation.errors([self._user_data])[0]
+            if error is not None:
+                raise ValueError(error)
             self._log.info("User data validated successfully")
             return self._user_data, self._normalized_fields
         except ValueError as e:
@@ -209,69 +428,29 @@ class UserDataValidator:
                     self._normalized_fields.append(key)
                 setattr(self._user_data, key, value.strip())
 
-    def _validate_cpf_cnpj(self) -> None:
-        digits = re.sub(r"\D", "", self._user_data.cpf_cnpj)  # type: ignore[arg-type]
-        if len(digits) == 11:
-            self.__validate_cpf(digits)
-        elif len(digits) == 14:
-            self.__validate_cnpj(digits)
-        else:
-            raise ValueError("CPF ou CNPJ inválido")
-
-    def __validate_cpf(self, cpf: str) -> None:
-        if cpf == cpf[0] * len(cpf):
-            raise ValueError("CPF inválido")
-
-        for i in [9, 10]:
-            value = sum((int(cpf[num]) * ((i + 1) - num) for num in range(i)))
-            check = ((value * 10) % 11) % 10
-            if check != int(cpf[i]):
-                raise ValueError("CPF inválido")
-
-    def __validate_cnpj(self, cnpj: str) -> None:
-        if cnpj == cnpj[0] * len(cnpj):
-            raise ValueError("CNPJ inválido")
-        weights = [
-            [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2],
-            [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2],
-        ]
-        for i in [0, 1]:
-            value = sum(
-                int(cnpj[num]) * weights[i][num] for num in range(len(weights[i]))
-            )
-            check = value % 11
-            check = 0 if check < 2 else 11 - check
-            if check != int(cnpj[12 + i]):
-                raise ValueError("CNPJ inválido")
-
-    def _validate_email(self) -> None:
-        pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
-        if not re.match(pattern, self._user_data.email):  # type: ignore[arg-type]
-            raise ValueError("Email inválido")
-
-    def _validate_phone(self) -> None:
-        digits = re.sub(r"\D", "", self._user_data.phone)  # type: ignore[arg-type]
-        if not (10 <= len(digits) <= 11):
-            raise ValueError("Número de telefone inválido")
-
 
 class UserPetsHandler:
-    def __init__(self, session: Session, user_id: int, new_pets_list: list[int]):
+    def __init__(self, session: AsyncSession, user_id: int, new_pets_list: list[int]):
         self._log = Log()
         self._session = session
         self._user_id = user_id
         self._new_pets_list = set(new_pets_list)
+        self._changed_pets: set[int] = set()
 
-    def execute(self) -> None:
+    async def execute(self) -> None:
         try:
             self._log.info("Trying to handler user pets")
-            enabled_user_pets, disabled_user_pets = self._get_all_user_pet_relations()
+            (
+                enabled_user_pets,
+                disabled_user_pets,
+            ) = await self._get_all_user_pet_relations()
 
             enable_user_pets = disabled_user_pets & self._new_pets_list
             disable_user_pets = enabled_user_pets - self._new_pets_list
 
-            self._enable_user_pets(enable_user_pets)
-            self._disable_user_pets(disable_user_pets)
+            await self._enable_user_pets(enable_user_pets)
+            await self._disable_user_pets(disable_user_pets)
+            self._changed_pets = enable_user_pets | disable_user_pets
             self._log.info("Handled user pets successfully")
         except HTTPException as e:
             raise e
@@ -279,9 +458,14 @@ class UserPetsHandler:
             self._log.error("Error handling user pets: %s", str(e))
             raise e
 
-    def _get_all_user_pet_relations(self) -> tuple[set[int], set[int]]:
+    async def invalidate_cache(self) -> None:
+        """Drops the changed pets from the cache, called once the caller commits."""
+        await cache.delete(*[pet_key(pet_id) for pet_id in self._changed_pets])
+
+    async def _get_all_user_pet_relations(self) -> tuple[set[int], set[int]]:
         all_user_pets = (
-            self._session.execute(select(Pet).where(Pet.user_id == self._user_id))
+            (await self._session.execute(pets_by_user(self._user_id)))
+            .unique()
             .scalars()
             .all()
         )
@@ -294,30 +478,61 @@ class UserPetsHandler:
         )
         return (enabled_user_pets_ids, disabled_user_pets_ids)
 
-    def _enable_user_pets(self, pet_ids: set[int]) -> None:
-        self._session.execute(
-            update(Pet).where(Pet.id.in_(pet_ids)).values(enabled=True)
+    async def _enable_user_pets(self, pet_ids: set[int]) -> None:
+        await self._session.execute(
+            update(Pet)
+            .where(Pet.id.in_(pet_ids))
+            .values(enabled=True, version=Pet.version + 1)
         )
-        self._session.flush()
+        await self._session.flush()
 
-    def _disable_user_pets(self, pet_ids: set[int]) -> None:
-        self._session.execute(
-            update(Pet).where(Pet.id.in_(pet_ids)).values(enabled=False)
+    async def _disable_user_pets(self, pet_ids: set[int]) -> None:
+        await self._session.execute(
+            update(Pet)
+            .where(Pet.id.in_(pet_ids))
+            .values(enabled=False, version=Pet.version + 1)
         )
-        self._session.flush()
+        await self._session.flush()
 
 
 class GetUsers:
-    def __init__(self, session: Session) -> None:
+    LOADS: tuple[LoaderOption, ...] = (selectinload(User.pets),)
+    COLUMNS: dict[str, InstrumentedAttribute[Any]] = {
+        "id": User.id,
+        "name": User.name,
+        "cpf_cnpj": User.cpf_cnpj,
+        "email": User.email,
+        "phone": User.phone,
+        "address": User.address,
+    }
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        filters: UserFilters | None = None,
+        cursor: str | None = None,
+        limit: int = settings.page_size_default,
+        fields: str | None = None,
+        if_none_match: str | None = None,
+    ) -> None:
         self._log = Log()
         self._session = session
-
-    def execute(self) -> BasicResponse[list[ResponseGetUser]]:
+        self._filters = filters or UserFilters()
+        self._cursor = cursor
+        self._limit = limit
+        self._fields = FieldSet.parse(fields, ResponseGetUser.model_fields)
+        self._if_none_match = if_none_match
+        self._next_cursor: str | None = None
+        self.etag = ""
+
+    async def execute(self) -> PageResponse[dict[str, Any]]:
         try:
             self._log.info("Trying to get users")
-            self._get_users()
+            await self._get_users()
             self._log.info("Users getted successfully")
-            return BasicResponse(data=self._users)
+            return PageResponse[dict[str, Any]].model_construct(
+                data=self._users, next_cursor=self._next_cursor
+            )
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -327,64 +542,111 @@ class GetUsers:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def _get_users(self) -> None:
-        result = self._session.execute(
-            select(User).options(joinedload(User.pets)).where(User.enabled)
-        )
-        self._users = [
-            ResponseGetUser(
-                id=user.id,
-                name=user.name,
-                cpf_cnpj=user.cpf_cnpj,
-                email=user.email,
-                address=user.address,
-                phone=user.phone,
-                pets=[
-                    GetPetResponse(
-                        pet_id=pet.id,
-                        name=pet.name,
-                        breed=pet.breed,
-                        weight=pet.weight,
-                        color=pet.color,
-                        kind=pet.kind,
-                        castred=pet.castred,
-                        enabled=pet.enabled,
-                    )
-                    for pet in user.pets
-                ],
+    async def _get_users(self) -> None:
+        fields = self._fields or list(ResponseGetUser.model_fields)
+        after_id = Cursor.decode(self._cursor)
+        if self._if_none_match:
+            await self._check_page_version(fields, after_id)
+        statement = users_page(self._filters, after_id, self._limit + 1)
+        if "pets" in fields:
+            statement = statement.options(*self.LOADS)
+        if self._fields is not None:
+            statement = statement.options(
+                load_only(
+                    User.id,
+                    User.version,
+                    *[self.COLUMNS[f] for f in fields if f in self.COLUMNS],
+                )
             )
-            for user in result.unique().scalars().all()
+        result = await self._session.execute(statement)
+        users = result.scalars().all()
+        has_more = len(users) > self._limit
+        if has_more:
+            users = users[: self._limit]
+            self._next_cursor = Cursor.encode(users[-1].id)
+        versions = [
+            (user.id, user.version, sorted((pet.id, pet.version) for pet in user.pets))
+            for user in users
         ]
+        self.etag = ETag.compute("users", fields, versions, has_more)
+        self._users = [self._build_user_response(user, fields) for user in users]
+
+    async def _check_page_version(
+        self, fields: list[str], after_id: int | None
+    ) -> None:
+        result = await self._session.execute(
+            users_page(self._filters, after_id, self._limit + 1, User.id, User.version)
+        )
+        users = result.all()
+        has_more = len(users) > self._limit
+        users = users[: self._limit]
+        pets: defaultdict[int, list[tuple[int, int]]] = defaultdict(list)
+        if "pets" in fields and users:
+            result = await self._session.execute(
+                pet_versions_by_users([user.id for user in users])
+            )
+            for user_id, pet_id, version in result.all():
+                pets[user_id].append((pet_id, version))
+        versions = [(user.id, user.version, sorted(pets[user.id])) for user in users]
+        ETag.check(
+            self._if_none_match, ETag.compute("users", fields, versions, has_more)
+        )
+
+    def _build_user_response(self, user: User, fields: list[str]) -> dict[str, Any]:
+        return {
+            field: (
+                [self._build_pet_response(pet) for pet in user.pets]
+                if field == "pets"
+                else getattr(user, field)
+            )
+            for field in fields
+        }
+
+    def _build_pet_response(self, pet: Pet) -> dict[str, Any]:
+        return {
+            "pet_id": pet.id,
+            "name": pet.name,
+            "breed": pet.breed,
+            "weight": pet.weight,
+            "color": pet.color,
+            "kind": pet.kind,
+            "castred": pet.castred,
+            "enabled": pet.enabled,
+        }
 
 
 class DeleteUser:
-    def __init__(self, session: Session, user_id: int):
+    def __init__(self, session: AsyncSession, user_id: int):
         self._log = Log()
         self._session = session
         self._user_id = user_id
 
-    def execute(self) -> BasicResponse[None]:
+    async def execute(self) -> BasicResponse[None]:
         try:
             self._log.info("Trying to delete user")
-            self._get_user()
+            await self._get_user()
+            email = self._user.email
             self._user.enabled = False
-            self._session.commit()
+            await self._session.commit()
+            await cache.delete(user_key(email))
             self._log.info("User deleted successfully")
             return BasicResponse()
         except HTTPException as e:
-            self._session.rollback()
+            await self._session.rollback()
             raise e
         except Exception as e:
-            self._session.rollback()
+            await self._session.rollback()
             self._log.error("Error deleting user: %s", str(e))
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Erro interno"
             )
 
-    def _get_user(self) -> None:
-        result = self._session.execute(
-            select(User).where(User.id == self._user_id)
-        ).scalar_one_or_none()
+    async def _get_user(self) -> None:
+        result = (
+            (await self._session.execute(select(User).where(User.id == self._user_id)))
+            .unique()
+            .scalar_one_or_none()
+        )
         if result is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado"
@@ -393,21 +655,21 @@ class DeleteUser:
 
 
 class UpdateUserPets:
-    def __init__(self, session: Session, user_id: int):
+    def __init__(self, session: AsyncSession, user_id: int):
         self._session = session
         self._user_id = user_id
 
-    def _load_user(self) -> None:
-        result = self._session.get(User, self._user_id)
+    async def _load_user(self) -> None:
+        result = await self._session.get(User, self._user_id)
         if result is None:
             raise HTTPException(
                 detail="Usuário não encontrado", status_code=status.HTTP_404_NOT_FOUND
             )
         self._user = result
 
-    def add_pet(self, pet_data: PostPet) -> BasicResponse[None]:
+    async def add_pet(self, pet_data: PostPet) -> BasicResponse[None]:
         try:
-            self._load_user()
+            await self._load_user()
             pet = Pet(
                 name=pet_data.name,
                 breed=pet_data.breed,
@@ -418,31 +680,32 @@ class UpdateUserPets:
                 user_id=self._user.id,
             )
             self._session.add(pet)
-            self._session.commit()
+            await self._session.commit()
             return BasicResponse(message="Pet adicionado com sucesso.")
         except Exception as e:
-            self._session.rollback()
+            await self._session.rollback()
             raise HTTPException(
                 detail=f"Erro ao adicionar pet: {str(e)}",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def remove_pet(self, pet_id: int) -> BasicResponse[None]:
+    async def remove_pet(self, pet_id: int) -> BasicResponse[None]:
         try:
-            self._load_user()
-            pet = self._session.get(Pet, pet_id)
+            await self._load_user()
+            pet = await self._session.get(Pet, pet_id)
             if not pet or pet.user_id != self._user_id:
                 raise HTTPException(
                     detail="Pet não encontrado ou não pertence ao usuário.",
                     status_code=status.HTTP_404_NOT_FOUND,
                 )
-            self._session.delete(pet)
-            self._session.commit()
+            await self._session.delete(pet)
+            await self._session.commit()
+            await cache.delete(pet_key(pet_id))
             return BasicResponse(message="Pet removido com sucesso.")
         except HTTPException:
             raise
         except Exception as e:
-            self._session.rollback()
+            await self._session.rollback()
             raise HTTPException(
                 detail=f"Erro ao remover pet: {str(e)}",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,126 @@
+import re
+from functools import partial
+from typing import Callable, Sequence
+
+from src.schemas.user import SchemaUserDataValidator
+
+NON_DIGITS = re.compile(r"[^0-9]")
+EMAIL = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+
+CPF_WEIGHTS = (tuple(range(10, 1, -1)), tuple(range(11, 1, -1)))
+CNPJ_WEIGHTS = (
+    (5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+    (6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2),
+)
+
+# Below this many documents the array setup costs more than the loop it saves.
+MIN_BATCH_SIZE = 32
+
+Errors = list[str | None]
+Check = Callable[[Sequence[str]], Errors]
+
+
+class UserValidation:
+    """Validates user fields for whole batches of records at once.
+
+    CPF and CNPJ check digits are computed over a digit matrix with one row per
+    document; inputs smaller than MIN_BATCH_SIZE use the same weights in a
+    plain loop.
+    """
+
+    @classmethod
+    def errors(cls, users: Sequence[SchemaUserDataValidator]) -> Errors:
+        """Returns the first error of each record, in UserDataValidator order."""
+        checks: list[tuple[str, Check]] = [
+            ("name", partial(cls._required, message="Nome inválido")),
+            ("cpf_cnpj", cls.cpf_cnpj_errors),
+            ("email", cls.email_errors),
+            ("phone", cls.phone_errors),
+            ("address", partial(cls._required, message="Endereço inválido")),
+            ("password", partial(cls._required, message="Senha inválida")),
+        ]
+        errors: Errors = [None] * len(users)
+        for field, check in checks:
+            indexes = [
+                index
+                for index, user in enumerate(users)
+                if errors[index] is None and getattr(user, field) is not None
+            ]
+            values = [getattr(users[index], field) for index in indexes]
+            for index, error in zip(indexes, check(values)):
+                errors[index] = error
+        return errors
+
+    @classmethod
+    def cpf_cnpj_errors(cls, documents: Sequence[str]) -> Errors:
+        digits = [NON_DIGITS.sub("", document) for document in documents]
+        if len(digits) < MIN_BATCH_SIZE:
+            return [cls._cpf_cnpj_error(document) for document in digits]
+        errors: Errors = ["CPF ou CNPJ inválido"] * len(digits)
+        for size, message in ((11, "CPF inválido"), (14, "CNPJ inválido")):
+            indexes = [
+                index for index, value in enumerate(digits) if len(value) == size
+            ]
+            if not indexes:
+                continue
+            valid = cls._valid_check_digits([digits[index] for index in indexes], size)
+            for index, is_valid in zip(indexes, valid):
+                errors[index] = None if is_valid else message
+        return errors
+
+    @staticmethod
+    def _cpf_cnpj_error(digits: str) -> str | None:
+        if len(digits) == 11:
+            weights, message = CPF_WEIGHTS, "CPF inválido"
+        elif len(digits) == 14:
+            weights, message = CNPJ_WEIGHTS, "CNPJ inválido"
+        else:
+            return "CPF ou CNPJ inválido"
+        if digits == digits[0] * len(digits):
+            return message
+        values = [int(digit) for digit in digits]
+        for position, weight in zip((len(digits) - 2, len(digits) - 1), weights):
+            remainder = sum(v * w for v, w in zip(values, weight)) % 11
+            if len(digits) == 11:
+                check = remainder * 10 % 11 % 10
+            else:
+                check = 0 if remainder < 2 else 11 - remainder
+            if check != values[position]:
+                return message
+        return None
+
+    @staticmethod
+    def email_errors(emails: Sequence[str]) -> Errors:
+        return [None if EMAIL.match(email) else "Email inválido" for email in emails]
+
+    @staticmethod
+    def phone_errors(phones: Sequence[str]) -> Errors:
+        return [
+            None
+            if 10 <= len(NON_DIGITS.sub("", phone)) <= 11
+            else "Número de telefone inválido"
+            for phone in phones
+        ]
+
+    @staticmethod
+    def _required(values: Sequence[str], message: str) -> Errors:
+        return [None if value else message for value in values]
+
+    @staticmethod
+    def _valid_check_digits(documents: list[str], size: int) -> list[bool]:
+        # NumPy is imported by the first batch instead of at startup.
+        import numpy as np
+
+        buffer = np.frombuffer("".join(documents).encode("ascii"), dtype=np.uint8)
+        matrix = buffer.reshape(-1, size).astype(np.int64) - ord("0")
+        valid = ~np.all(matrix == matrix[:, :1], axis=1)
+        weights = CPF_WEIGHTS if size == 11 else CNPJ_WEIGHTS
+        for position, weight in zip((size - 2, size - 1), weights):
+            remainder = (matrix[:, :position] @ np.array(weight)) % 11
+            if size == 11:
+                check = remainder * 10 % 11 % 10
+            else:
+                check = np.where(remainder < 2, 0, 11 - remainder)
+            valid &= check == matrix[:, position]
+        result: list[bool] = valid.tolist()
+        return result
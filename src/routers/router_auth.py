@@ -8,7 +8,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.post("/login")
-def login(
+async def login(
     request: RequestLogin,
 ) -> Token:
-    return AuthHandler().login(request.email, request.password)
+    return await AuthHandler().login(request.email, request.password)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Response, status
+
+from src.modules.health import readiness_check
+from src.schemas.health import Liveness, Readiness
+
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/live")
+async def live() -> Liveness:
+    return Liveness()
+
+
+@router.get("/ready")
+async def ready(response: Response) -> Readiness:
+    readiness = await readiness_check.execute()
+    if readiness.status != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
@@ -1,48 +1,109 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from src.database import DatabaseConnection
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+
+from config import settings
+from src.database import AsyncDatabaseConnection
 from src.modules.auth_handler import AuthHandler
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.modules.pet import CreatePet, GetPet, UpdatePet
+from src.modules.pet import CreatePet, CreatePets, GetPet, UpdatePet, UpdatePets
+from src.modules.serialization import json_response
 from src.schemas.auth import UserDataToken
-from src.schemas.basic_response import BasicResponse
-from src.schemas.pet import GetPetResponse, PostPet, PutPet
+from src.schemas.basic_response import BasicResponse, PageResponse
+from src.schemas.pet import GetPetResponse, PetFilters, PostPet, PutPet, PutPetItem
 
 
 router = APIRouter(prefix="/pets", tags=["Pets"])
 
 
-@router.get("/")
-def get_pets(
+@router.get("/", response_model=PageResponse[GetPetResponse])
+async def get_pets(
+    filters: Annotated[PetFilters, Depends()],
+    cursor: str | None = None,
+    limit: int = Query(
+        default=settings.page_size_default, ge=1, le=settings.page_size_max
+    ),
+    fields: str | None = Query(default=None, examples=["pet_id,name"]),
+    if_none_match: str | None = Header(default=None),
+    current_user: UserDataToken = Depends(AuthHandler().get_current_user),
+    session: AsyncSession = Depends(
+        AsyncDatabaseConnection(read_only=True).get_db_session
+    ),
+) -> Response:
+    service = GetPet(
+        session,
+        filters=filters,
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
+        if_none_match=if_none_match,
+    )
+    response = await service.execute()
+    return json_response(response, headers={"ETag": service.etag})
+
+
+@router.post("/bulk")
+async def create_pets(
+    request: Annotated[
+        list[PostPet], Body(min_length=1, max_length=settings.bulk_max_items)
+    ],
     current_user: UserDataToken = Depends(AuthHandler().get_current_user),
-    session: Session = Depends(DatabaseConnection().get_db_session),
-) -> BasicResponse[list[GetPetResponse]]:
-    return GetPet(session).execute()  # type: ignore[return-value]
+    session: AsyncSession = Depends(AsyncDatabaseConnection().get_db_session),
+) -> BasicResponse[list[int]]:
+    return await CreatePets(session, request).execute()
+
+
+@router.put("/bulk")
+async def update_pets(
+    request: Annotated[
+        list[PutPetItem], Body(min_length=1, max_length=settings.bulk_max_items)
+    ],
+    current_user: UserDataToken = Depends(AuthHandler().get_current_user),
+    session: AsyncSession = Depends(AsyncDatabaseConnection().get_db_session),
+) -> BasicResponse[None]:
+    return await UpdatePets(session, request).execute()
 
 
 @router.get("/{id}")
-def get_pet(
+async def get_pet(
+    response: Response,
     id: int | None = None,
+    if_none_match: str | None = Header(default=None),
     current_user: UserDataToken = Depends(AuthHandler().get_current_user),
-    session: Session = Depends(DatabaseConnection().get_db_session),
+    session: AsyncSession = Depends(
+        AsyncDatabaseConnection(read_only=True).get_db_session
+    ),
 ) -> BasicResponse[GetPetResponse]:
-    return GetPet(session, id).execute()  # type: ignore[return-value]
+    service = GetPet(session, id, if_none_match=if_none_match)
+    pet = await service.execute()
+    response.headers["ETag"] = service.etag
+    return pet  # type: ignore[return-value]
 
 
 @router.post("/")
-def create_pet(
+async def create_pet(
     request: PostPet,
     current_user: UserDataToken = Depends(AuthHandler().get_current_user),
-    session: Session = Depends(DatabaseConnection().get_db_session),
+    session: AsyncSession = Depends(AsyncDatabaseConnection().get_db_session),
 ) -> BasicResponse[None]:
-    return CreatePet(request=request, session=session).execute()
+    return await CreatePet(request=request, session=session).execute()
 
 
 @router.put("/{id}")
-def update_pet(
+async def update_pet(
     id: int,
     request: PutPet,
     current_user: UserDataToken = Depends(AuthHandler().get_current_user),
-    session: Session = Depends(DatabaseConnection().get_db_session),
+    session: AsyncSession = Depends(AsyncDatabaseConnection().get_db_session),
 ) -> BasicResponse[None]:
-    return UpdatePet(session, request, id).execute()
+    return await UpdatePet(session, request, id).execute()
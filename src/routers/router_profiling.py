@@ -0,0 +1,47 @@
+import hmac
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from config import settings
+from src.middlewares.profiling import PROFILES_PATH
+from src.modules.profiling import profile_store
+from src.schemas.basic_response import BasicResponse
+from src.schemas.profiling import ProfileDetail, ProfileSummary
+
+
+def verify_profiling_token(
+    x_profile: Annotated[str | None, Header()] = None,
+) -> None:
+    if not settings.profiling_token:
+        # Answers like an unknown path while profiling on demand is off.
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_profile is None or not hmac.compare_digest(
+        x_profile.encode(), settings.profiling_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Acesso não autorizado"
+        )
+
+
+router = APIRouter(
+    prefix=PROFILES_PATH,
+    tags=["Profiling"],
+    include_in_schema=False,
+    dependencies=[Depends(verify_profiling_token)],
+)
+
+
+@router.get("/")
+async def get_profiles() -> BasicResponse[list[ProfileSummary]]:
+    return BasicResponse(data=[profile.summary() for profile in profile_store.list()])
+
+
+@router.get("/{id}")
+async def get_profile(id: str) -> BasicResponse[ProfileDetail]:
+    profile = profile_store.get(id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Perfil não encontrado"
+        )
+    return BasicResponse(data=profile.detail())
@@ -1,8 +1,8 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import DatabaseConnection
+from src.database import AsyncDatabaseConnection
 from src.modules.auth_handler import AuthHandler
 from src.modules.scheduled_feeding import CreateScheduledFeeding
 from src.schemas.auth import UserDataToken
@@ -14,9 +14,9 @@ router = APIRouter(prefix="/scheduled_feeding", tags=["Scheduled feeding"])
 
 
 @router.post("/")
-def create_scheduled_feeding(
+async def create_scheduled_feeding(
     user: Annotated[UserDataToken, Depends(AuthHandler().get_current_user)],
     request: RequestCreateScheduledFeeding,
-    session: Session = Depends(DatabaseConnection().get_db_session),
+    session: AsyncSession = Depends(AsyncDatabaseConnection().get_db_session),
 ) -> BasicResponse[None]:
-    return CreateScheduledFeeding(session, request).execute()
+    return await CreateScheduledFeeding(session, request).execute()
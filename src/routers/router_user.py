@@ -1,70 +1,113 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import DatabaseConnection
+from config import settings
+from src.database import AsyncDatabaseConnection
 from src.modules.auth_handler import AuthHandler
-from src.modules.user import CreateUser, DeleteUser, GetUsers, UpdateUser, UpdateUserPets
+from src.modules.serialization import json_response
+from src.modules.user import (
+    CreateUser,
+    DeleteUser,
+    GetUsers,
+    ImportUsers,
+    UpdateUser,
+    UpdateUserPets,
+)
 from src.schemas.auth import UserDataToken
-from src.schemas.basic_response import BasicResponse
+from src.schemas.basic_response import BasicResponse, PageResponse
 from src.schemas.pet import PostPet
-from src.schemas.user import RequestCreateUser, RequestUpdateUser, ResponseGetUser
+from src.schemas.user import (
+    ImportUsersResponse,
+    RequestCreateUser,
+    RequestUpdateUser,
+    ResponseGetUser,
+    UserFilters,
+)
 
 router = APIRouter(prefix="/users", tags=["User"])
 
 
 @router.post("/")
-def create_user(
+async def create_user(
     request: RequestCreateUser,
-    session: Session = Depends(DatabaseConnection().get_db_session),
+    session: AsyncSession = Depends(AsyncDatabaseConnection().get_db_session),
 ) -> BasicResponse[None]:
-    return CreateUser(session, request).execute()
+    return await CreateUser(session, request).execute()
+
+
+@router.post(
+    "/import",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"text/csv": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def import_users(
+    user: Annotated[UserDataToken, Depends(AuthHandler().get_current_user)],
+    request: Request,
+    session: AsyncSession = Depends(AsyncDatabaseConnection().get_db_session),
+) -> BasicResponse[ImportUsersResponse]:
+    return await ImportUsers(session, request.stream()).execute()
 
 
 @router.put("/")
-def update_user(
+async def update_user(
     user: Annotated[UserDataToken, Depends(AuthHandler().get_current_user)],
     request: RequestUpdateUser,
-    session: Session = Depends(DatabaseConnection().get_db_session),
+    session: AsyncSession = Depends(AsyncDatabaseConnection().get_db_session),
 ) -> BasicResponse[None]:
-    return UpdateUser(session, request).execute()
+    return await UpdateUser(session, request).execute()
 
 
-@router.get("/")
-def get_users(
+@router.get("/", response_model=PageResponse[ResponseGetUser])
+async def get_users(
     user: Annotated[UserDataToken, Depends(AuthHandler().get_current_user)],
-    session: Session = Depends(DatabaseConnection().get_db_session),
-) -> BasicResponse[list[ResponseGetUser]]:
-    return GetUsers(session).execute()
+    filters: Annotated[UserFilters, Depends()],
+    cursor: str | None = None,
+    limit: int = Query(
+        default=settings.page_size_default, ge=1, le=settings.page_size_max
+    ),
+    fields: str | None = Query(default=None, examples=["id,name,pets"]),
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(
+        AsyncDatabaseConnection(read_only=True).get_db_session
+    ),
+) -> Response:
+    service = GetUsers(session, filters, cursor, limit, fields, if_none_match)
+    response = await service.execute()
+    return json_response(response, headers={"ETag": service.etag})
 
 
 @router.delete("/")
-def delete_user(
+async def delete_user(
     user: Annotated[UserDataToken, Depends(AuthHandler().get_current_user)],
     user_id: int = Query(),
-    session: Session = Depends(DatabaseConnection().get_db_session),
+    session: AsyncSession = Depends(AsyncDatabaseConnection().get_db_session),
 ) -> BasicResponse[None]:
-    return DeleteUser(session, user_id).execute()
+    return await DeleteUser(session, user_id).execute()
 
 
 @router.post("/{id}/add_pet", response_model=BasicResponse[None])
-def add_pet_to_user(
+async def add_pet_to_user(
     id: int,
     request: PostPet,
     current_user: UserDataToken = Depends(AuthHandler().get_current_user),
-    session: Session = Depends(DatabaseConnection().get_db_session),
+    session: AsyncSession = Depends(AsyncDatabaseConnection().get_db_session),
 ) -> BasicResponse[None]:
     service = UpdateUserPets(session, id)
-    return service.add_pet(request)
+    return await service.add_pet(request)
 
 
 @router.delete("/{id}/remove_pet/{pet_id}", response_model=BasicResponse[None])
-def remove_pet_from_user(
+async def remove_pet_from_user(
     id: int,
     pet_id: int,
     current_user: UserDataToken = Depends(AuthHandler().get_current_user),
-    session: Session = Depends(DatabaseConnection().get_db_session),
+    session: AsyncSession = Depends(AsyncDatabaseConnection().get_db_session),
 ) -> BasicResponse[None]:
     service = UpdateUserPets(session, id)
-    return service.remove_pet(pet_id)
+    return await service.remove_pet(pet_id)
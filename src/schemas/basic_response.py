@@ -6,4 +6,8 @@ T = TypeVar("T")
 
 class BasicResponse(BaseModel, Generic[T]):
     data: Optional[T] = None
-    message: Optional[str] = "OK"
\ No newline at end of file
+    message: Optional[str] = "OK"
+
+
+class PageResponse(BasicResponse[list[T]], Generic[T]):
+    next_cursor: Optional[str] = None
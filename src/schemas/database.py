@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class PoolStatistics(BaseModel):
+    url: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    connects: int
+    checkouts: int
+    checkins: int
+    invalidations: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
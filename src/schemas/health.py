@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class Liveness(BaseModel):
+    status: Literal["alive"] = "alive"
+
+
+class CheckResult(BaseModel):
+    status: Literal["ok", "fail", "disabled"]
+    critical: bool
+    latency_ms: float
+    detail: str | None = None
+    checked_at: datetime
+
+
+class Readiness(BaseModel):
+    status: Literal["ready", "not_ready"]
+    checks: dict[str, CheckResult]
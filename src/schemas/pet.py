@@ -4,9 +4,9 @@ from pydantic import BaseModel
 class GetPetResponse(BaseModel):
     pet_id: int
     name: str
-    breed: str
-    weight: float
-    color: str
+    breed: str | None
+    weight: float | None
+    color: str | None
     kind: int
     castred: bool
     enabled: bool
@@ -38,3 +38,12 @@ class PutPet(BaseModel):
         orm_mode = True
         from_attributes = True
 
+
+class PutPetItem(PutPet):
+    id: int
+
+
+class PetFilters(BaseModel):
+    kind: int | None = None
+    enabled: bool | None = None
+    user_id: int | None = None
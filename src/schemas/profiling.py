@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    method: str
+    path: str
+    status: int
+    trigger: str
+    started_at: datetime
+    total_ms: float
+    categories_ms: dict[str, float]
+    other_ms: float
+
+
+class ProfileDetail(ProfileSummary):
+    functions: str | None = None
@@ -63,3 +63,21 @@ class SchemaUpdateUser(BaseModel):
     address: str | None = None
     phone: str | None = None
     email_verified: bool | None = None
+
+
+class UserFilters(BaseModel):
+    enabled: bool = True
+    pet_kind: int | None = None
+
+
+class ImportUserError(BaseModel):
+    row: int
+    detail: str
+
+
+class ImportUsersResponse(BaseModel):
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: list[ImportUserError] = []
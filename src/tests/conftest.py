@@ -0,0 +1,76 @@
+"""Runs the application in-process against a new SQLite database.
+
+Set TEST_DATABASE_URL to run the tests against a database migrated with
+``alembic upgrade head`` instead, e.g. PostgreSQL in CI.
+"""
+
+import logging
+import os
+import tempfile
+from typing import Iterator
+
+import pytest
+
+_directory = tempfile.TemporaryDirectory(prefix="food_tracker_tests_")
+os.environ.update(
+    {
+        "DATABASE_URL": os.environ.get(
+            "TEST_DATABASE_URL", f"sqlite:///{_directory.name}/tests.db"
+        ),
+        "JSON_FILE_PATH": os.path.join(_directory.name, "detections.json"),
+        "NOTIFICATION_TRANSPORT": "stub",
+        "SEED_DEFAULT_DATA": "true",
+    }
+)
+for name, value in {
+    "SECRET_KEY": "tests",
+    "ALGORITHM": "HS256",
+    "TOKEN_EXPIRATION_TIME": "30",
+    "NO_AUTH": "false",
+    "ACCESS_TOKEN_EXPIRES_MINUTES": "30",
+    "DEFAULT_USER_EMAIL": "user@foodtracker.com",
+    "DEFAULT_USER_PASSWORD": "123",
+    "DEFAULT_USER_DEVICE_TOKEN": "tests",
+    "FIREBASE_CREDENTIALS_PATH": "",
+    "DEFAULT_PET_NAME": "Max",
+    "DEFAULT_PET_BREED": "Shitzu",
+    "DEFAULT_PET_COLOR": "Branco",
+    "PROFILING_TOKEN": "tests",
+}.items():
+    os.environ.setdefault(name, value)
+
+# Imported after the environment is set, so settings point to the test database.
+from fastapi.testclient import TestClient  # noqa: E402
+
+from config import settings  # noqa: E402
+from src.modules.log import FORMAT, Log  # noqa: E402
+
+_log_handler = logging.FileHandler(os.path.join(_directory.name, "tests.log"))
+_log_handler.setFormatter(logging.Formatter(FORMAT))
+Log.start([_log_handler])
+
+from main import app  # noqa: E402
+from src.database.engine import EngineRegistry  # noqa: E402
+from src.database.model import Base  # noqa: E402
+
+if "TEST_DATABASE_URL" not in os.environ:
+    Base.metadata.create_all(EngineRegistry.get_engine(settings.database_url))
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client: TestClient) -> dict[str, str]:
+    response = client.post(
+        "/auth/login",
+        json={
+            "email": settings.default_user_email,
+            "password": settings.default_user_password,
+        },
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from sqlalchemy import text
+
+from src.database.engine import EngineRegistry
+
+
+def test_pool_counters_follow_the_pool_recreated_by_dispose(tmp_path: Path) -> None:
+    engine = EngineRegistry._create_engine(f"sqlite:///{tmp_path}/pool.db")
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        engine.dispose()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        stats = EngineRegistry._pool_statistics(engine)
+        assert (stats.connects, stats.checkouts, stats.checkins) == (1, 1, 1)
+    finally:
+        engine.dispose()
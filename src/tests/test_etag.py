@@ -0,0 +1,66 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.mark.parametrize("path", ["/pets/1", "/pets/?limit=5", "/users/?limit=5"])
+def test_matching_if_none_match_answers_304_without_a_body(
+    client: TestClient, auth_headers: dict[str, str], path: str
+) -> None:
+    first = client.get(path, headers=auth_headers)
+    etag = first.headers["ETag"]
+
+    for if_none_match in (etag, f"W/{etag}", f'"outra", {etag}'):
+        response = client.get(
+            path, headers={**auth_headers, "If-None-Match": if_none_match}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+
+def test_stale_if_none_match_answers_the_page(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        "/pets/1", headers={**auth_headers, "If-None-Match": '"outra"'}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"]["pet_id"] == 1
+
+
+def test_pet_update_changes_the_etag(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    before = client.get("/pets/1", headers=auth_headers)
+    page_before = client.get("/pets/?limit=5", headers=auth_headers)
+    pet = {**before.json()["data"], "name": f"Max {uuid.uuid4().hex[:8]}"}
+    assert client.put("/pets/1", json=pet, headers=auth_headers).status_code == 200
+
+    for path, old in (("/pets/1", before), ("/pets/?limit=5", page_before)):
+        response = client.get(
+            path, headers={**auth_headers, "If-None-Match": old.headers["ETag"]}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != old.headers["ETag"]
+
+
+def test_user_update_changes_the_users_etag(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    before = client.get("/users/?limit=5", headers=auth_headers)
+    address = f"Default user address {uuid.uuid4().hex[:8]}"
+    response = client.put(
+        "/users/", json={"id": 1, "address": address}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+
+    after = client.get(
+        "/users/?limit=5",
+        headers={**auth_headers, "If-None-Match": before.headers["ETag"]},
+    )
+    assert after.status_code == 200
+    assert after.headers["ETag"] != before.headers["ETag"]
+    assert after.json()["data"][0]["address"] == address
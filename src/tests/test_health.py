@@ -0,0 +1,62 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from config import settings
+from src.modules.health import ReadinessCheck
+from src.routers import router_health
+
+
+@pytest.fixture
+def fresh_checks(monkeypatch: pytest.MonkeyPatch) -> None:
+    # A new instance, so no result cached by an earlier probe is served.
+    monkeypatch.setattr(router_health, "readiness_check", ReadinessCheck())
+
+
+def test_liveness_does_not_depend_on_the_checks(client: TestClient) -> None:
+    response = client.get("/health/live")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "alive"}
+
+
+def test_ready_when_every_critical_check_passes(
+    client: TestClient, fresh_checks: None
+) -> None:
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    checks = response.json()["checks"]
+    assert response.json()["status"] == "ready"
+    assert checks["database"]["status"] == "ok"
+    assert checks["storage"]["status"] == "ok"
+    assert checks["scheduler"]["status"] == "disabled"
+
+
+def test_failed_critical_check_answers_503(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, fresh_checks: None
+) -> None:
+    monkeypatch.setattr(settings, "json_file_path", "/nao/existe/detections.json")
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "not_ready"
+    assert body["checks"]["storage"]["status"] == "fail"
+    assert body["checks"]["storage"]["critical"] is True
+    assert "/nao/existe/detections.json" in body["checks"]["storage"]["detail"]
+    assert body["checks"]["database"]["status"] == "ok"
+
+
+def test_failed_notifications_keep_the_instance_ready(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch, fresh_checks: None
+) -> None:
+    monkeypatch.setattr(settings, "notification_transport", "fcm")
+    monkeypatch.setattr(settings, "firebase_credentials_path", "/nao/existe.json")
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    notifications = response.json()["checks"]["notifications"]
+    assert notifications["status"] == "fail"
+    assert notifications["critical"] is False
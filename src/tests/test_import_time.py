@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Packages that must only be imported on first use.
+LAZY_PACKAGES = ("firebase_admin", "google.auth", "passlib", "numpy")
+# Imported by main anyway; the budget is relative to them, so it holds on slow
+# and fast machines alike.
+FRAMEWORKS = "fastapi, sqlalchemy.ext.asyncio, sqlalchemy.orm, pydantic_settings, jwt"
+IMPORT_BUDGET_RATIO = float(os.environ.get("IMPORT_BUDGET_RATIO", 2))
+RUNS = 3
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class ImportTimes:
+    """Self and cumulative microseconds of every module `import` loaded."""
+
+    def __init__(self, modules: str, cwd: Path) -> None:
+        # Without pytest-cov's variables, which would measure the subprocess too.
+        env = {
+            name: value
+            for name, value in os.environ.items()
+            if not name.startswith("COV_CORE_")
+        }
+        env["PYTHONPATH"] = str(ROOT)
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {modules}"],
+            env=env,
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.modules: dict[str, tuple[int, int]] = {}
+        self.total_us = 0
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+            self.modules[name.strip()] = (int(self_us), int(cumulative_us))
+            # Only imports nested in another are indented.
+            if not name.startswith("  "):
+                self.total_us += int(cumulative_us)
+
+    @classmethod
+    def fastest(cls, modules: str, cwd: Path) -> "ImportTimes":
+        # The fastest run, so a busy machine does not fail the test.
+        runs = [cls(modules, cwd) for _ in range(RUNS)]
+        return min(runs, key=lambda run: run.total_us)
+
+
+def test_main_imports_within_budget_without_lazy_packages(tmp_path: Path) -> None:
+    main = ImportTimes.fastest("main", tmp_path)
+    frameworks = ImportTimes.fastest(FRAMEWORKS, tmp_path)
+
+    eager = [
+        package
+        for package in LAZY_PACKAGES
+        if any(
+            name == package or name.startswith(f"{package}.") for name in main.modules
+        )
+    ]
+    assert not eager, f"imported at startup: {', '.join(eager)}"
+    packages: Counter[str] = Counter()
+    for name, (self_us, _) in main.modules.items():
+        packages[name.split(".")[0]] += self_us
+    slowest = ", ".join(
+        f"{package} {self_us / 1000:.0f} ms"
+        for package, self_us in packages.most_common(10)
+    )
+    assert main.total_us <= frameworks.total_us * IMPORT_BUDGET_RATIO, (
+        f"import main took {main.total_us / 1000:.0f} ms, more than "
+        f"{IMPORT_BUDGET_RATIO:g} times the {frameworks.total_us / 1000:.0f} ms of "
+        f"its frameworks ({slowest})"
+    )
+    # Importing has no side effects, like opening the log file.
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,30 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.modules.json_handler import JSONHandler
+from src.schemas.detection import Detection
+
+SAVES = 200
+
+
+def test_concurrent_saves_keep_every_detection(tmp_path: Path) -> None:
+    path = str(tmp_path / "detections.json")
+    start = datetime(2026, 1, 1)
+    detections = [
+        Detection(timestamp=start + timedelta(seconds=index)) for index in range(SAVES)
+    ]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(
+            executor.map(
+                lambda detection: JSONHandler(path).save_in_json(detection), detections
+            )
+        )
+
+    with open(path) as file:
+        saved = [Detection.model_validate_json(entry) for entry in json.load(file)]
+    assert sorted(detection.timestamp for detection in saved) == [
+        detection.timestamp for detection in detections
+    ]
@@ -0,0 +1,54 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from src.modules.loop_monitor import LoopMonitor
+from src.modules.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG_SECONDS
+
+
+def _value(name: str, samples: list[tuple[str, dict[str, str], float]]) -> float:
+    return next(value for sample, _, value in samples if sample == name)
+
+
+def _block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def _monitor_a_blocked_loop() -> None:
+    monitor = LoopMonitor(interval=0.01, threshold=0.1)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        _block_the_loop(0.5)
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+
+def test_blocked_loop_is_measured_and_reported(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    blocks = _value("event_loop_blocked_total", list(EVENT_LOOP_BLOCKS.samples()))
+    lags = _value(
+        "event_loop_lag_seconds_count", list(EVENT_LOOP_LAG_SECONDS.samples())
+    )
+
+    with caplog.at_level(logging.WARNING, logger="food_tracker"):
+        asyncio.run(_monitor_a_blocked_loop())
+
+    samples = list(EVENT_LOOP_LAG_SECONDS.samples())
+    assert _value("event_loop_lag_seconds_count", samples) > lags
+    assert max(value for _, labels, value in samples if labels) >= 0.4
+    # One report per stall, however long it lasts.
+    assert (
+        _value("event_loop_blocked_total", list(EVENT_LOOP_BLOCKS.samples()))
+        == blocks + 1
+    )
+    [record] = [
+        record
+        for record in caplog.records
+        if record.getMessage().startswith("Event loop blocked")
+    ]
+    assert "_block_the_loop" in record.getMessage()
@@ -0,0 +1,52 @@
+import re
+
+from fastapi.testclient import TestClient
+
+
+def _sample(body: str, name: str, **labels: str) -> float:
+    for line in body.splitlines():
+        match = re.fullmatch(rf"{name}(?:\{{(.*)\}})? (\S+)", line)
+        if match is None:
+            continue
+        found = dict(re.findall(r'(\w+)="([^"]*)"', match.group(1) or ""))
+        if found == labels:
+            return float(match.group(2))
+    return 0.0
+
+
+def test_metrics_count_requests_by_route_template(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    labels = {"method": "GET", "route": "/pets/{id}", "status": "200"}
+    before = _sample(
+        client.get("/metrics").text, "http_request_duration_seconds_count", **labels
+    )
+
+    for _ in range(3):
+        assert client.get("/pets/1", headers=auth_headers).status_code == 200
+    client.get("/nao-existe")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert _sample(body, "http_request_duration_seconds_count", **labels) == before + 3
+    assert _sample(
+        body,
+        "http_request_duration_seconds_bucket",
+        **labels,
+        le="+Inf",
+    ) == _sample(body, "http_request_duration_seconds_count", **labels)
+    assert (
+        _sample(
+            body,
+            "http_request_duration_seconds_count",
+            method="GET",
+            route="unmatched",
+            status="404",
+        )
+        >= 1
+    )
+    # Only the GET /metrics being served.
+    assert _sample(body, "http_requests_in_flight") == 1
+    assert "# TYPE event_loop_lag_seconds summary" in body
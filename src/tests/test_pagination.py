@@ -0,0 +1,127 @@
+import base64
+import json
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.modules.pagination import Cursor
+
+CPFS = ("12345678062", "24681357928", "13579246828", "86420975310")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def rows(client: TestClient, auth_headers: dict[str, str]) -> None:
+    """Enough users and pets for a few pages of two."""
+    users = "\n".join(
+        f"Página {index},{cpf},pagina.{index}@foodtracker.com,7499765432{index},"
+        f"Rua da página,pagina-{index}"
+        for index, cpf in enumerate(CPFS)
+    )
+    response = client.post(
+        "/users/import",
+        content=f"name,cpf_cnpj,email,phone,address,password\n{users}\n",
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+    assert response.json()["data"]["failed"] == 0, response.text
+    response = client.post(
+        "/pets/bulk",
+        json=[
+            {"user_id": 1, "name": f"Página {index}", "kind": 1} for index in range(5)
+        ],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+
+
+def encoded(payload: bytes) -> str:
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def walk(
+    client: TestClient, auth_headers: dict[str, str], path: str, params: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Follows next_cursor from the first page to the last."""
+    items: list[dict[str, Any]] = []
+    page_params = dict(params)
+    while True:
+        response = client.get(path, params=page_params, headers=auth_headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page["data"]) <= params["limit"]
+        items += page["data"]
+        if page["next_cursor"] is None:
+            return items
+        page_params["cursor"] = page["next_cursor"]
+        assert len(page["data"]) == params["limit"]
+
+
+@pytest.mark.parametrize(
+    "path, id_field, params",
+    [
+        ("/pets/", "pet_id", {"user_id": 1}),
+        ("/users/", "id", {"fields": "id,name"}),
+    ],
+)
+def test_small_pages_walk_the_same_rows_in_id_order(
+    client: TestClient,
+    auth_headers: dict[str, str],
+    path: str,
+    id_field: str,
+    params: dict[str, Any],
+) -> None:
+    client.post(
+        "/pets/bulk",
+        json=[
+            {"user_id": 1, "name": f"Página {index}", "kind": 1} for index in range(5)
+        ],
+        headers=auth_headers,
+    )
+
+    small = walk(client, auth_headers, path, {**params, "limit": 2})
+    large = walk(client, auth_headers, path, {**params, "limit": 200})
+
+    ids = [item[id_field] for item in small]
+    assert len(ids) > 2
+    assert ids == sorted(set(ids))
+    assert small == large
+
+
+def test_a_page_ending_on_the_last_row_has_no_next_cursor(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    ids = [
+        pet["pet_id"] for pet in walk(client, auth_headers, "/pets/", {"limit": 200})
+    ]
+    assert len(ids) > 3
+
+    response = client.get(
+        "/pets/",
+        params={"cursor": Cursor.encode(ids[-4]), "limit": 3},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert [pet["pet_id"] for pet in response.json()["data"]] == ids[-3:]
+    assert response.json()["next_cursor"] is None
+
+
+@pytest.mark.parametrize("path", ["/pets/", "/users/"])
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "não é base64",
+        encoded(b"not json"),
+        encoded(b"[1]"),
+        encoded(json.dumps({"after": 1}).encode()),
+        encoded(json.dumps({"id": "1"}).encode()),
+        encoded(json.dumps({"id": True}).encode()),
+    ],
+)
+def test_malformed_or_tampered_cursors_are_rejected(
+    client: TestClient, auth_headers: dict[str, str], path: str, cursor: str
+) -> None:
+    response = client.get(path, params={"cursor": cursor}, headers=auth_headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
@@ -0,0 +1,157 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from fastapi import HTTPException
+from pydantic import TypeAdapter
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from config import settings
+from src.database.engine import EngineRegistry, to_async_url
+from src.database.model import Base, Pet
+from src.modules.cache import cache, pet_key
+from src.modules.pet import GetPet, UpdatePet
+from src.schemas.basic_response import BasicResponse, PageResponse
+from src.schemas.pet import GetPetResponse, PutPet
+
+
+def test_pets_without_optional_fields_match_the_response_model(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        "/pets/",
+        json={"user_id": 1, "name": "Sem raça", "kind": 2},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    page = client.get("/pets/", params={"limit": 200}, headers=auth_headers)
+    pets = TypeAdapter(PageResponse[GetPetResponse]).validate_python(page.json())
+    pet = next(pet for pet in pets.data or [] if pet.name == "Sem raça")
+    assert (pet.breed, pet.weight, pet.color) == (None, None, None)
+
+    detail = client.get(f"/pets/{pet.pet_id}", headers=auth_headers)
+    assert detail.status_code == 200
+    assert BasicResponse[GetPetResponse].model_validate(detail.json()).data == pet
+
+
+def test_pet_update_refills_the_cache_with_the_new_row(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    before = client.get("/pets/1", headers=auth_headers)
+    pet = {**before.json()["data"], "name": "Max atualizado"}
+
+    response = client.put("/pets/1", json=pet, headers=auth_headers)
+    assert response.status_code == 200
+
+    cached = client.get("/pets/1", headers=auth_headers)
+    assert cached.headers["X-DB-Query-Count"] == "0"
+    assert cached.json()["data"]["name"] == "Max atualizado"
+    assert cached.headers["ETag"] != before.headers["ETag"]
+    asyncio.run(cache.clear())
+    fresh = client.get("/pets/1", headers=auth_headers)
+    assert (fresh.json(), fresh.headers["ETag"]) == (
+        cached.json(),
+        cached.headers["ETag"],
+    )
+
+
+def test_replica_reads_do_not_fill_the_pet_cache(tmp_path: Path) -> None:
+    replica_url = f"sqlite:///{tmp_path}/replica.db"
+    Base.metadata.create_all(EngineRegistry.get_engine(replica_url))
+    with EngineRegistry.get_engine(replica_url).begin() as connection:
+        connection.execute(insert(Pet).values(id=1, name="Antigo", kind=1, user_id=1))
+
+    async def read_from_replica() -> Any:
+        await cache.clear()
+        async with EngineRegistry.get_async_sessionmaker(replica_url)() as session:
+            response = await GetPet(session, 1).execute()
+        await EngineRegistry.get_async_engine(replica_url).dispose()
+        return response, await cache.get(pet_key(1))
+
+    response, cached = asyncio.run(read_from_replica())
+
+    assert response.data.name == "Antigo"
+    assert cached is None
+
+
+@pytest.mark.parametrize(
+    "path, fields",
+    [
+        ("/pets/", ["name", "weight"]),
+        ("/pets/", ["kind", "pet_id"]),
+        ("/users/", ["email", "pets"]),
+        ("/users/", ["id"]),
+    ],
+)
+def test_fields_select_a_subset_of_each_item(
+    client: TestClient, auth_headers: dict[str, str], path: str, fields: list[str]
+) -> None:
+    response = client.get(
+        path, params={"fields": ",".join(fields), "limit": 5}, headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    items = response.json()["data"]
+    assert items
+    assert all(list(item) == fields for item in items)
+
+
+@pytest.mark.parametrize("path", ["/pets/", "/users/"])
+@pytest.mark.parametrize(
+    "fields, detail",
+    [
+        ("name,nope", "Campos inválidos: nope"),
+        ("password", "Campos inválidos: password"),
+        (" , ", "Nenhum campo informado"),
+    ],
+)
+def test_unknown_or_empty_fields_are_rejected(
+    client: TestClient,
+    auth_headers: dict[str, str],
+    path: str,
+    fields: str,
+    detail: str,
+) -> None:
+    response = client.get(path, params={"fields": fields}, headers=auth_headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+
+
+def test_concurrent_pet_update_conflicts(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    update_pet = UpdatePet._update_pet
+
+    async def update_after_another_request(service: UpdatePet) -> None:
+        # The row changes between this request's read and its write.
+        with EngineRegistry.get_engine(settings.database_url).begin() as connection:
+            connection.execute(
+                update(Pet).where(Pet.id == 1).values(version=Pet.version + 1)
+            )
+        await update_pet(service)
+
+    monkeypatch.setattr(UpdatePet, "_update_pet", update_after_another_request)
+    request = PutPet(
+        name="Conflito", breed=None, weight=None, color=None, kind=1, castred=None
+    )
+
+    async def update_concurrently() -> None:
+        engine = create_async_engine(to_async_url(settings.database_url))
+        try:
+            async with AsyncSession(engine) as session:
+                await UpdatePet(session, request, 1).execute()
+        finally:
+            await engine.dispose()
+
+    with pytest.raises(HTTPException) as conflict:
+        asyncio.run(update_concurrently())
+
+    assert conflict.value.status_code == 409
+    assert conflict.value.detail == (
+        "O pet foi alterado por outra requisição, tente novamente"
+    )
@@ -0,0 +1,42 @@
+from fastapi.testclient import TestClient
+
+from config import settings
+from src.middlewares.profiling import PROFILE_HEADER, PROFILE_ID_HEADER
+
+
+def test_profile_header_returns_a_profile(client: TestClient) -> None:
+    profile_headers = {PROFILE_HEADER: settings.profiling_token}
+    response = client.post(
+        "/auth/login",
+        json={
+            "email": settings.default_user_email,
+            "password": settings.default_user_password,
+        },
+        headers=profile_headers,
+    )
+    assert response.status_code == 200
+    profile_id = response.headers[PROFILE_ID_HEADER]
+
+    profile = client.get(f"/debug/profiles/{profile_id}", headers=profile_headers)
+
+    assert profile.status_code == 200
+    data = profile.json()["data"]
+    assert data["method"] == "POST"
+    assert data["path"] == "/auth/login"
+    assert data["status"] == 200
+    assert data["trigger"] == "header"
+    assert data["categories_ms"]["bcrypt"] > 0
+    assert data["categories_ms"]["db"] > 0
+    assert sum(data["categories_ms"].values()) <= data["total_ms"]
+    listed = client.get("/debug/profiles/", headers=profile_headers).json()["data"]
+    assert profile_id in [summary["id"] for summary in listed]
+
+
+def test_requests_without_the_token_are_not_profiled(client: TestClient) -> None:
+    for headers in ({}, {PROFILE_HEADER: "outro"}):
+        response = client.get("/health/live", headers=headers)
+        assert response.status_code == 200
+        assert PROFILE_ID_HEADER not in response.headers
+
+        profiles = client.get("/debug/profiles/", headers=headers)
+        assert profiles.status_code == 403
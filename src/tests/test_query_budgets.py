@@ -0,0 +1,129 @@
+import asyncio
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import settings
+from src.middlewares.query_count import assert_max_queries
+from src.modules.cache import cache
+
+PET = {"name": "Rex", "breed": "SRD", "weight": 3.0, "color": "Preto", "kind": 1}
+
+
+@pytest.fixture(autouse=True)
+def cold_cache() -> None:
+    # Budgets are for a cold cache, the worst case of every request.
+    asyncio.run(cache.clear())
+
+
+@pytest.fixture(scope="module")
+def user_id(client: TestClient, auth_headers: dict[str, str]) -> int:
+    response = client.post(
+        "/users/",
+        json={
+            "name": "Query budget",
+            "cpf_cnpj": "52998224725",
+            "email": "query.budget@foodtracker.com",
+            "phone": "74991234567",
+            "address": "Query budget address",
+            "password": "query-budget",
+        },
+    )
+    # Already created when the tests run again on the same database.
+    assert response.status_code in (200, 302), response.text
+    users = client.get("/users/", params={"fields": "id,email"}, headers=auth_headers)
+    user_id: int = next(
+        user["id"]
+        for user in users.json()["data"]
+        if user["email"] == "query.budget@foodtracker.com"
+    )
+    return user_id
+
+
+def test_login_query_budget(client: TestClient) -> None:
+    response = client.post(
+        "/auth/login",
+        json={
+            "email": settings.default_user_email,
+            "password": settings.default_user_password,
+        },
+    )
+
+    assert response.status_code == 200
+    assert_max_queries(response, 1)
+
+
+@pytest.mark.parametrize(
+    "path, max_queries",
+    [
+        ("/pets/", 2),
+        ("/pets/?fields=pet_id,name", 2),
+        ("/pets/1", 2),
+        ("/users/", 3),
+        ("/users/?fields=id,name", 2),
+        ("/health/ready", 1),
+    ],
+)
+def test_read_query_budget(
+    client: TestClient, auth_headers: dict[str, str], path: str, max_queries: int
+) -> None:
+    response = client.get(path, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert_max_queries(response, max_queries)
+
+
+@pytest.mark.parametrize(
+    "method, path, body, max_queries",
+    [
+        ("POST", "/pets/", {"user_id": None, **PET}, 3),
+        ("PUT", "/pets/1", {**PET, "name": "Max", "castred": False}, 3),
+        # SQLite returns the ids of a multi-row insert one statement per row.
+        ("POST", "/pets/bulk", [{"user_id": None, **PET}] * 3, 5),
+        ("PUT", "/pets/bulk", [{"id": 1, **PET, "castred": None}], 3),
+        ("PUT", "/users/", {"id": None, "name": "Query budget 2"}, 3),
+        ("POST", "/users/{user_id}/add_pet", {"user_id": None, **PET}, 3),
+        ("POST", "/detectar", {"timestamp": "2026-01-01T07:00:00"}, 2),
+    ],
+)
+def test_write_query_budget(
+    client: TestClient,
+    auth_headers: dict[str, str],
+    user_id: int,
+    method: str,
+    path: str,
+    body: Any,
+    max_queries: int,
+) -> None:
+    for item in body if isinstance(body, list) else [body]:
+        for key in ("id", "user_id"):
+            if key in item and item[key] is None:
+                item[key] = user_id
+
+    response = client.request(
+        method, path.format(user_id=user_id), json=body, headers=auth_headers
+    )
+
+    assert response.status_code == 200, response.text
+    assert_max_queries(response, max_queries)
+
+
+def test_import_query_budget(client: TestClient, auth_headers: dict[str, str]) -> None:
+    rows = "\n".join(
+        f"Import {index},{cpf},import.{index}@foodtracker.com,7499123456{index},"
+        f"Import address,import-{index}"
+        for index, cpf in enumerate(("11144477735", "39053344705", "71428793860"))
+    )
+
+    response = client.post(
+        "/users/import",
+        content=f"name,cpf_cnpj,email,phone,address,password\n{rows}\n",
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"]["rows"] == 3
+    assert response.json()["data"]["failed"] == 0
+    # One duplicate check and one upsert for the whole chunk.
+    assert_max_queries(response, 3)
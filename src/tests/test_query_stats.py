@@ -0,0 +1,21 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from src.database.query_stats import track_queries
+
+
+def test_failed_statements_release_their_start_time(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path}/stats.db")
+    try:
+        with track_queries() as stats, engine.connect() as connection:
+            with pytest.raises(exc.OperationalError):
+                connection.execute(text("SELECT * FROM missing"))
+            connection.execute(text("SELECT 1"))
+
+            assert connection.info["query_started_at"] == []
+        assert stats.count == 2
+        assert stats.statements["SELECT 1"] == 1
+    finally:
+        engine.dispose()
@@ -0,0 +1,101 @@
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, insert, select
+from sqlalchemy.orm import Session
+
+from src.database import replica
+from src.database.engine import EngineRegistry
+from src.database.replica import ReplicaRouter, read_consistency_key
+
+UNREACHABLE = "sqlite:////nao/existe/replica.db"
+
+
+def _router(*urls: str, read_after_write_seconds: float = 60) -> ReplicaRouter:
+    return ReplicaRouter(
+        list(urls),
+        max_staleness_seconds=0,
+        read_after_write_seconds=read_after_write_seconds,
+        health_check_interval=3600,
+    )
+
+
+def _checked(router: ReplicaRouter) -> ReplicaRouter:
+    # The first choice starts the monitor, whose first round sets the health.
+    router.choose()
+    deadline = time.monotonic() + 10
+    while any(state.checked_at == 0 for state in router.states()):
+        assert time.monotonic() < deadline, "replicas not checked"
+        time.sleep(0.01)
+    return router
+
+
+def test_without_replicas_reads_go_to_the_primary() -> None:
+    router = _router()
+
+    assert not router.enabled
+    assert router.choose() is None
+
+
+def test_reads_rotate_over_the_healthy_replicas(tmp_path: Path) -> None:
+    first = f"sqlite:///{tmp_path}/first.db"
+    second = f"sqlite:///{tmp_path}/second.db"
+    router = _checked(_router(first, UNREACHABLE, second))
+
+    assert [state.healthy for state in router.states()] == [True, False, True]
+    chosen = [router.choose() for _ in range(4)]
+    assert set(chosen) == {first, second}
+    assert chosen[0] != chosen[1]
+
+
+def test_disconnected_replica_is_skipped_until_checked_again(tmp_path: Path) -> None:
+    url = f"sqlite:///{tmp_path}/replica.db"
+    router = _checked(_router(url))
+
+    router.mark_unhealthy(url)
+
+    assert router.choose() is None
+    router._check(router.states()[0])
+    assert router.choose() == url
+
+
+def test_reads_after_a_write_stay_on_the_primary(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    url = f"sqlite:///{tmp_path}/replica.db"
+    router = _checked(_router(url))
+    monkeypatch.setattr(replica, "replica_router", router)
+    primary = EngineRegistry.get_engine(f"sqlite:///{tmp_path}/primary.db")
+    table = Table("items", MetaData(), Column("id", Integer, primary_key=True))
+    table.create(primary)
+
+    token = read_consistency_key.set(1)
+    try:
+        with Session(primary) as session:
+            session.execute(select(table))
+            session.commit()
+        assert router.choose() == url
+        with Session(primary) as session:
+            session.execute(insert(table).values(id=1))
+            session.commit()
+        assert router.choose() is None
+    finally:
+        read_consistency_key.reset(token)
+    # Other users still read from the replica.
+    token = read_consistency_key.set(2)
+    try:
+        assert router.choose() == url
+    finally:
+        read_consistency_key.reset(token)
+
+
+def test_writes_expire_after_the_read_after_write_window(tmp_path: Path) -> None:
+    url = f"sqlite:///{tmp_path}/replica.db"
+    router = _checked(_router(url, read_after_write_seconds=0.05))
+
+    router.record_write()
+    assert router.choose() is None
+    time.sleep(0.1)
+
+    assert router.choose() == url
@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+
+from src.middlewares.query_count import assert_max_queries
+
+SCHEDULE = {"feeding_time": "07:00"}
+
+
+def new_pet(client: TestClient, auth_headers: dict[str, str]) -> int:
+    response = client.post(
+        "/pets/bulk",
+        json=[{"user_id": 1, "name": "Agendado", "kind": 1}],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    pet_id: int = response.json()["data"][0]
+    return pet_id
+
+
+def test_scheduled_feeding_is_created_once(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    pet_id = new_pet(client, auth_headers)
+
+    created = client.post(
+        "/scheduled_feeding/", json={"pet_id": pet_id, **SCHEDULE}, headers=auth_headers
+    )
+    assert created.status_code == 200, created.text
+    # The pet, the duplicate check and the insert.
+    assert_max_queries(created, 3)
+
+    repeated = client.post(
+        "/scheduled_feeding/", json={"pet_id": pet_id, **SCHEDULE}, headers=auth_headers
+    )
+    assert repeated.status_code == 302
+    assert repeated.json()["detail"] == "A alimentação agendada já existe"
+
+
+def test_scheduled_feeding_for_an_unknown_pet_is_not_found(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        "/scheduled_feeding/",
+        json={"pet_id": 999_999_999, **SCHEDULE},
+        headers=auth_headers,
+    )
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Pet não encontrado"
@@ -0,0 +1,61 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.modules import tracing
+from src.modules.tracing import CLIENT, SERVER, Span, span, start_trace
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def exported(monkeypatch: pytest.MonkeyPatch) -> list[Span]:
+    spans: list[Span] = []
+    monkeypatch.setattr(tracing.span_exporter, "enabled", True)
+    monkeypatch.setattr(tracing.span_exporter, "export", spans.append)
+    return spans
+
+
+def test_spans_copy_their_attributes(exported: list[Span]) -> None:
+    attributes = {"file.path": "/tmp/data.json"}
+    with start_trace("job", parent=(TRACE_ID, PARENT_ID)) as root:
+        assert root is not None
+        with span("child", CLIENT, attributes=attributes) as child:
+            assert child is not None
+            child.set("entries", 2)
+
+    assert attributes == {"file.path": "/tmp/data.json"}
+    assert [item.name for item in exported] == ["child", "job"]
+    otlp = exported[0].to_otlp()
+    assert otlp["traceId"] == TRACE_ID
+    assert otlp["parentSpanId"] == root.span_id
+    assert otlp["kind"] == CLIENT
+    assert otlp["attributes"] == [
+        {"key": "file.path", "value": {"stringValue": "/tmp/data.json"}},
+        {"key": "entries", "value": {"intValue": "2"}},
+    ]
+
+
+def test_span_outside_a_trace_does_nothing(exported: list[Span]) -> None:
+    with span("orphan", attributes={"pet.id": 1}) as orphan:
+        assert orphan is None
+    assert exported == []
+
+
+def test_sampled_traceparent_continues_the_callers_trace(
+    client: TestClient, auth_headers: dict[str, str], exported: list[Span]
+) -> None:
+    response = client.get(
+        "/pets/1",
+        headers={**auth_headers, "traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+    )
+    assert response.status_code == 200
+
+    root = next(item for item in exported if item.kind == SERVER)
+    assert root.name == "GET /pets/{id}"
+    assert root.trace_id == TRACE_ID
+    assert root.parent_span_id == PARENT_ID
+    assert root.attributes["http.request.method"] == "GET"
+    assert root.attributes["http.route"] == "/pets/{id}"
+    assert root.attributes["http.response.status_code"] == 200
+    assert all(item.trace_id == TRACE_ID for item in exported)
@@ -0,0 +1,126 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from config import settings
+from src.database.engine import EngineRegistry, to_async_url
+from src.database.model import User
+from src.modules.user import ImportUsers, UpdateUser
+from src.schemas.user import RequestUpdateUser
+
+# Spreadsheet rows: blank rows count, a quoted field spanning lines does not.
+USERS_CSV = (
+    "name,cpf_cnpj,email,phone,address,password\n"
+    "Linha Dois,11122233396,linha.2@foodtracker.com,74991110002,Rua 2,senha-2\n"
+    "\n"
+    "Linha Quatro,44455566619,sem-arroba,74991110004,Rua 4,senha-4\n"
+    "\n"
+    "\n"
+    'Linha Sete,77788899003,linha.7@foodtracker.com,74991110007,"Rua 7\n'
+    'Fundos",senha-7\n'
+    "Linha Oito,10203040570\n"
+    "Linha Nove,10203040570,linha.9@foodtracker.com,123,Rua 9,senha-9\n"
+)
+USERS_CSV_ERRORS = [
+    {"row": 4, "detail": "Email inválido"},
+    {"row": 8, "detail": "Quantidade de colunas inválida"},
+    {"row": 9, "detail": "Número de telefone inválido"},
+]
+
+
+def on_new_session(service: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+    """Runs `service` in its own event loop and engine, outside the test client."""
+
+    async def run() -> Any:
+        engine = create_async_engine(to_async_url(settings.database_url))
+        try:
+            async with AsyncSession(engine) as session:
+                return await service(session)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_import_reports_errors_by_spreadsheet_row(
+    client: TestClient, auth_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        "/users/import",
+        content=USERS_CSV,
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200, response.text
+    summary = response.json()["data"]
+    assert (summary["rows"], summary["failed"]) == (5, 3)
+    assert summary["errors"] == USERS_CSV_ERRORS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+def test_import_rows_stay_right_across_chunks(
+    client: TestClient, chunk_size: int
+) -> None:
+    async def content() -> AsyncIterator[bytes]:
+        yield USERS_CSV.encode()
+
+    response = on_new_session(
+        lambda session: ImportUsers(session, content(), chunk_size).execute()
+    )
+
+    assert response.data.rows == 5
+    assert [error.model_dump() for error in response.data.errors] == USERS_CSV_ERRORS
+
+
+@pytest.mark.parametrize(
+    "content, detail",
+    [
+        ("", "Arquivo vazio"),
+        (
+            "name,email\nSó nome,so.nome@foodtracker.com\n",
+            "Colunas ausentes: cpf_cnpj,phone,address,password",
+        ),
+        (b"name\xff", "Arquivo CSV inválido"),
+    ],
+)
+def test_invalid_import_files_are_rejected(
+    client: TestClient, auth_headers: dict[str, str], content: str | bytes, detail: str
+) -> None:
+    response = client.post(
+        "/users/import",
+        content=content,
+        headers={**auth_headers, "Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+
+
+def test_concurrent_user_update_conflicts(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    update_user = UpdateUser._update_user
+
+    async def update_after_another_request(service: UpdateUser) -> None:
+        # The row changes between this request's read and its write.
+        with EngineRegistry.get_engine(settings.database_url).begin() as connection:
+            connection.execute(
+                update(User).where(User.id == 1).values(version=User.version + 1)
+            )
+        await update_user(service)
+
+    monkeypatch.setattr(UpdateUser, "_update_user", update_after_another_request)
+    request = RequestUpdateUser(id=1, address="Endereço em conflito")
+
+    with pytest.raises(HTTPException) as conflict:
+        on_new_session(lambda session: UpdateUser(session, request).execute())
+
+    assert conflict.value.status_code == 409
+    assert conflict.value.detail == (
+        "O usuário foi alterado por outra requisição, tente novamente"
+    )
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from src.modules.validation import MIN_BATCH_SIZE, UserValidation
+
+
+def check_digits(digits: list[int], weights: tuple[int, ...], cpf: bool) -> int:
+    remainder = sum(d * w for d, w in zip(digits, weights)) % 11
+    if cpf:
+        return remainder * 10 % 11 % 10
+    return 0 if remainder < 2 else 11 - remainder
+
+
+def document(rng: random.Random, size: int) -> str:
+    digits = [rng.randrange(10) for _ in range(size - 2)]
+    for position in (size - 2, size - 1):
+        weights = (
+            tuple(range(position + 1, 1, -1))
+            if size == 11
+            else tuple([*range(position - 7, 1, -1), *range(9, 1, -1)])
+        )
+        digits.append(check_digits(digits, weights, size == 11))
+    return "".join(map(str, digits))
+
+
+REPEATED = [digit * size for digit in "0123456789" for size in (11, 14)]
+MALFORMED = [
+    "",
+    "123",
+    "1234567890",
+    "123456789012",
+    "123456789012345",
+    "abc.def.ghi-jk",
+    "529.982.247-25",
+    "52.998.224/7251-00",
+    "11.222.333/0001-81",
+    " 52998224725 ",
+    "5299822472５",
+]
+
+
+def test_batch_and_single_check_digits_agree() -> None:
+    rng = random.Random(42)
+    valid = [document(rng, size) for size in (11, 14) for _ in range(50)]
+    # Every single digit changed, which check digits must always catch.
+    invalid = [
+        value[:index] + str((int(value[index]) + 1) % 10) + value[index + 1 :]
+        for value in valid[::10]
+        for index in range(len(value))
+    ]
+    values = valid + invalid + REPEATED + MALFORMED
+
+    batch = UserValidation.cpf_cnpj_errors(values)
+    single = [UserValidation.cpf_cnpj_errors([value])[0] for value in values]
+
+    assert len(values) >= MIN_BATCH_SIZE
+    assert batch[: len(valid)] == [None] * len(valid)
+    assert None not in batch[len(valid) : len(valid) + len(invalid) + len(REPEATED)]
+    assert batch == single
+
+
+@pytest.mark.parametrize(
+    "value, error",
+    [
+        ("529.982.247-25", None),
+        ("52998224724", "CPF inválido"),
+        ("11111111111", "CPF inválido"),
+        ("11.222.333/0001-81", None),
+        ("11222333000182", "CNPJ inválido"),
+        ("00000000000000", "CNPJ inválido"),
+        ("1234", "CPF ou CNPJ inválido"),
+    ],
+)
+def test_cpf_cnpj_errors(value: str, error: str | None) -> None:
+    assert UserValidation.cpf_cnpj_errors([value]) == [error]
+    assert UserValidation.cpf_cnpj_errors([value] * MIN_BATCH_SIZE) == (
+        [error] * MIN_BATCH_SIZE
+    )